@@ -0,0 +1,51 @@
+from pathlib import Path
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+
+# Rows of the synthetic datasets by scale name
+SCALES: Dict[str, int] = {"100K": 100_000, "1M": 1_000_000, "20M": 20_000_000}
+
+
+def dataset_size(n_rows: int) -> Dict[str, int]:
+    return {"n_users": max(1_000, n_rows // 50), "n_items": max(500, n_rows // 200)}
+
+
+def _power_law_ids(
+    n_ids: int, size: int, alpha: float, rng: np.random.Generator
+) -> np.ndarray:
+    # The id of rank r is drawn with a probability in proportion to r^-alpha,
+    # and the ranks are shuffled so that popular ids are spread over the range.
+    cdf = np.cumsum(np.arange(1, n_ids + 1, dtype=np.float64) ** -alpha)
+    ranks = np.searchsorted(cdf, rng.random(size) * cdf[-1])
+    return rng.permutation(n_ids)[np.minimum(ranks, n_ids - 1)]
+
+
+def generate(n_rows: int, seed: int = 42, alpha: float = 1.0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    size = dataset_size(n_rows)
+
+    users = _power_law_ids(size["n_users"], n_rows, alpha, rng)
+    items = _power_law_ids(size["n_items"], n_rows, alpha, rng)
+    # Ratings in 1..5 from a user bias, an item bias and noise
+    user_bias = rng.normal(0.0, 0.5, size["n_users"])
+    item_bias = rng.normal(0.0, 0.5, size["n_items"])
+    noise = rng.normal(0.0, 1.0, n_rows)
+    ratings = np.clip(np.rint(3.5 + user_bias[users] + item_bias[items] + noise), 1, 5)
+    timestamps = rng.integers(1_000_000_000, 1_700_000_000, n_rows)
+
+    return pd.DataFrame(
+        {"user": users, "item": items, "rating": ratings, "timestamp": timestamps}
+    )
+
+
+# Writes the dataset of `scale` once and reuses it while the file exists.
+def dataset_file(data_dir: Path, scale: str, seed: int = 42) -> Path:
+    data_file = data_dir / f"ratings_{scale}_{seed}.csv"
+    if not data_file.exists():
+        data_dir.mkdir(parents=True, exist_ok=True)
+        tmp_file = data_file.with_suffix(".tmp")
+        generate(n_rows=SCALES[scale], seed=seed).to_csv(tmp_file, index=False)
+        tmp_file.rename(data_file)
+    return data_file
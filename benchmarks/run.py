@@ -0,0 +1,247 @@
+import argparse
+import json
+import os
+import platform
+import sys
+from datetime import datetime
+from logging import WARNING
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+from benchmarks.data import SCALES, dataset_file, dataset_size
+from exrec.core.dataframe import read_csv
+from exrec.core.interface import Logger
+from exrec.core.logger import provide_logger
+from exrec.core.timer import provide_timer
+from exrec.evaluation.config import MetricType
+from exrec.evaluation.evaluate import SimpleEvaluator
+from exrec.model.config import OptimizerType
+from exrec.model.factorization import MF
+from exrec.preprocessing.config import DataType, RatingDataConfig
+from exrec.preprocessing.provide import provide_dataset
+
+OPTIMIZERS = [OptimizerType.MINIBATCH_SGD, OptimizerType.ALS]
+METRICS = [MetricType.MAE, MetricType.MSE, MetricType.RMSE]
+
+
+def _repeat(
+    logger: Logger,
+    stage: str,
+    n_items: int,
+    repeat: int,
+    f: Callable[[], Any],
+    setup: Optional[Callable[[], None]] = None,
+) -> Any:
+    result = None
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        with logger.timeit(stage, n_items=n_items):
+            result = f()
+    return result
+
+
+def run_scale(logger: Logger, data_file: Path, n_rows: int, repeat: int) -> None:
+    size = dataset_size(n_rows)
+    config = RatingDataConfig(
+        n_users=size["n_users"],
+        n_items=size["n_items"],
+        col_user="user",
+        col_item="item",
+        col_rating="rating",
+        col_timestamp="timestamp",
+        user_dtype="int32",
+        item_dtype="int32",
+        rating_dtype="float32",
+        timestamp_dtype="int64",
+    )
+
+    _repeat(
+        logger,
+        "read_csv",
+        n_rows,
+        repeat,
+        lambda: read_csv(
+            src_file=data_file, usecols=config.usecols(), dtype=config.dtypes()
+        ),
+    )
+    data = _repeat(
+        logger,
+        "provide_dataset",
+        n_rows,
+        repeat,
+        lambda: provide_dataset(
+            data_path=data_file, data_type=DataType.RATING, config=config
+        ),
+    )
+
+    n_samples = data.n_samples
+    splits = {
+        "random": lambda: data.random_split(train_ratio=0.8, seed=42),
+        "satisfied": lambda: data.satisfied_split(
+            filter_by=data.col_user, train_ratio=0.8, min_samples=2, seed=42
+        ),
+        "timestamp": lambda: data.timestamp_split(train_ratio=0.8),
+        "leave_last_n": lambda: data.leave_last_n_split(n_last=1),
+        "user_timestamp": lambda: data.user_timestamp_split(train_ratio=0.8),
+    }
+
+    # The lazy index is dropped so that every split pays for its own.
+    def drop_index() -> None:
+        data.index = None
+
+    for name, split in splits.items():
+        _repeat(logger, f"split.{name}", n_samples, repeat, split, drop_index)
+    train, test = data.random_split(train_ratio=0.8, seed=42)
+
+    for optimizer in OPTIMIZERS:
+        model = MF(
+            n_users=size["n_users"],
+            n_items=size["n_items"],
+            dim=32,
+            optimizer=optimizer,
+            dtype="float32",
+        )
+        model_logger = logger.get_child(model.log_name())
+        _repeat(
+            logger,
+            f"fit_epoch.{optimizer.name}",
+            train.n_samples,
+            repeat,
+            lambda: model.fit(logger=model_logger, data=train, epochs=1),
+        )
+
+    _repeat(
+        logger,
+        "predict",
+        test.n_samples,
+        repeat,
+        lambda: model.predict(logger=model_logger, test_data=test),
+    )
+    for metric in METRICS:
+        evaluator = SimpleEvaluator(metrics=[metric], keep_pred=False)
+        evaluator_logger = logger.get_child(evaluator.log_name())
+        _repeat(
+            logger,
+            f"evaluate.{metric.name}",
+            test.n_samples,
+            repeat,
+            lambda: evaluator.evaluate(
+                logger=evaluator_logger, model=model, test_data=test
+            ),
+        )
+
+
+# The fastest of the repeats of every stage
+def collect(records: List[Dict[str, Any]], prefix: str) -> Dict[str, Dict[str, Any]]:
+    results: Dict[str, Dict[str, Any]] = {}
+    for record in records:
+        if not record["stage"].startswith(prefix):
+            continue
+        stage = record["stage"][len(prefix) :]
+        best = results.get(stage)
+        if best is None or record["wall"] < best["wall"]:
+            results[stage] = {
+                key: record[key] for key in ["wall", "cpu", "n_items", "items_per_sec"]
+            }
+    return results
+
+
+def compare(
+    results: Dict[str, Dict[str, Dict[str, Any]]],
+    baseline: Dict[str, Dict[str, Dict[str, Any]]],
+    tolerance: float,
+    min_seconds: float,
+) -> List[str]:
+    regressions = []
+    print(f"{'scale':>6} {'stage':<28} {'baseline':>10} {'current':>10} {'ratio':>7}")
+    for scale, stages in results.items():
+        for stage, result in stages.items():
+            if stage not in baseline.get(scale, {}):
+                continue
+            old, new = baseline[scale][stage]["wall"], result["wall"]
+            ratio = new / max(old, 1e-9)
+            # Stages shorter than `min_seconds` are too noisy to flag.
+            regressed = ratio > 1 + tolerance and new - old > min_seconds
+            flag = "  REGRESSION" if regressed else ""
+            print(
+                f"{scale:>6} {stage:<28} {old:>9.3f}s {new:>9.3f}s {ratio:>6.2f}x{flag}"
+            )
+            if regressed:
+                regressions.append(f"{scale} {stage}")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Benchmarks exrec on synthetic power-law rating datasets."
+    )
+    parser.add_argument("--scales", nargs="+", default=["100K", "1M"], choices=SCALES)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--data-dir", type=Path, default=Path("benchmarks/data"))
+    parser.add_argument("--output", type=Path, default=Path("benchmarks/results.json"))
+    parser.add_argument(
+        "--baseline", type=Path, default=Path("benchmarks/baseline.json")
+    )
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    parser.add_argument("--min-seconds", type=float, default=0.01)
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args()
+
+    timer = provide_timer()
+    logger = provide_logger(name="Benchmark", timer=timer)
+    if not args.verbose:
+        logger.logger.setLevel(WARNING)
+
+    results: Dict[str, Dict[str, Dict[str, Any]]] = {}
+    for scale in args.scales:
+        print(f"Benchmark {scale} rows", file=sys.stderr)
+        data_file = dataset_file(data_dir=args.data_dir, scale=scale, seed=args.seed)
+        run_scale(
+            logger=logger.get_child(scale),
+            data_file=data_file,
+            n_rows=SCALES[scale],
+            repeat=args.repeat,
+        )
+        results[scale] = collect(timer.records, prefix=f"Benchmark.{scale}.")
+
+    report = {
+        "meta": {
+            "date": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "cpu_count": os.cpu_count(),
+            "repeat": args.repeat,
+            "seed": args.seed,
+        },
+        "results": results,
+    }
+    with open(str(args.output), "w") as f:
+        json.dump(report, f, indent=2)
+
+    regressions: List[str] = []
+    if args.baseline.exists():
+        with open(str(args.baseline)) as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(
+            results=results,
+            baseline=baseline,
+            tolerance=args.tolerance,
+            min_seconds=args.min_seconds,
+        )
+    if args.save_baseline or not args.baseline.exists():
+        with open(str(args.baseline), "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Saved the baseline to {args.baseline}", file=sys.stderr)
+
+    if regressions:
+        print(f"Regressions: {', '.join(regressions)}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
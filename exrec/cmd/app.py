@@ -1,33 +1,137 @@
+import json
 from pathlib import Path
+from typing import Any, Dict, List, Optional
 
 from exrec.cmd.config import AppConfig
 from exrec.core.dataframe import read_csv
 from exrec.core.label_encoder import provide_label_encoder
 from exrec.core.logger import Logger, provide_logger
+from exrec.core.memory import array_report, format_bytes, frame_report, peak_rss_bytes
+from exrec.core.timer import TimerImpl, provide_timer
 from exrec.evaluation.provide import provide_evaluator
+from exrec.model.interface import Model
 from exrec.model.provide import provide_model
 from exrec.model.repository import provide_repository
-from exrec.preprocessing.provide import provide_dataset
+from exrec.preprocessing.cache import provide_dataset_cache
+from exrec.preprocessing.interface import RatingDataset
+from exrec.preprocessing.provide import provide_encoded_dataset
 from exrec.trainer.provide import provide_trainer
 from exrec.usecase.interface import Usecase
 from exrec.usecase.provide import provide_usecase
 
 
+def dataset_report(dataset: RatingDataset) -> Dict[str, Any]:
+    columns = frame_report(dataset.get_data())
+    return {
+        "n_samples": dataset.n_samples,
+        "bytes": sum(column["bytes"] for column in columns.values()),
+        "columns": columns,
+    }
+
+
+def model_report(model: Model) -> Dict[str, Any]:
+    user_factors, item_factors = model.get_factors()
+    # The factors can be the largest arrays of the run, so they are reported
+    # from their dtype and size without checking their values.
+    factors = {
+        "U": array_report(user_factors, check_floats=False),
+        "V": array_report(item_factors, check_floats=False),
+    }
+    for factor in factors.values():
+        # Factors are never exactly representable in float32, but fit in it.
+        if factor["dtype"] == "float64":
+            factor["downcast"] = "float32"
+            factor["saved_bytes"] = factor["bytes"] // 2
+    return {
+        "bytes": sum(factor["bytes"] for factor in factors.values()),
+        "factors": factors,
+    }
+
+
+def downcasts(report: Dict[str, Any]) -> List[str]:
+    found = []
+    for name, dataset in report["datasets"].items():
+        for col, column in dataset["columns"].items():
+            if "downcast" in column:
+                found.append((f"{name}.{col}", column))
+    if report["model"] is not None:
+        for key, factor in report["model"]["factors"].items():
+            if "downcast" in factor:
+                found.append((f"model.{key}", factor))
+    return [
+        f"{name}: {info['dtype']} fits in {info['downcast']} "
+        f"(saves {format_bytes(info['saved_bytes'])})"
+        for name, info in found
+    ]
+
+
 class App:
     usecase: Usecase
     logger: Logger
+    timing_file: Optional[Path]
+    memory_file: Optional[Path]
+    model: Optional[Model]
+    datasets: Dict[str, Dict[str, Any]]
 
-    def __init__(self, logger: Logger, usecase: Usecase):
+    def __init__(
+        self,
+        logger: Logger,
+        usecase: Usecase,
+        timing_file: Optional[Path] = None,
+        memory_file: Optional[Path] = None,
+        model: Optional[Model] = None,
+        datasets: Optional[Dict[str, Dict[str, Any]]] = None,
+    ):
         self.logger = logger
         self.usecase = usecase
+        self.timing_file = timing_file
+        self.memory_file = memory_file
+        self.model = model
+        self.datasets = {} if datasets is None else datasets
 
         self.logger.info("Initialized App")
 
     def start(self) -> None:
         self.logger.info("Execute Usecase")
-        self.usecase.execute(logger=self.logger.get_child(self.usecase.log_name()))
+        try:
+            with self.logger.timeit("execute"):
+                self.usecase.execute(
+                    logger=self.logger.get_child(self.usecase.log_name())
+                )
+        finally:
+            if self.logger.timer is not None and self.timing_file is not None:
+                self.logger.timer.dump(self.timing_file)
+                self.logger.info(f"Write the timings to {self.timing_file}")
+            if self.memory_file is not None:
+                self.write_memory_report(self.memory_file)
         self.logger.info("End the Usecase execution")
 
+    # The memory of every stage, the footprint of the loaded datasets and of
+    # the model, and the columns or factors that a narrower dtype would fit.
+    def write_memory_report(self, memory_file: Path) -> None:
+        stages: Dict[str, Dict[str, Any]] = {}
+        if self.logger.timer is not None:
+            for stage, total in self.logger.timer.summary().items():
+                stages[stage] = {
+                    key: total[key] for key in TimerImpl.memory_keys if key in total
+                }
+
+        peak_rss = peak_rss_bytes()
+        self.logger.info(f"Peak RSS of the process: {format_bytes(peak_rss)}")
+        report: Dict[str, Any] = {
+            "process_peak_rss": peak_rss,
+            "stages": stages,
+            "datasets": self.datasets,
+            "model": None if self.model is None else model_report(self.model),
+        }
+        report["downcasts"] = downcasts(report)
+        for downcast in report["downcasts"]:
+            self.logger.info(f"Downcast opportunity: {downcast}")
+
+        with open(str(memory_file), "w") as f:
+            json.dump(report, f, indent=2)
+        self.logger.info(f"Write the memory report to {memory_file}")
+
 
 def provide_app(config: AppConfig) -> App:
     if config.out_dir.exists():
@@ -54,11 +158,24 @@ def provide_app(config: AppConfig) -> App:
         config.repo_dir.mkdir()
 
     log_file = config.out_dir / Path("output.log")
-    logger = provide_logger(name="App", output_file=log_file)
+    # Every stage is appended to timings.jsonl and summed up in timings.json.
+    timing_log_file = config.out_dir / Path("timings.jsonl")
+    if timing_log_file.exists():
+        timing_log_file.unlink()
+    timer = provide_timer(
+        output_file=timing_log_file,
+        track_memory=config.track_memory,
+        trace_memory=config.trace_memory,
+    )
+    logger = provide_logger(name="App", output_file=log_file, timer=timer)
 
     ex_type = config.experiment_cfg
 
-    model_repo = provide_repository(repo_dir=config.repo_dir)
+    model_repo = provide_repository(
+        repo_dir=config.repo_dir,
+        repo_type=config.repo_type,
+        mmap_mode=config.repo_mmap_mode,
+    )
     if config.model_load_file is not None:
         model = model_repo.load(config.model_load_file)
     else:
@@ -74,67 +191,104 @@ def provide_app(config: AppConfig) -> App:
         logger=logger,
         model=model,
         evaluator=evaluator,
+        model_repo=model_repo,
+        data_config=config.data_cfg,
     )
 
     data_path = config.data_path
     all_data, train_data, test_data, valid_data = None, None, None, None
+    datasets: Dict[str, Dict[str, Any]] = {}
 
     user_enc, item_enc = None, None
-    if config.unique_user is not None:
+    if config.model_load_file is not None:
+        # A loaded model keeps the encoding of its training run, including the
+        # labels its encoders grew, if the repository stores the encoders.
+        user_enc, item_enc = model_repo.load_encoders(config.model_load_file)
+
+    if user_enc is not None:
+        logger.info("Use the user encoder of the loaded model")
+    elif config.unique_user is not None:
         unique_users = read_csv(src_file=config.unique_user)
         user_enc = provide_label_encoder(
-            unique_users.unique(key=unique_users.columns[0])
+            unique_users.unique(key=unique_users.columns[0]),
+            encoder_type=config.encoder_type,
+            unseen=config.unseen_policy,
         )
     elif config.user_one_idx:
         user_enc = provide_label_encoder(
-            [i for i in range(1, config.data_cfg.n_users + 1)]
+            [i for i in range(1, config.data_cfg.n_users + 1)],
+            encoder_type=config.encoder_type,
+            unseen=config.unseen_policy,
         )
 
-    if config.unique_item is not None:
+    if item_enc is not None:
+        logger.info("Use the item encoder of the loaded model")
+    elif config.unique_item is not None:
         unique_items = read_csv(src_file=config.unique_item)
-        user_enc = provide_label_encoder(
-            unique_items.unique(key=unique_items.columns[0])
+        item_enc = provide_label_encoder(
+            unique_items.unique(key=unique_items.columns[0]),
+            encoder_type=config.encoder_type,
+            unseen=config.unseen_policy,
         )
     elif config.item_one_idx:
         item_enc = provide_label_encoder(
-            [i for i in range(1, config.data_cfg.n_items + 1)]
+            [i for i in range(1, config.data_cfg.n_items + 1)],
+            encoder_type=config.encoder_type,
+            unseen=config.unseen_policy,
         )
 
+    cache = None
+    if config.cache_dir is not None:
+        cache = provide_dataset_cache(cache_dir=config.cache_dir)
+    encoders = {config.data_cfg.col_user: user_enc, config.data_cfg.col_item: item_enc}
+
     if data_path.all_data is not None:
-        all_data = provide_dataset(
-            data_path=data_path.all_data,
-            data_type=ex_type.data_type,
-            config=config.data_cfg,
-        )
-        all_data.label_encode(col=config.data_cfg.col_user, encoder=user_enc)
-        all_data.label_encode(col=config.data_cfg.col_item, encoder=item_enc)
+        with logger.timeit("load_all_data"):
+            all_data = provide_encoded_dataset(
+                data_path=data_path.all_data,
+                data_type=ex_type.data_type,
+                config=config.data_cfg,
+                encoders=encoders,
+                cache=cache,
+                logger=logger.get_child("all_data"),
+            )
+        datasets["all_data"] = dataset_report(all_data)
 
     if data_path.train_data is not None:
-        train_data = provide_dataset(
-            data_path=data_path.train_data,
-            data_type=ex_type.data_type,
-            config=config.data_cfg,
-        )
-        train_data.label_encode(col=config.data_cfg.col_user, encoder=user_enc)
-        train_data.label_encode(col=config.data_cfg.col_item, encoder=item_enc)
+        with logger.timeit("load_train_data"):
+            train_data = provide_encoded_dataset(
+                data_path=data_path.train_data,
+                data_type=ex_type.data_type,
+                config=config.data_cfg,
+                encoders=encoders,
+                cache=cache,
+                logger=logger.get_child("train_data"),
+            )
+        datasets["train_data"] = dataset_report(train_data)
 
     if data_path.test_data is not None:
-        test_data = provide_dataset(
-            data_path=data_path.test_data,
-            data_type=ex_type.data_type,
-            config=config.data_cfg,
-        )
-        test_data.label_encode(col=config.data_cfg.col_user, encoder=user_enc)
-        test_data.label_encode(col=config.data_cfg.col_item, encoder=item_enc)
+        with logger.timeit("load_test_data"):
+            test_data = provide_encoded_dataset(
+                data_path=data_path.test_data,
+                data_type=ex_type.data_type,
+                config=config.data_cfg,
+                encoders=encoders,
+                cache=cache,
+                logger=logger.get_child("test_data"),
+            )
+        datasets["test_data"] = dataset_report(test_data)
 
     if data_path.valid_data is not None:
-        valid_data = provide_dataset(
-            data_path=data_path.valid_data,
-            data_type=ex_type.data_type,
-            config=config.data_cfg,
-        )
-        valid_data.label_encode(col=config.data_cfg.col_user, encoder=user_enc)
-        valid_data.label_encode(col=config.data_cfg.col_item, encoder=item_enc)
+        with logger.timeit("load_valid_data"):
+            valid_data = provide_encoded_dataset(
+                data_path=data_path.valid_data,
+                data_type=ex_type.data_type,
+                config=config.data_cfg,
+                encoders=encoders,
+                cache=cache,
+                logger=logger.get_child("valid_data"),
+            )
+        datasets["valid_data"] = dataset_report(valid_data)
 
     score_file = config.out_dir / Path("score.csv")
     usecase = provide_usecase(
@@ -153,4 +307,11 @@ def provide_app(config: AppConfig) -> App:
         item_encoder=item_enc,
     )
 
-    return App(logger=logger, usecase=usecase)
+    return App(
+        logger=logger,
+        usecase=usecase,
+        timing_file=config.out_dir / Path("timings.json"),
+        memory_file=config.out_dir / Path("memory.json"),
+        model=model,
+        datasets=datasets,
+    )
@@ -2,16 +2,17 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Callable, Dict, Optional
 
+from exrec.core.config import EncoderType, UnseenPolicy
 from exrec.evaluation.config import EvaluatorType
 from exrec.evaluation.config import type_to_cfg as type_to_evaluator_cfg
 from exrec.evaluation.interface import EvaluatorConfig
-from exrec.model.config import ModelType
+from exrec.model.config import ModelType, RepositoryType
 from exrec.model.config import type_to_cfg as type_to_model_cfg
 from exrec.model.interface import ModelConfig
 from exrec.preprocessing.config import DataType
 from exrec.preprocessing.config import type_to_cfg as type_to_data_cfg
 from exrec.preprocessing.interface import DataConfig, SplitType
-from exrec.trainer.config import TrainerType
+from exrec.trainer.config import StreamingConfig, TrainerType
 from exrec.trainer.config import type_to_cfg as type_to_trainer_cfg
 from exrec.trainer.interface import TrainerConfig
 from exrec.usecase.config import UsecaseConfig, UsecaseType
@@ -51,6 +52,28 @@ class AppConfig:
     unique_user: Optional[Path] = None
     unique_item: Optional[Path] = None
     model_load_file: Optional[Path] = None
+    repo_type: RepositoryType = RepositoryType.PICKLE
+    repo_mmap_mode: Optional[str] = "r"
+    cache_dir: Optional[Path] = None
+    encoder_type: EncoderType = EncoderType.SKLEARN
+    unseen_policy: UnseenPolicy = UnseenPolicy.RAISE
+    # Resident memory per stage, and tracemalloc peaks with trace_memory
+    track_memory: bool = True
+    trace_memory: bool = False
+
+    def __post_init__(self):
+        # The sklearn encoder cannot encode unseen labels, which the streaming
+        # trainer would otherwise only find out at its first chunk.
+        if self.encoder_type == EncoderType.SKLEARN:
+            unseen: Dict[str, Any] = {"unseen_policy": self.unseen_policy}
+            if isinstance(self.trainer_cfg, StreamingConfig):
+                unseen["trainer_cfg.unseen"] = self.trainer_cfg.unseen
+            for key, policy in unseen.items():
+                if policy not in [None, UnseenPolicy.RAISE]:
+                    raise ValueError(
+                        f"{key} {policy.name} needs the FAST encoder_type, "
+                        "the SKLEARN encoder only supports RAISE"
+                    )
 
 
 base_type_hooks: Dict[Any, Callable[[Any], Any]] = {
@@ -58,6 +81,9 @@ base_type_hooks: Dict[Any, Callable[[Any], Any]] = {
     DataType: lambda x: DataType[x],
     EvaluatorType: lambda x: EvaluatorType[x],
     ModelType: lambda x: ModelType[x],
+    RepositoryType: lambda x: RepositoryType[x],
+    EncoderType: lambda x: EncoderType[x],
+    UnseenPolicy: lambda x: UnseenPolicy[x],
     TrainerType: lambda x: TrainerType[x],
     UsecaseType: lambda x: UsecaseType[x],
     Optional[Path]: Path,
@@ -0,0 +1,17 @@
+from enum import Enum, auto
+
+
+class EncoderType(Enum):
+    SKLEARN = auto()
+    FAST = auto()
+
+
+# How an encoder treats labels that were not given when it was built
+class UnseenPolicy(Enum):
+    RAISE = auto()
+    # Encoded to the extra index `len(classes)`
+    RESERVE = auto()
+    # Encoded to -1 so that the rows can be dropped
+    DROP = auto()
+    # Appended to the classes
+    GROW = auto()
@@ -1,5 +1,5 @@
 from pathlib import Path
-from typing import Any, Callable, List, Sequence, Type, Union
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Type, Union
 
 import numpy as np
 import pandas as pd
@@ -61,13 +61,16 @@ class DataFrameImpl:
     def values(self, key: str) -> np.ndarray:
         return self.data[key].values
 
+    def take(self, indices: Sequence[int]) -> DataFrame:
+        return DataFrameImpl(data=self.data.iloc[indices])
+
     def remove(self, remove: DataFrame, keys: List[str]) -> DataFrame:
         return DataFrameImpl(
             data=self.data[~self.data[keys].isin(remove.data[keys]).all(axis=1)]
         )
 
     def append(self, add: DataFrame) -> DataFrame:
-        return DataFrameImpl(data=self.data.append(add.get_data()))
+        return DataFrameImpl(data=pd.concat([self.data, add.get_data()]))
 
     def unique(self, key: str) -> Sequence[Any]:
         return self.data[key].unique()
@@ -82,11 +85,121 @@ class DataFrameImpl:
         self.data.to_csv(file_name, index=False)
 
 
-def read_csv(src_file: Path, sep: str = ",") -> DataFrame:
-    data = pd.read_csv(src_file, sep=sep)
+def read_csv(
+    src_file: Path,
+    sep: str = ",",
+    usecols: Optional[List[str]] = None,
+    dtype: Optional[Dict[str, str]] = None,
+    engine: Optional[str] = None,
+    chunk_size: Optional[int] = None,
+) -> DataFrame:
+    if chunk_size is None:
+        data = pd.read_csv(
+            src_file, sep=sep, usecols=usecols, dtype=dtype, engine=engine
+        )
+    else:
+        data = _read_csv_into_columns(
+            chunks=read_csv_chunks(
+                src_file=src_file,
+                chunk_size=chunk_size,
+                sep=sep,
+                usecols=usecols,
+                dtype=dtype,
+                engine=engine,
+            ),
+            n_rows=_count_rows(src_file),
+        )
     return DataFrameImpl(data=data)
 
 
+# An upper bound of the rows of an uncompressed file from its line breaks
+def _count_rows(src_file: Path, block_size: int = 1 << 20) -> Optional[int]:
+    if Path(src_file).suffix in {".gz", ".bz2", ".zip", ".xz", ".zst", ".tar"}:
+        return None
+    n_lines, last = 0, b"\n"
+    with open(str(src_file), "rb") as f:
+        while True:
+            block = f.read(block_size)
+            if not block:
+                break
+            n_lines += block.count(b"\n")
+            last = block[-1:]
+    # A last line without a line break still counts, the header does not.
+    return max(n_lines + (last != b"\n") - 1, 0)
+
+
+def _read_csv_into_columns(
+    chunks: Iterator[DataFrame], n_rows: Optional[int]
+) -> pd.DataFrame:
+    # Chunks are copied into typed columns allocated for `n_rows` rows (or grown
+    # geometrically if unknown), so the peak memory stays close to the final
+    # frame instead of twice it as with a concat of the chunks. Columns of
+    # pandas extension dtypes, e.g. strings, are concatenated per column.
+    columns: Dict[str, np.ndarray] = {}
+    extension: Dict[str, List[pd.Series]] = {}
+    names: List[str] = []
+    capacity, n = 0, 0
+    for chunk in chunks:
+        frame = chunk.get_data()
+        if not names:
+            names = list(frame.columns)
+            capacity = max(n_rows or 0, len(frame))
+        end = n + len(frame)
+        if end > capacity:
+            capacity = max(2 * capacity, end)
+            for col, values in columns.items():
+                grown = np.empty(capacity, dtype=values.dtype)
+                grown[:n] = values[:n]
+                columns[col] = grown
+        for col in names:
+            series = frame[col]
+            if col in extension or not isinstance(series.dtype, np.dtype):
+                if col in columns:
+                    extension[col] = [pd.Series(columns.pop(col)[:n])]
+                extension.setdefault(col, []).append(series)
+                continue
+            values = columns.get(col)
+            if values is None:
+                values = columns[col] = np.empty(capacity, dtype=series.dtype)
+            elif values.dtype != series.dtype:
+                # Inferred dtypes may widen between chunks, e.g. int to float.
+                values = columns[col] = values.astype(
+                    np.result_type(values.dtype, series.dtype)
+                )
+            values[n:end] = series.to_numpy()
+        n = end
+
+    if not names:
+        return pd.DataFrame()
+    data: Dict[str, Any] = {}
+    for col in names:
+        if col in extension:
+            data[col] = pd.concat(extension[col], ignore_index=True)
+        else:
+            data[col] = columns[col][:n]
+    return pd.DataFrame(data, copy=False)
+
+
+def read_csv_chunks(
+    src_file: Path,
+    chunk_size: int,
+    sep: str = ",",
+    usecols: Optional[List[str]] = None,
+    dtype: Optional[Dict[str, str]] = None,
+    engine: Optional[str] = None,
+) -> Iterator[DataFrame]:
+    with pd.read_csv(
+        src_file,
+        sep=sep,
+        usecols=usecols,
+        dtype=dtype,
+        engine=engine,
+        chunksize=chunk_size,
+    ) as reader:
+        for chunk in reader:
+            yield DataFrameImpl(data=chunk)
+
+
 class DataFrameGroupByImpl:
     group_data: pd.core.groupby.GroupBy
 
@@ -1,18 +1,52 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import (Any, Callable, List, Optional, Protocol, Sequence, Type,
-                    Union)
+from typing import (Any, Callable, ContextManager, Dict, List, Optional,
+                    Protocol, Sequence, Type, Union)
+
+
+class Timer(Protocol):
+    records: List[Dict[str, Any]]
+
+    # Called when a stage starts, before its `record`.
+    def enter(self) -> None:
+        ...
+
+    def record(
+        self,
+        stage: str,
+        start: float,
+        wall: float,
+        cpu: float,
+        n_items: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        ...
+
+    # Adds records timed elsewhere, e.g. by the timer of a worker process.
+    def merge(self, records: List[Dict[str, Any]]) -> None:
+        ...
+
+    # The arguments of `provide_timer` that give a timer measuring the same
+    def get_config(self) -> Dict[str, bool]:
+        ...
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        ...
+
+    def dump(self, output_file: Path) -> None:
+        ...
 
 
 class Logger(Protocol):
     logger: Any
+    timer: Optional[Timer]
 
     def __init__(
         self,
         name: str,
         output_file: Optional[Path] = None,
         logger: Optional[Any] = None,
+        timer: Optional[Timer] = None,
     ):
         ...
 
@@ -31,9 +65,18 @@ class Logger(Protocol):
     def debug(self, message: str) -> None:
         ...
 
+    # Children share the timer of their parent.
     def get_child(self, name: str) -> Logger:
         ...
 
+    # Times the enclosed block as the stage `<logger name>.<stage>`, with the
+    # throughput of `n_items` if it is given. The yielded dict gets the `wall`
+    # and `cpu` seconds, and `items_per_sec`, when the block ends.
+    def timeit(
+        self, stage: str, n_items: Optional[int] = None
+    ) -> ContextManager[Dict[str, Any]]:
+        ...
+
 
 class DataFrame(Protocol):
     data: Any
@@ -90,6 +133,9 @@ class DataFrame(Protocol):
     def values(self, key: str) -> Sequence[Any]:
         ...
 
+    def take(self, indices: Sequence[int]) -> DataFrame:
+        ...
+
     def remove(self, remove: DataFrame, keys: List[str]) -> DataFrame:
         ...
 
@@ -128,8 +174,20 @@ class DataFrameGroupBy(Protocol):
 class LabelEncoder(Protocol):
     encoder: Any
 
+    # Unseen labels may be encoded to -1 depending on the encoder
     def encode(self, labels: Sequence[Union[int, str]]) -> Sequence[int]:
         ...
 
     def decode(self, indices: Sequence[int]) -> Sequence[Union[int, str]]:
         ...
+
+    def get_classes(self) -> Sequence[Union[int, str]]:
+        ...
+
+    # The encoder type and unseen label policy as names
+    def get_config(self) -> Dict[str, Any]:
+        ...
+
+    # Changes how labels unseen so far are encoded from now on
+    def set_unseen(self, unseen: Any) -> None:
+        ...
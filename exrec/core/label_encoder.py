@@ -1,11 +1,28 @@
-from typing import Sequence, Union
+from typing import Any, Dict, Optional, Sequence, Union
 
+import numpy as np
+import pandas as pd
+from exrec.core.config import EncoderType, UnseenPolicy
 from exrec.core.interface import LabelEncoder
 from sklearn.preprocessing import LabelEncoder as SkLabelEncoder
 
 
-def provide_label_encoder(labels: Sequence[Union[int, str]]) -> LabelEncoder:
-    return LabelEncoderImpl(labels=labels)
+# With `keep_order`, `labels` are unique classes in the order of their codes,
+# e.g. the stored classes of an encoder that grew, rather than sorted.
+def provide_label_encoder(
+    labels: Sequence[Union[int, str]],
+    encoder_type: EncoderType = EncoderType.SKLEARN,
+    unseen: UnseenPolicy = UnseenPolicy.RAISE,
+    keep_order: bool = False,
+) -> LabelEncoder:
+    if encoder_type == EncoderType.SKLEARN:
+        if unseen != UnseenPolicy.RAISE:
+            raise ValueError("The sklearn encoder only supports UnseenPolicy.RAISE")
+        return LabelEncoderImpl(labels=labels)
+    elif encoder_type == EncoderType.FAST:
+        return FastLabelEncoderImpl(labels=labels, unseen=unseen, keep_order=keep_order)
+    else:
+        raise NotImplementedError("Not Implemented LabelEncoder")
 
 
 class LabelEncoderImpl:
@@ -20,3 +37,104 @@ class LabelEncoderImpl:
 
     def decode(self, indices: Sequence[int]) -> Sequence[Union[int, str]]:
         return self.encoder.inverse_transform(indices)
+
+    def get_classes(self) -> Sequence[Union[int, str]]:
+        return self.encoder.classes_
+
+    def get_config(self) -> Dict[str, Any]:
+        return {
+            "encoder_type": EncoderType.SKLEARN.name,
+            "unseen": UnseenPolicy.RAISE.name,
+        }
+
+    def set_unseen(self, unseen: UnseenPolicy) -> None:
+        if unseen != UnseenPolicy.RAISE:
+            raise ValueError("The sklearn encoder only supports UnseenPolicy.RAISE")
+
+
+def _as_integers(labels: np.ndarray) -> np.ndarray:
+    # ID columns with NaNs or read without a schema are parsed as floats.
+    if labels.dtype.kind == "f" and np.all(labels == np.floor(labels)):
+        return labels.astype(np.int64)
+    return labels
+
+
+# Integer labels in a dense range are looked up in an array indexed by
+# `label - offset`; other labels go through the hash table of a pandas Index.
+class FastLabelEncoderImpl:
+    encoder: Union[np.ndarray, pd.Index]
+    classes: np.ndarray
+    offset: Optional[int]
+    unseen: UnseenPolicy
+
+    def __init__(
+        self,
+        labels: Sequence[Union[int, str]],
+        unseen: UnseenPolicy = UnseenPolicy.RAISE,
+        keep_order: bool = False,
+    ):
+        self.unseen = unseen
+        classes = _as_integers(np.asarray(labels))
+        self.build(classes=classes if keep_order else np.unique(classes))
+
+    def build(self, classes: np.ndarray) -> None:
+        self.classes = classes
+        self.offset = None
+        if classes.dtype.kind in "iu" and len(classes) > 0:
+            low, high = int(classes.min()), int(classes.max())
+            if high - low < 4 * len(classes) + 1024:
+                self.offset = low
+                self.encoder = np.full(high - low + 1, -1, dtype=np.int32)
+                self.encoder[classes - low] = np.arange(len(classes), dtype=np.int32)
+                return
+        self.encoder = pd.Index(classes)
+
+    def lookup(self, labels: np.ndarray) -> np.ndarray:
+        if self.offset is None:
+            return self.encoder.get_indexer(labels).astype(np.int32)
+
+        if labels.dtype.kind not in "iu":
+            # Floats with NaNs or fractions and objects are matched by value.
+            return pd.Index(self.classes).get_indexer(labels).astype(np.int32)
+        codes = np.full(len(labels), -1, dtype=np.int32)
+        shifted = labels.astype(np.int64) - self.offset
+        known = (shifted >= 0) & (shifted < len(self.encoder))
+        codes[known] = self.encoder[shifted[known]]
+        return codes
+
+    def encode(self, labels: Sequence[Union[int, str]]) -> Sequence[int]:
+        labels = _as_integers(np.asarray(labels))
+        codes = self.lookup(labels)
+        unseen = codes < 0
+        if not unseen.any():
+            return codes
+
+        if self.unseen == UnseenPolicy.RAISE:
+            raise ValueError(f"Unseen labels: {np.unique(labels[unseen])[:10]}")
+        elif self.unseen == UnseenPolicy.RESERVE:
+            codes[unseen] = len(self.classes)
+        elif self.unseen == UnseenPolicy.GROW:
+            new_labels = pd.unique(labels[unseen])
+            self.build(classes=np.concatenate([self.classes, new_labels]))
+            codes[unseen] = self.lookup(labels[unseen])
+        return codes
+
+    # Indices out of the classes, e.g. the reserved one, are decoded to None.
+    def decode(self, indices: Sequence[int]) -> Sequence[Union[int, str]]:
+        indices = np.asarray(indices)
+        known = (indices >= 0) & (indices < len(self.classes))
+        if known.all():
+            return np.take(self.classes, indices)
+
+        labels = np.full(len(indices), None, dtype=object)
+        labels[known] = np.take(self.classes, indices[known])
+        return labels
+
+    def get_classes(self) -> Sequence[Union[int, str]]:
+        return self.classes
+
+    def get_config(self) -> Dict[str, Any]:
+        return {"encoder_type": EncoderType.FAST.name, "unseen": self.unseen.name}
+
+    def set_unseen(self, unseen: UnseenPolicy) -> None:
+        self.unseen = unseen
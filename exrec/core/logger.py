@@ -1,27 +1,35 @@
+import time
+from contextlib import contextmanager
 from logging import DEBUG, INFO, FileHandler, Formatter
 from logging import Logger as LogLogger
 from logging import StreamHandler, getLogger
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, Iterator, Optional
 
-from exrec.core.interface import Logger
+from exrec.core.interface import Logger, Timer
 
 
 def provide_logger(
-    name: str, output_file: Optional[Path] = None, logger: Optional[LogLogger] = None
+    name: str,
+    output_file: Optional[Path] = None,
+    logger: Optional[LogLogger] = None,
+    timer: Optional[Timer] = None,
 ) -> Logger:
-    return LoggerImpl(name=name, output_file=output_file, logger=logger)
+    return LoggerImpl(name=name, output_file=output_file, logger=logger, timer=timer)
 
 
 class LoggerImpl:
     logger: LogLogger
+    timer: Optional[Timer]
 
     def __init__(
         self,
         name: str,
         output_file: Optional[Path] = None,
         logger: Optional[LogLogger] = None,
+        timer: Optional[Timer] = None,
     ):
+        self.timer = timer
         if logger is not None:
             self.logger = logger
         else:
@@ -59,4 +67,35 @@ class LoggerImpl:
         self.logger.debug(message)
 
     def get_child(self, name: str) -> Logger:
-        return LoggerImpl("", None, self.logger.getChild(name))
+        return LoggerImpl("", None, self.logger.getChild(name), self.timer)
+
+    @contextmanager
+    def timeit(
+        self, stage: str, n_items: Optional[int] = None
+    ) -> Iterator[Dict[str, Any]]:
+        if self.timer is not None:
+            self.timer.enter()
+        timing: Dict[str, Any] = {"stage": stage, "n_items": n_items}
+        start = time.time()
+        wall = time.perf_counter()
+        cpu = time.process_time()
+        try:
+            yield timing
+        finally:
+            wall = time.perf_counter() - wall
+            cpu = time.process_time() - cpu
+            timing["wall"] = wall
+            timing["cpu"] = cpu
+            message = f"Timing {stage}: {wall:.3f} sec wall, {cpu:.3f} sec CPU"
+            if n_items is not None:
+                timing["items_per_sec"] = n_items / max(wall, 1e-9)
+                message += f", {timing['items_per_sec']:.0f} items/sec"
+            self.debug(message)
+            if self.timer is not None:
+                self.timer.record(
+                    stage=f"{self.logger.name}.{stage}",
+                    start=start,
+                    wall=wall,
+                    cpu=cpu,
+                    n_items=n_items,
+                )
@@ -0,0 +1,135 @@
+import os
+import sys
+import tracemalloc
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from exrec.core.interface import DataFrame
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None  # type: ignore
+
+
+def rss_bytes() -> Optional[int]:
+    # Resident set size of this process, only known on Linux.
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+# The high-water mark of the resident set size over the process lifetime
+def peak_rss_bytes() -> Optional[int]:
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in kilobytes on Linux but in bytes on macOS.
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+# Measures the memory of nested stages: the resident set size after every
+# stage and its change over the stage and, if `trace` is set, the peak of the
+# memory allocated through tracemalloc (including NumPy arrays) while the stage
+# runs. Tracing slows down allocations, so it is off unless asked for. The peak
+# RSS of the process is a high-water mark of its whole lifetime, so it is
+# reported once per process rather than per stage.
+class MemoryTracer:
+    trace: bool
+    stack: List[Dict[str, Any]]
+
+    def __init__(self, trace: bool = False):
+        self.trace = trace
+        self.stack = []
+        if trace and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def enter(self) -> None:
+        frame: Dict[str, Any] = {"rss": rss_bytes()}
+        if self.trace:
+            current, peak = tracemalloc.get_traced_memory()
+            if self.stack:
+                # The peak so far belongs to the enclosing stage.
+                parent = self.stack[-1]
+                parent["traced_peak"] = max(parent["traced_peak"], peak)
+            tracemalloc.reset_peak()
+            frame["traced_start"] = current
+            frame["traced_peak"] = current
+        self.stack.append(frame)
+
+    def exit(self) -> Dict[str, Optional[int]]:
+        frame = self.stack.pop()
+        rss = rss_bytes()
+        usage: Dict[str, Optional[int]] = {"rss": rss, "rss_delta": None}
+        if rss is not None and frame["rss"] is not None:
+            usage["rss_delta"] = rss - frame["rss"]
+        if self.trace:
+            peak = max(frame["traced_peak"], tracemalloc.get_traced_memory()[1])
+            usage["traced_peak"] = peak - frame["traced_start"]
+            if self.stack:
+                parent = self.stack[-1]
+                parent["traced_peak"] = max(parent["traced_peak"], peak)
+            tracemalloc.reset_peak()
+        return usage
+
+
+def _smallest_int(low: int, high: int) -> Optional[np.dtype]:
+    for dtype in (np.int8, np.int16, np.int32):
+        info = np.iinfo(dtype)
+        if info.min <= low and high <= info.max:
+            return np.dtype(dtype)
+    return None
+
+
+# Bytes of an array with the narrower dtype it could be stored in, if any.
+# Float64 values are checked to fit float32 only with `check_floats`, as the
+# check takes a float32 copy of the array.
+def array_report(values: Any, check_floats: bool = True) -> Dict[str, Any]:
+    values = np.asarray(values)
+    report: Dict[str, Any] = {
+        "dtype": values.dtype.name,
+        "shape": list(values.shape),
+        "bytes": int(values.nbytes),
+    }
+
+    downcast: Optional[np.dtype] = None
+    if values.dtype.kind in "iu" and values.size > 0:
+        downcast = _smallest_int(int(values.min()), int(values.max()))
+    elif check_floats and values.dtype == np.float64 and values.size > 0:
+        # Only flagged if no value changes, e.g. ratings on a half-star scale.
+        if np.array_equal(values.astype(np.float32), values, equal_nan=True):
+            downcast = np.dtype(np.float32)
+    if downcast is not None and downcast.itemsize < values.dtype.itemsize:
+        report["downcast"] = downcast.name
+        report["saved_bytes"] = int(
+            values.size * (values.dtype.itemsize - downcast.itemsize)
+        )
+    return report
+
+
+# Bytes of every column of `data`, with the object columns measured deeply.
+def frame_report(data: DataFrame) -> Dict[str, Dict[str, Any]]:
+    frame = data.get_data()
+    usage = frame.memory_usage(index=False, deep=True)
+    reports: Dict[str, Dict[str, Any]] = {}
+    for col in frame.columns:
+        values = frame[col].to_numpy()
+        if values.dtype.kind in "biuf":
+            report = array_report(values)
+        else:
+            report = {"dtype": str(frame[col].dtype), "shape": [len(frame)]}
+        report["bytes"] = int(usage[col])
+        reports[str(col)] = report
+    return reports
+
+
+def format_bytes(n_bytes: Optional[float]) -> str:
+    if n_bytes is None:
+        return "unknown"
+    for unit in ["B", "KiB", "MiB", "GiB"]:
+        if abs(n_bytes) < 1024:
+            return f"{n_bytes:.1f} {unit}"
+        n_bytes /= 1024
+    return f"{n_bytes:.1f} TiB"
@@ -0,0 +1,106 @@
+import json
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from exrec.core.interface import Timer
+from exrec.core.memory import MemoryTracer
+
+
+def provide_timer(
+    output_file: Optional[Path] = None,
+    track_memory: bool = False,
+    trace_memory: bool = False,
+) -> Timer:
+    memory = None
+    if track_memory or trace_memory:
+        memory = MemoryTracer(trace=trace_memory)
+    return TimerImpl(output_file=output_file, memory=memory)
+
+
+# Collects the wall time, CPU time and throughput of the stages timed through
+# `Logger.timeit`, and their memory with a `memory` tracer. Every record is
+# appended to `output_file` as a JSON line as soon as its stage ends, so that
+# a crashed run keeps the finished stages.
+class TimerImpl:
+    output_file: Optional[Path]
+    memory: Optional[MemoryTracer]
+    records: List[Dict[str, Any]]
+
+    # Memory fields summed up by their maximum over the records of a stage
+    memory_keys = ["rss", "rss_delta", "traced_peak"]
+
+    def __init__(
+        self, output_file: Optional[Path] = None, memory: Optional[MemoryTracer] = None
+    ):
+        self.output_file = output_file
+        self.memory = memory
+        self.records = []
+        self.lock = threading.Lock()
+
+    def enter(self) -> None:
+        if self.memory is not None:
+            self.memory.enter()
+
+    # The arguments of `provide_timer` that give a timer measuring the same
+    def get_config(self) -> Dict[str, bool]:
+        return {
+            "track_memory": self.memory is not None,
+            "trace_memory": self.memory is not None and self.memory.trace,
+        }
+
+    def record(
+        self,
+        stage: str,
+        start: float,
+        wall: float,
+        cpu: float,
+        n_items: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        record: Dict[str, Any] = {
+            "stage": stage,
+            "start": start,
+            "wall": wall,
+            "cpu": cpu,
+            "n_items": n_items,
+            "items_per_sec": None if n_items is None else n_items / max(wall, 1e-9),
+        }
+        if self.memory is not None:
+            record.update(self.memory.exit())
+        self.merge([record])
+        return record
+
+    # Adds records timed elsewhere, e.g. by the timer of a worker process.
+    def merge(self, records: List[Dict[str, Any]]) -> None:
+        with self.lock:
+            self.records.extend(records)
+            if self.output_file is not None and records:
+                with open(str(self.output_file), "a") as f:
+                    for record in records:
+                        f.write(json.dumps(record) + "\n")
+
+    # Totals per stage in the order the stages first ended
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        summary: Dict[str, Dict[str, Any]] = {}
+        with self.lock:
+            for record in self.records:
+                total = summary.setdefault(
+                    record["stage"], {"count": 0, "wall": 0.0, "cpu": 0.0}
+                )
+                total["count"] += 1
+                total["wall"] += record["wall"]
+                total["cpu"] += record["cpu"]
+                if record["n_items"] is not None:
+                    total["n_items"] = total.get("n_items", 0) + record["n_items"]
+                for key in self.memory_keys:
+                    if record.get(key) is not None:
+                        total[key] = max(total.get(key, record[key]), record[key])
+
+        for total in summary.values():
+            if "n_items" in total:
+                total["items_per_sec"] = total["n_items"] / max(total["wall"], 1e-9)
+        return summary
+
+    def dump(self, output_file: Path) -> None:
+        with open(str(output_file), "w") as f:
+            json.dump(self.summary(), f, indent=2)
@@ -1,14 +1,16 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum, auto
-from typing import Any, Callable, Dict, List
+from typing import Any, Callable, Dict, List, Optional
 
-from exrec.evaluation.interface import EvaluatorConfig, Metric
+from exrec.evaluation.interface import EvaluatorConfig, Metric, RatingMetric
 from exrec.evaluation.metrics.ranking import AUC, DCG, NDCG
 from exrec.evaluation.metrics.rating import MAE, MSE, RMSE
 
 
 class EvaluatorType(Enum):
     SIMPLE = auto()
+    RANKING = auto()
+    SAMPLED = auto()
 
 
 class MetricType(Enum):
@@ -20,6 +22,14 @@ class MetricType(Enum):
     RMSE = auto()
 
 
+class RankingMetricType(Enum):
+    NDCG = auto()
+    RECALL = auto()
+    MAP = auto()
+    MRR = auto()
+    HR = auto()
+
+
 GetMetric: Dict[MetricType, Metric] = {
     MetricType.AUC: AUC(),
     MetricType.DCG: DCG(),
@@ -30,14 +40,51 @@ GetMetric: Dict[MetricType, Metric] = {
 }
 
 
+GetRatingMetric: Dict[MetricType, RatingMetric] = {
+    MetricType.MAE: MAE(),
+    MetricType.MSE: MSE(),
+    MetricType.RMSE: RMSE(),
+}
+
+
 @dataclass
 class SimpleEvaluatorConfig(EvaluatorConfig):
     metrics: List[MetricType]
+    batch_size: int = 65536
+    # Keeps the predictions in the test data, which costs a column of the size
+    # of the test data. Saving the test output predicts them otherwise.
+    keep_pred: bool = False
 
     def __post_init__(self):
         self.metrics = list(map(lambda x: MetricType[x], self.metrics))
 
 
+@dataclass
+class RankingEvaluatorConfig(EvaluatorConfig):
+    metrics: List[RankingMetricType]
+    ks: List[int] = field(default_factory=lambda: [10])
+    threshold: float = 4.0
+
+    def __post_init__(self):
+        self.metrics = list(map(lambda x: RankingMetricType[x], self.metrics))
+
+
+@dataclass
+class SampledEvaluatorConfig(EvaluatorConfig):
+    metrics: List[RankingMetricType]
+    ks: List[int] = field(default_factory=lambda: [10])
+    n_negatives: int = 100
+    seed: int = 42
+    # Test items rated below are not ranked, all of them are if None.
+    threshold: Optional[float] = None
+    batch_size: int = 4096
+
+    def __post_init__(self):
+        self.metrics = list(map(lambda x: RankingMetricType[x], self.metrics))
+
+
 type_to_cfg: Dict[EvaluatorType, Callable[[Dict[str, Any]], EvaluatorConfig]] = {
-    EvaluatorType.SIMPLE: lambda x: SimpleEvaluatorConfig(**x)
+    EvaluatorType.SIMPLE: lambda x: SimpleEvaluatorConfig(**x),
+    EvaluatorType.RANKING: lambda x: RankingEvaluatorConfig(**x),
+    EvaluatorType.SAMPLED: lambda x: SampledEvaluatorConfig(**x),
 }
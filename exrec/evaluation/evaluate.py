@@ -1,7 +1,11 @@
-from typing import Any, Dict, Sequence
+from typing import Any, Dict, List, Optional, Sequence
 
+import numpy as np
 from exrec.core.interface import Logger
-from exrec.evaluation.config import GetMetric
+from exrec.evaluation.config import GetMetric, GetRatingMetric
+from exrec.evaluation.metrics.ranking import ranking_metrics, sampled_ranking_metrics
+from exrec.evaluation.metrics.rating import RatingAccumulator
+from exrec.evaluation.sampling import interaction_keys, sample_negatives
 from exrec.model.interface import Model
 from exrec.preprocessing.interface import RatingDataset
 
@@ -10,11 +14,82 @@ class SimpleEvaluator:
     cls_name: str
 
     metrics: Sequence[Any]
+    batch_size: int
+    keep_pred: bool
 
-    def __init__(self, metrics: Sequence[Any]):
+    def __init__(
+        self, metrics: Sequence[Any], batch_size: int = 65536, keep_pred: bool = False
+    ):
         self.cls_name = self.__class__.__name__
 
+        if batch_size < 1:
+            raise ValueError("batch_size should be integer greater than 0")
         self.metrics = metrics
+        self.batch_size = batch_size
+        self.keep_pred = keep_pred
+
+    def log_name(self) -> str:
+        return self.cls_name
+
+    def evaluate(
+        self, logger: Logger, model: Model, test_data: RatingDataset
+    ) -> Dict[str, float]:
+
+        # Rating metrics are read from one pass of chunked predictions, the
+        # other ones need every prediction at once.
+        whole = [metric for metric in self.metrics if metric not in GetRatingMetric]
+        keep_pred = self.keep_pred or len(whole) > 0
+
+        users, items, truth = test_data.get_ratings()
+        n_samples = len(truth)
+        pred: Optional[np.ndarray] = None
+        accumulator = RatingAccumulator()
+        logger.info(f"Predict {n_samples} ratings in chunks of {self.batch_size}")
+        with logger.timeit("predict", n_items=n_samples):
+            for begin in range(0, n_samples, self.batch_size):
+                end = min(begin + self.batch_size, n_samples)
+                chunk = np.asarray(
+                    model.predict_ratings(
+                        users=users[begin:end], items=items[begin:end]
+                    )
+                )
+                accumulator.update(true=truth[begin:end], pred=chunk)
+                if keep_pred:
+                    if pred is None:
+                        pred = np.empty(n_samples, dtype=chunk.dtype)
+                    pred[begin:end] = chunk
+
+        if keep_pred:
+            if pred is None:
+                pred = np.empty(0)
+            test_data.get_data()["pred"] = pred
+            test_data.col_pred = "pred"
+
+        score: Dict[str, float] = dict()
+        with logger.timeit("metrics", n_items=n_samples):
+            for metric in self.metrics:
+                if metric in GetRatingMetric:
+                    score[metric.name] = GetRatingMetric[metric].result(accumulator)
+                else:
+                    score[metric.name] = GetMetric[metric].calc(true=truth, pred=pred)
+        return score
+
+
+class RankingEvaluator:
+    cls_name: str
+
+    metrics: Sequence[Any]
+    ks: List[int]
+    threshold: float
+
+    def __init__(self, metrics: Sequence[Any], ks: List[int], threshold: float):
+        self.cls_name = self.__class__.__name__
+
+        if len(ks) == 0 or min(ks) < 1:
+            raise ValueError("ks should be integers greater than 0")
+        self.metrics = metrics
+        self.ks = sorted(ks)
+        self.threshold = threshold
 
     def log_name(self) -> str:
         return self.cls_name
@@ -26,14 +101,115 @@ class SimpleEvaluator:
         test_data = model.predict(
             logger=logger.get_child(model.log_name()), test_data=test_data
         )
-        truth = test_data.get_data().values(key=test_data.col_rating)
-        if test_data.col_pred is not None:
-            pred = test_data.get_data().values(key=test_data.col_pred)
-        else:
+        if test_data.col_pred is None:
             logger.error("Prediction is failed.")
             raise RuntimeError("Prediction is failed.")
 
-        score: Dict[str, float] = dict()
-        for metric in self.metrics:
-            score[metric.name] = GetMetric[metric].calc(true=truth, pred=pred)
-        return score
+        data = test_data.get_data()
+        with logger.timeit("metrics", n_items=len(data)):
+            return ranking_metrics(
+                users=data.values(key=test_data.col_user),
+                true=data.values(key=test_data.col_rating),
+                pred=data.values(key=test_data.col_pred),
+                names=[metric.name for metric in self.metrics],
+                ks=self.ks,
+                threshold=self.threshold,
+            )
+
+
+# Ranks every test interaction against `n_negatives` sampled items that the
+# user interacted with neither in the training data of the model nor in the
+# test data.
+class SampledEvaluator:
+    cls_name: str
+
+    metrics: Sequence[Any]
+    ks: List[int]
+    n_negatives: int
+    seed: int
+    threshold: Optional[float]
+    batch_size: int
+
+    supported = {"HR", "NDCG", "MRR"}
+
+    def __init__(
+        self,
+        metrics: Sequence[Any],
+        ks: List[int],
+        n_negatives: int,
+        seed: int,
+        threshold: Optional[float],
+        batch_size: int,
+    ):
+        self.cls_name = self.__class__.__name__
+
+        if len(ks) == 0 or min(ks) < 1:
+            raise ValueError("ks should be integers greater than 0")
+        if n_negatives < 1:
+            raise ValueError("n_negatives should be integer greater than 0")
+        if batch_size < 1:
+            raise ValueError("batch_size should be integer greater than 0")
+        for metric in metrics:
+            if metric.name not in self.supported:
+                raise ValueError(f"{metric.name} is not supported with sampling")
+        self.metrics = metrics
+        self.ks = sorted(ks)
+        self.n_negatives = n_negatives
+        self.seed = seed
+        self.threshold = threshold
+        self.batch_size = batch_size
+
+    def log_name(self) -> str:
+        return self.cls_name
+
+    def evaluate(
+        self, logger: Logger, model: Model, test_data: RatingDataset
+    ) -> Dict[str, float]:
+
+        users, items, ratings = map(np.asarray, test_data.get_ratings())
+        if self.threshold is not None:
+            positive = ratings >= self.threshold
+            users, items = users[positive], items[positive]
+
+        indexes = [test_data.get_index()]
+        if model.seen is not None:
+            indexes.append(model.seen)
+        else:
+            logger.warning("The model has no training data to exclude.")
+        keys = interaction_keys(indexes=indexes, n_items=test_data.n_items)
+
+        logger.info(f"Rank {len(users)} test items with {self.n_negatives} negatives")
+        names = [metric.name for metric in self.metrics]
+        sums = {f"{name}@{k}": 0.0 for k in self.ks for name in names}
+        rng = np.random.RandomState(seed=self.seed)
+        n_candidates = len(users) * (self.n_negatives + 1)
+        with logger.timeit("rank", n_items=n_candidates):
+            for begin in range(0, len(users), self.batch_size):
+                batch_users = users[begin : begin + self.batch_size]
+                negatives = sample_negatives(
+                    users=batch_users,
+                    keys=keys,
+                    n_items=test_data.n_items,
+                    n_negatives=self.n_negatives,
+                    rng=rng,
+                )
+                candidates = np.column_stack(
+                    [items[begin : begin + self.batch_size], negatives]
+                )
+                scores = np.asarray(
+                    model.predict_ratings(
+                        users=np.repeat(batch_users, candidates.shape[1]),
+                        items=candidates.ravel(),
+                    )
+                ).reshape(candidates.shape)
+
+                batch_sums = sampled_ranking_metrics(
+                    pos_scores=scores[:, 0],
+                    neg_scores=scores[:, 1:],
+                    names=names,
+                    ks=self.ks,
+                )
+                for key, value in batch_sums.items():
+                    sums[key] += value
+
+        return {key: value / max(len(users), 1) for key, value in sums.items()}
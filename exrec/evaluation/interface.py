@@ -3,6 +3,7 @@ from dataclasses import dataclass
 from typing import Any, Dict, Protocol, Sequence
 
 from exrec.core.interface import Logger
+from exrec.evaluation.metrics.rating import RatingAccumulator
 from exrec.model.interface import Model
 from exrec.preprocessing.interface import RatingDataset
 
@@ -17,6 +18,12 @@ class Metric(Protocol):
         ...
 
 
+# Metrics that can also be read from the statistics accumulated in one pass.
+class RatingMetric(Metric, Protocol):
+    def result(self, accumulator: RatingAccumulator) -> float:
+        ...
+
+
 class Evaluator(Protocol):
     cls_name: str
 
@@ -1,5 +1,6 @@
-from typing import Sequence
+from typing import Dict, Sequence, Tuple
 
+import numpy as np
 from sklearn import metrics
 
 
@@ -16,3 +17,105 @@ class DCG:
 class NDCG:
     def calc(self, true: Sequence[float], pred: Sequence[float]) -> float:
         return metrics.ndcg_score(true, pred)
+
+
+def _group_ranks(
+    users: np.ndarray, pred: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    # Orders the rows by user and decreasing prediction, and returns the order
+    # with the first row and the size of every user and the rank of every row.
+    n_samples = len(users)
+    # Same order as np.lexsort((-pred, users)) but the stable sort of the
+    # integer users is a radix sort, about twice as fast on large test sets.
+    order = np.argsort(-pred)
+    order = order[np.argsort(users[order], kind="stable")]
+    sorted_users = users[order]
+    is_start = np.ones(n_samples, dtype=bool)
+    is_start[1:] = sorted_users[1:] != sorted_users[:-1]
+    starts = np.flatnonzero(is_start)
+    sizes = np.diff(np.append(starts, n_samples))
+    rank = np.arange(n_samples) - np.repeat(starts, sizes)
+    return order, starts, sizes, rank
+
+
+# Per-user @K metrics of the test items ranked by their predictions, where the
+# items rated at least `threshold` are relevant. Every metric is averaged over
+# the users with a relevant item.
+def ranking_metrics(
+    users: Sequence[int],
+    true: Sequence[float],
+    pred: Sequence[float],
+    names: Sequence[str],
+    ks: Sequence[int],
+    threshold: float,
+) -> Dict[str, float]:
+    users = np.asarray(users)
+    scores = {f"{name}@{k}": 0.0 for k in ks for name in names}
+    if len(users) == 0:
+        return scores
+
+    order, starts, sizes, rank = _group_ranks(users=users, pred=np.asarray(pred))
+    rel = np.asarray(true)[order] >= threshold
+    n_rel = np.add.reduceat(rel.astype(np.int64), starts)
+    target = n_rel > 0
+    n_target = max(int(target.sum()), 1)
+
+    # Relevant items up to every row in the ranking of its user
+    cum_rel = np.cumsum(rel)
+    cum_rel -= np.repeat(cum_rel[starts] - rel[starts], sizes)
+    no_rel = np.iinfo(np.int64).max
+    first_rel = np.minimum.reduceat(np.where(rel, rank, no_rel), starts)
+
+    max_k = max(ks)
+    discount = 1.0 / np.log2(np.arange(max_k) + 2.0)
+    ideal_dcg = np.concatenate([[0.0], np.cumsum(discount)])
+    gain = np.where(rel, discount[np.minimum(rank, max_k - 1)], 0.0)
+    precision = np.where(rel, cum_rel / (rank + 1.0), 0.0)
+
+    for k in ks:
+        in_k = rank < k
+        hits = np.add.reduceat(rel & in_k, starts)
+        for name in names:
+            if name == "HR":
+                value = hits > 0
+            elif name == "RECALL":
+                value = hits / np.maximum(n_rel, 1)
+            elif name == "NDCG":
+                dcg = np.add.reduceat(np.where(in_k, gain, 0.0), starts)
+                value = dcg / np.maximum(ideal_dcg[np.minimum(n_rel, k)], 1e-12)
+            elif name == "MAP":
+                ap = np.add.reduceat(np.where(in_k, precision, 0.0), starts)
+                value = ap / np.maximum(np.minimum(n_rel, k), 1)
+            elif name == "MRR":
+                value = np.where(first_rel < k, 1.0 / (first_rel + 1.0), 0.0)
+            else:
+                raise NotImplementedError(f"Not Implemented {name}")
+            scores[f"{name}@{k}"] = float(np.sum(value[target]) / n_target)
+    return scores
+
+
+# Metrics at K of every positive item ranked against its sampled negatives,
+# summed over the positives so that chunks add up. Ties count against the
+# positive.
+def sampled_ranking_metrics(
+    pos_scores: np.ndarray,
+    neg_scores: np.ndarray,
+    names: Sequence[str],
+    ks: Sequence[int],
+) -> Dict[str, float]:
+    # NaN scores never beat a negative either.
+    rank = np.sum(~(neg_scores < pos_scores[:, np.newaxis]), axis=1)
+    sums: Dict[str, float] = {}
+    for k in ks:
+        in_k = rank < k
+        for name in names:
+            if name == "HR":
+                value = in_k.astype(np.float64)
+            elif name == "NDCG":
+                value = np.where(in_k, 1.0 / np.log2(rank + 2.0), 0.0)
+            elif name == "MRR":
+                value = np.where(in_k, 1.0 / (rank + 1.0), 0.0)
+            else:
+                raise NotImplementedError(f"Not Implemented {name}")
+            sums[f"{name}@{k}"] = float(np.sum(value))
+    return sums
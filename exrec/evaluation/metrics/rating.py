@@ -1,18 +1,63 @@
+from __future__ import annotations
+
 from typing import Sequence
 
-from sklearn import metrics
+import numpy as np
+
+
+# Sufficient statistics of the errors, updated chunk by chunk and mergeable
+# across workers, from which every rating metric is read.
+class RatingAccumulator:
+    count: int
+    sum_err: float
+    sum_abs: float
+    sum_sq: float
+
+    def __init__(self):
+        self.count = 0
+        self.sum_err = 0.0
+        self.sum_abs = 0.0
+        self.sum_sq = 0.0
+
+    def update(self, true: Sequence[float], pred: Sequence[float]) -> RatingAccumulator:
+        err = np.asarray(pred, dtype=np.float64) - np.asarray(true, dtype=np.float64)
+        self.count += len(err)
+        self.sum_err += float(np.sum(err))
+        self.sum_abs += float(np.sum(np.abs(err)))
+        self.sum_sq += float(np.dot(err, err))
+        return self
+
+    def merge(self, other: RatingAccumulator) -> RatingAccumulator:
+        merged = RatingAccumulator()
+        merged.count = self.count + other.count
+        merged.sum_err = self.sum_err + other.sum_err
+        merged.sum_abs = self.sum_abs + other.sum_abs
+        merged.sum_sq = self.sum_sq + other.sum_sq
+        return merged
+
+    def mean(self, total: float) -> float:
+        return total / self.count if self.count > 0 else float("nan")
 
 
 class MAE:
     def calc(self, true: Sequence[float], pred: Sequence[float]) -> float:
-        return metrics.mean_absolute_error(true, pred)
+        return self.result(RatingAccumulator().update(true, pred))
+
+    def result(self, accumulator: RatingAccumulator) -> float:
+        return accumulator.mean(accumulator.sum_abs)
 
 
 class MSE:
     def calc(self, true: Sequence[float], pred: Sequence[float]) -> float:
-        return metrics.mean_squared_error(true, pred, squared=True)
+        return self.result(RatingAccumulator().update(true, pred))
+
+    def result(self, accumulator: RatingAccumulator) -> float:
+        return accumulator.mean(accumulator.sum_sq)
 
 
 class RMSE:
     def calc(self, true: Sequence[float], pred: Sequence[float]) -> float:
-        return metrics.mean_squared_error(true, pred, squared=False)
+        return self.result(RatingAccumulator().update(true, pred))
+
+    def result(self, accumulator: RatingAccumulator) -> float:
+        return float(np.sqrt(accumulator.mean(accumulator.sum_sq)))
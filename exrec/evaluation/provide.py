@@ -1,7 +1,11 @@
 from dataclasses import asdict
 
 from exrec.evaluation.config import EvaluatorType
-from exrec.evaluation.evaluate import SimpleEvaluator
+from exrec.evaluation.evaluate import (
+    RankingEvaluator,
+    SampledEvaluator,
+    SimpleEvaluator,
+)
 from exrec.evaluation.interface import Evaluator, EvaluatorConfig
 
 
@@ -10,5 +14,9 @@ def provide_evaluator(
 ) -> Evaluator:
     if evaluator_type == EvaluatorType.SIMPLE:
         return SimpleEvaluator(**asdict(config))
+    elif evaluator_type == EvaluatorType.RANKING:
+        return RankingEvaluator(**asdict(config))
+    elif evaluator_type == EvaluatorType.SAMPLED:
+        return SampledEvaluator(**asdict(config))
     else:
         raise NotImplementedError("Not Implemented Evaluator.")
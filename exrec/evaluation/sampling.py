@@ -0,0 +1,45 @@
+from typing import List, Sequence
+
+import numpy as np
+from exrec.preprocessing.interface import InteractionIndex
+
+
+# Sorted user * n_items + item keys of all the interactions in `indexes`
+def interaction_keys(indexes: List[InteractionIndex], n_items: int) -> np.ndarray:
+    keys = []
+    for index in indexes:
+        by_user = index.by_user
+        users = np.repeat(np.arange(by_user.n_rows, dtype=np.int64), by_user.degree())
+        keys.append(users * n_items + by_user.indices)
+    return np.unique(np.concatenate(keys)) if keys else np.zeros(0, np.int64)
+
+
+def _contains(keys: np.ndarray, queries: np.ndarray) -> np.ndarray:
+    positions = np.minimum(np.searchsorted(keys, queries), max(len(keys) - 1, 0))
+    return keys[positions] == queries if len(keys) > 0 else np.zeros_like(queries, bool)
+
+
+# Draws `n_negatives` items per user, with replacement, among the items that
+# the user has no key for. Rejected draws are redrawn until none is left.
+def sample_negatives(
+    users: Sequence[int],
+    keys: np.ndarray,
+    n_items: int,
+    n_negatives: int,
+    rng: np.random.RandomState,
+    max_rounds: int = 100,
+) -> np.ndarray:
+    users = np.asarray(users, dtype=np.int64)
+    negatives = rng.randint(n_items, size=(len(users), n_negatives))
+    offsets = (users * n_items)[:, np.newaxis]
+
+    rejected = np.flatnonzero(_contains(keys, offsets + negatives))
+    for _ in range(max_rounds):
+        if len(rejected) == 0:
+            return negatives.astype(np.int32)
+        redrawn = rng.randint(n_items, size=len(rejected))
+        negatives.flat[rejected] = redrawn
+        rows = rejected // n_negatives
+        rejected = rejected[_contains(keys, users[rows] * n_items + redrawn)]
+
+    raise RuntimeError("Some users have interacted with almost every item")
@@ -0,0 +1,208 @@
+import time
+from pathlib import Path
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+from exrec.model.interface import ANNIndex
+
+
+def _augment(items: np.ndarray) -> np.ndarray:
+    # Maps maximum inner product search to nearest neighbour search by
+    # appending sqrt(M^2 - |v|^2) so that every item has the norm M.
+    norms = np.einsum("ij,ij->i", items, items)
+    extra = np.sqrt(np.maximum(norms.max() - norms, 0))
+    return np.hstack([items, extra[:, np.newaxis]])
+
+
+def _kmeans(
+    points: np.ndarray, n_clusters: int, n_iter: int, seed: int, block_size: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    rng = np.random.RandomState(seed=seed)
+    centroids = points[rng.choice(len(points), n_clusters, replace=False)].copy()
+    assign = np.zeros(len(points), dtype=np.int32)
+
+    for _ in range(n_iter):
+        sq_centroids = np.einsum("ij,ij->i", centroids, centroids)
+        for begin in range(0, len(points), block_size):
+            block = points[begin : begin + block_size]
+            dist = sq_centroids - 2 * block @ centroids.T
+            assign[begin : begin + block_size] = np.argmin(dist, axis=1)
+
+        counts = np.bincount(assign, minlength=n_clusters)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assign, points)
+        filled = counts > 0
+        centroids[filled] = sums[filled] / counts[filled, np.newaxis]
+
+        # Empty clusters restart from random points.
+        n_empty = int((~filled).sum())
+        if n_empty > 0:
+            centroids[~filled] = points[rng.choice(len(points), n_empty)]
+
+    return centroids, assign
+
+
+class IVFIndexImpl:
+    n_lists: int
+    n_probe: int
+    centroids: np.ndarray  # (n_lists, dim + 1) in the augmented space
+    list_ptr: np.ndarray  # (n_lists + 1,) int64
+    list_items: np.ndarray  # (n_items,) int32, item IDs grouped by list
+    list_factors: np.ndarray  # (n_items, dim), item factors grouped by list
+
+    def __init__(
+        self,
+        centroids: np.ndarray,
+        list_ptr: np.ndarray,
+        list_items: np.ndarray,
+        list_factors: np.ndarray,
+        n_probe: int,
+    ):
+        self.n_lists = len(centroids)
+        self.centroids = centroids
+        self.list_ptr = list_ptr
+        self.list_items = list_items
+        self.list_factors = list_factors
+        self.set_n_probe(n_probe)
+
+    def set_n_probe(self, n_probe: int) -> None:
+        if n_probe < 1:
+            raise ValueError("n_probe should be integer greater than 0")
+        self.n_probe = min(n_probe, self.n_lists)
+
+    def search(
+        self,
+        queries: np.ndarray,
+        k: int,
+        n_probe: Optional[int] = None,
+        block_size: int = 1024,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        n_probe = self.n_probe if n_probe is None else min(n_probe, self.n_lists)
+        dim = self.list_factors.shape[1]
+        sq_centroids = np.einsum("ij,ij->i", self.centroids, self.centroids)
+
+        top_items = np.full((len(queries), k), -1, dtype=np.int32)
+        top_scores = np.full((len(queries), k), -np.inf, dtype=queries.dtype)
+        for begin in range(0, len(queries), block_size):
+            block = queries[begin : begin + block_size]
+            items = top_items[begin : begin + block_size]
+            scores = top_scores[begin : begin + block_size]
+
+            # argmin |q - c|^2 over the augmented space where q has a zero tail
+            closeness = block @ self.centroids[:, :dim].T - sq_centroids / 2
+            probes = np.argpartition(-closeness, n_probe - 1, axis=1)[:, :n_probe]
+
+            # The queries that probe a list are scored against it in one matmul
+            # and merged into their running top k.
+            lists = probes.ravel()
+            order = np.argsort(lists, kind="stable")
+            by_list = np.repeat(np.arange(len(block)), n_probe)[order]
+            bounds = np.searchsorted(lists[order], np.arange(self.n_lists + 1))
+            for i in np.unique(lists):
+                lo, hi = self.list_ptr[i], self.list_ptr[i + 1]
+                if lo == hi:
+                    continue
+                rows = by_list[bounds[i] : bounds[i + 1]]
+                list_scores = block[rows] @ self.list_factors[lo:hi].T
+                list_items = np.broadcast_to(self.list_items[lo:hi], list_scores.shape)
+                if hi - lo > k:
+                    top = np.argpartition(-list_scores, k - 1, axis=1)[:, :k]
+                    list_scores = np.take_along_axis(list_scores, top, axis=1)
+                    list_items = np.take_along_axis(list_items, top, axis=1)
+
+                merged_scores = np.hstack([scores[rows], list_scores])
+                merged_items = np.hstack([items[rows], list_items])
+                top = np.argpartition(-merged_scores, k - 1, axis=1)[:, :k]
+                scores[rows] = np.take_along_axis(merged_scores, top, axis=1)
+                items[rows] = np.take_along_axis(merged_items, top, axis=1)
+
+            order = np.argsort(-scores, axis=1, kind="stable")
+            scores[...] = np.take_along_axis(scores, order, axis=1)
+            items[...] = np.take_along_axis(items, order, axis=1)
+
+        return top_items, top_scores
+
+    def exact_search(
+        self, queries: np.ndarray, k: int, block_size: int = 1024
+    ) -> np.ndarray:
+        k = min(k, len(self.list_items))
+        top_items = np.empty((len(queries), k), dtype=np.int32)
+        for begin in range(0, len(queries), block_size):
+            scores = queries[begin : begin + block_size] @ self.list_factors.T
+            top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+            top_items[begin : begin + block_size] = self.list_items[top]
+        return top_items
+
+    def report(
+        self, queries: np.ndarray, k: int, n_probes: Sequence[int]
+    ) -> Dict[int, Dict[str, float]]:
+        exact = self.exact_search(queries=queries, k=k)
+
+        report = {}
+        for n_probe in n_probes:
+            start = time.perf_counter()
+            approx, _ = self.search(queries=queries, k=k, n_probe=n_probe)
+            elapsed = time.perf_counter() - start
+
+            hits = sum(
+                len(np.intersect1d(a, e, assume_unique=True))
+                for a, e in zip(approx, exact)
+            )
+            report[n_probe] = {
+                f"recall@{k}": hits / exact.size,
+                "ms_per_query": 1000 * elapsed / max(len(queries), 1),
+            }
+        return report
+
+    def save(self, save_file: Path) -> None:
+        with open(str(save_file), "wb") as f:
+            np.savez(
+                f,
+                centroids=self.centroids,
+                list_ptr=self.list_ptr,
+                list_items=self.list_items,
+                list_factors=self.list_factors,
+                n_probe=self.n_probe,
+            )
+
+
+def load_ann_index(load_file: Path) -> ANNIndex:
+    with np.load(str(load_file)) as arrays:
+        return IVFIndexImpl(
+            centroids=arrays["centroids"],
+            list_ptr=arrays["list_ptr"],
+            list_items=arrays["list_items"],
+            list_factors=arrays["list_factors"],
+            n_probe=int(arrays["n_probe"]),
+        )
+
+
+def provide_ann_index(
+    items: np.ndarray,
+    n_lists: int,
+    n_probe: int,
+    seed: int,
+    n_iter: int = 10,
+    block_size: int = 65536,
+) -> ANNIndex:
+    if n_lists < 1 or n_lists > len(items):
+        raise ValueError("n_lists should be in [1, n_items]")
+
+    centroids, assign = _kmeans(
+        points=_augment(items),
+        n_clusters=n_lists,
+        n_iter=n_iter,
+        seed=seed,
+        block_size=block_size,
+    )
+    order = np.argsort(assign, kind="stable")
+    list_ptr = np.zeros(n_lists + 1, dtype=np.int64)
+    np.cumsum(np.bincount(assign, minlength=n_lists), out=list_ptr[1:])
+
+    return IVFIndexImpl(
+        centroids=centroids,
+        list_ptr=list_ptr,
+        list_items=order.astype(np.int32),
+        list_factors=items[order],
+        n_probe=n_probe,
+    )
@@ -1,6 +1,6 @@
 from dataclasses import dataclass
 from enum import Enum, auto
-from typing import Any, Callable, Dict
+from typing import Any, Callable, Dict, Union
 
 from exrec.model.interface import ModelConfig
 
@@ -9,6 +9,18 @@ class ModelType(Enum):
     MF = auto()
 
 
+class RepositoryType(Enum):
+    PICKLE = auto()
+    ARTIFACT = auto()
+
+
+class OptimizerType(Enum):
+    SGD = auto()
+    MINIBATCH_SGD = auto()
+    ALS = auto()
+    HOGWILD = auto()
+
+
 @dataclass
 class MFConfig(ModelConfig):
     n_users: int
@@ -18,6 +30,18 @@ class MFConfig(ModelConfig):
     epochs: int
     lr: float
     seed: int
+    optimizer: Union[OptimizerType, str] = OptimizerType.SGD
+    batch_size: int = 1024
+    block_size: int = 65536
+    n_threads: int = 1
+    n_workers: int = 1
+    dtype: str = "float64"
+    pred_batch_size: int = 65536
+    rec_batch_size: int = 1024
+
+    def __post_init__(self):
+        if isinstance(self.optimizer, str):
+            self.optimizer = OptimizerType[self.optimizer]
 
 
 type_to_cfg: Dict[ModelType, Callable[[Dict[str, Any]], ModelConfig]] = {
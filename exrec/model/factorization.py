@@ -1,10 +1,13 @@
 from datetime import datetime
+from typing import Any, Dict, Optional, Sequence, Tuple, Union
 
 import numpy as np
+from exrec.core.id import ItemID, UserID
 from exrec.core.interface import Logger
-from exrec.model.interface import Model
-from exrec.model.optimizer import als
-from exrec.preprocessing.interface import RatingDataset
+from exrec.model.config import OptimizerType
+from exrec.model.interface import EpochCallback, Model
+from exrec.model.optimizer import als, hogwild_sgd, minibatch_sgd, sgd, solve_rows
+from exrec.preprocessing.interface import InteractionIndex, RatingDataset
 
 
 class MF:
@@ -21,10 +24,25 @@ class MF:
     epochs: int
     lr: float
     seed: int
+    optimizer: OptimizerType
+    batch_size: int
+    block_size: int
+    n_threads: int
+    n_workers: int
+    dtype: np.dtype
+    pred_batch_size: int
+    rec_batch_size: int
 
     # Learnable paramerters
     U: np.ndarray  # (n_users, dim)
     V: np.ndarray  # (n_items, dim)
+    trained_epochs: int
+
+    # Interactions of the last training data, excluded from recommendations.
+    # They are neither pickled nor stored by the repositories, so a loaded
+    # model needs them set again, e.g. to `data.get_index()` of its training
+    # data, before recommending with `exclude_seen`.
+    seen: Optional[InteractionIndex]
 
     def __init__(
         self,
@@ -35,6 +53,15 @@ class MF:
         epochs: int = 100,
         lr: float = 0.01,
         seed: int = 42,
+        optimizer: Union[OptimizerType, str] = OptimizerType.SGD,
+        batch_size: int = 1024,
+        block_size: int = 65536,
+        n_threads: int = 1,
+        n_workers: int = 1,
+        dtype: str = "float64",
+        pred_batch_size: int = 65536,
+        rec_batch_size: int = 1024,
+        state: Optional[Dict[str, Any]] = None,
     ):
         self.cls_name = self.__class__.__name__
 
@@ -46,68 +73,318 @@ class MF:
         self.epochs = epochs
         self.lr = lr
         self.seed = seed
+        # Accepts the names written by `get_config`.
+        if isinstance(optimizer, str):
+            optimizer = OptimizerType[optimizer]
+        self.optimizer = optimizer
+        self.batch_size = batch_size
+        self.block_size = block_size
+        self.n_threads = n_threads
+        self.n_workers = n_workers
+        self.dtype = np.dtype(dtype)
+        if self.dtype.kind != "f":
+            raise ValueError("dtype should be a floating point type")
+        if pred_batch_size < 1:
+            raise ValueError("pred_batch_size should be integer greater than 0")
+        self.pred_batch_size = pred_batch_size
+        if rec_batch_size < 1:
+            raise ValueError("rec_batch_size should be integer greater than 0")
+        self.rec_batch_size = rec_batch_size
 
-        np.random.seed(seed=seed)
-        self.U = np.random.rand(n_users, dim)
-        self.V = np.random.rand(n_items, dim)
+        self.seen = None
+        if state is not None:
+            self.set_state(state)
+        else:
+            np.random.seed(seed=seed)
+            self.U = np.random.rand(n_users, dim).astype(self.dtype)
+            self.V = np.random.rand(n_items, dim).astype(self.dtype)
+            self.trained_epochs = 0
 
         self.set_name()
 
-    def fit(self, logger: Logger, data: RatingDataset) -> Model:
+    def fit(
+        self,
+        logger: Logger,
+        data: RatingDataset,
+        epochs: Optional[int] = None,
+        callback: Optional[EpochCallback] = None,
+    ) -> Model:
+        if epochs is None:
+            epochs = self.epochs
+        # Factors loaded as read-only memory maps are copied before training.
+        if not (self.U.flags.writeable and self.V.flags.writeable):
+            self.U, self.V = np.array(self.U), np.array(self.V)
+        # Successive calls must not replay the same shuffles.
+        seed = self.seed + self.trained_epochs
+        trained_epochs = self.trained_epochs
+        self.seen = data.get_index()
+
+        # Epochs are counted as they finish, so that a callback sees the model
+        # of the epoch and a stopped training keeps its count.
+        def on_epoch(epoch: int) -> bool:
+            self.trained_epochs = trained_epochs + epoch
+            return callback is not None and callback(epoch)
+
         n_samples = data.n_samples
-        users, items, ratings = data.get_ratings()
-        logger.info("Start ALS")
-        self.U, self.V = als(
-            logger=logger.get_child(als.__name__),
-            users=users,
-            items=items,
-            ratings=ratings,
-            U=self.U,
-            V=self.V,
-            n_samples=n_samples,
-            dim=self.dim,
-            reg=self.reg,
-            lr=self.lr,
-            epochs=self.epochs,
-            seed=self.seed,
-        )
-        logger.info("End ALS")
+        users, items, ratings = self._as_arrays(*data.get_ratings())
+        if self.optimizer == OptimizerType.SGD:
+            logger.info("Start SGD")
+            self.U, self.V = sgd(
+                logger=logger.get_child(sgd.__name__),
+                users=users,
+                items=items,
+                ratings=ratings,
+                U=self.U,
+                V=self.V,
+                n_samples=n_samples,
+                dim=self.dim,
+                reg=self.reg,
+                lr=self.lr,
+                epochs=epochs,
+                seed=seed,
+                callback=on_epoch,
+            )
+            logger.info("End SGD")
+        elif self.optimizer == OptimizerType.MINIBATCH_SGD:
+            logger.info("Start mini-batch SGD")
+            self.U, self.V = minibatch_sgd(
+                logger=logger.get_child(minibatch_sgd.__name__),
+                users=users,
+                items=items,
+                ratings=ratings,
+                U=self.U,
+                V=self.V,
+                n_samples=n_samples,
+                dim=self.dim,
+                reg=self.reg,
+                lr=self.lr,
+                epochs=epochs,
+                seed=seed,
+                batch_size=self.batch_size,
+                callback=on_epoch,
+            )
+            logger.info("End mini-batch SGD")
+        elif self.optimizer == OptimizerType.ALS:
+            logger.info("Start ALS")
+            self.U, self.V = als(
+                logger=logger.get_child(als.__name__),
+                users=users,
+                items=items,
+                ratings=ratings,
+                index=data.get_index(),
+                U=self.U,
+                V=self.V,
+                reg=self.reg,
+                epochs=epochs,
+                block_size=self.block_size,
+                n_threads=self.n_threads,
+                callback=on_epoch,
+            )
+            logger.info("End ALS")
+        elif self.optimizer == OptimizerType.HOGWILD:
+            logger.info("Start hogwild SGD")
+            self.U, self.V = hogwild_sgd(
+                logger=logger.get_child(hogwild_sgd.__name__),
+                users=users,
+                items=items,
+                ratings=ratings,
+                U=self.U,
+                V=self.V,
+                n_samples=n_samples,
+                dim=self.dim,
+                reg=self.reg,
+                lr=self.lr,
+                epochs=epochs,
+                seed=seed,
+                batch_size=self.batch_size,
+                n_workers=self.n_workers,
+                callback=on_epoch,
+            )
+            logger.info("End hogwild SGD")
+        else:
+            logger.error("Not Implemented Optimizer.")
+            raise NotImplementedError("Not Implemented Optimizer.")
 
         return self
 
+    def fold_in(
+        self, logger: Logger, data: RatingDataset, delta: RatingDataset
+    ) -> Model:
+        index = data.get_index()
+        n_users = max(self.n_users, index.by_user.n_rows)
+        n_items = max(self.n_items, index.by_item.n_rows)
+
+        np.random.seed(seed=self.seed + self.trained_epochs)
+        if n_users > self.n_users:
+            logger.info(f"Add {n_users - self.n_users} users")
+            new_U = np.random.rand(n_users - self.n_users, self.dim)
+            self.U = np.vstack([self.U, new_U.astype(self.dtype)])
+        if n_items > self.n_items:
+            logger.info(f"Add {n_items - self.n_items} items")
+            new_V = np.random.rand(n_items - self.n_items, self.dim)
+            self.V = np.vstack([self.V, new_V.astype(self.dtype)])
+        if not (self.U.flags.writeable and self.V.flags.writeable):
+            self.U, self.V = np.array(self.U), np.array(self.V)
+        self.n_users, self.n_items = n_users, n_items
+
+        users, items, _ = self._as_arrays(*delta.get_ratings())
+        logger.info("Start the fold-in")
+        with logger.timeit("fold_in", n_items=len(users)):
+            solve_rows(
+                index=index.by_user,
+                rows=users,
+                fixed=self.V,
+                target=self.U,
+                reg=self.reg,
+                block_size=self.block_size,
+            )
+            solve_rows(
+                index=index.by_item,
+                rows=items,
+                fixed=self.U,
+                target=self.V,
+                reg=self.reg,
+                block_size=self.block_size,
+            )
+        logger.info("End the fold-in")
+
+        self.seen = index
+        self.set_name()
+        return self
+
+    def predict_ratings(
+        self, users: Sequence[UserID], items: Sequence[ItemID]
+    ) -> np.ndarray:
+        users, items, _ = self._as_arrays(users=users, items=items)
+        pred = np.empty(len(users), dtype=self.dtype)
+        # Chunking bounds the gathered (chunk, dim) factor rows.
+        for begin in range(0, len(users), self.pred_batch_size):
+            end = begin + self.pred_batch_size
+            np.einsum(
+                "ij,ij->i",
+                self.U[users[begin:end]],
+                self.V[items[begin:end]],
+                out=pred[begin:end],
+            )
+        return pred
+
+    def recommend(
+        self,
+        users: Sequence[UserID],
+        k: int,
+        exclude_seen: bool = True,
+        seen: Optional[InteractionIndex] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        if k < 1:
+            raise ValueError("k should be integer greater than 0")
+        if seen is None:
+            seen = self.seen
+        if exclude_seen and seen is None:
+            raise RuntimeError(
+                "There are no seen items to exclude. Pass `seen` or set it on "
+                "a loaded model, or recommend with exclude_seen=False."
+            )
+
+        users, _, _ = self._as_arrays(users=users, items=[])
+        k = min(k, self.n_items)
+        top_items = np.empty((len(users), k), dtype=np.int32)
+        top_scores = np.empty((len(users), k), dtype=self.dtype)
+
+        # Each block holds a (rec_batch_size, n_items) score matrix.
+        for begin in range(0, len(users), self.rec_batch_size):
+            block = users[begin : begin + self.rec_batch_size]
+            scores = self.U[block] @ self.V.T
+
+            if exclude_seen and seen is not None:
+                known = np.flatnonzero(block < seen.by_user.n_rows)
+                positions, items, _ = seen.by_user.gather(block[known])
+                scores[known[positions], items] = -np.inf
+
+            candidates = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+            candidate_scores = np.take_along_axis(scores, candidates, axis=1)
+            order = np.argsort(-candidate_scores, axis=1)
+
+            end = begin + len(block)
+            top_items[begin:end] = np.take_along_axis(candidates, order, axis=1)
+            top_scores[begin:end] = np.take_along_axis(candidate_scores, order, axis=1)
+
+        # Users with fewer than k unseen items are padded with excluded items.
+        top_items[np.isneginf(top_scores)] = -1
+        return top_items, top_scores
+
+    def _as_arrays(
+        self,
+        users: Sequence[UserID],
+        items: Sequence[ItemID],
+        ratings: Optional[Sequence[float]] = None,
+    ) -> Tuple[np.ndarray, np.ndarray, Optional[np.ndarray]]:
+        # Narrow the IDs and ratings once so that the hot loops never upcast.
+        index_dtype = (
+            np.int32 if max(self.n_users, self.n_items) < 2**31 else np.int64
+        )
+        return (
+            np.asarray(users, dtype=index_dtype),
+            np.asarray(items, dtype=index_dtype),
+            None if ratings is None else np.asarray(ratings, dtype=self.dtype),
+        )
+
+    def get_factors(self) -> Tuple[np.ndarray, np.ndarray]:
+        return self.U, self.V
+
+    # The factors are not copied, so training keeps updating the snapshot.
+    def get_state(self) -> Dict[str, Any]:
+        return {"U": self.U, "V": self.V, "trained_epochs": self.trained_epochs}
+
+    # The arrays are adopted without copying so memory maps stay shared.
+    def set_state(self, state: Dict[str, Any]) -> None:
+        self.U = state["U"]
+        self.V = state["V"]
+        self.trained_epochs = state["trained_epochs"]
+
+    def get_config(self) -> Dict[str, Any]:
+        return {
+            "n_users": self.n_users,
+            "n_items": self.n_items,
+            "dim": self.dim,
+            "reg": self.reg,
+            "epochs": self.epochs,
+            "lr": self.lr,
+            "seed": self.seed,
+            "optimizer": self.optimizer.name,
+            "batch_size": self.batch_size,
+            "block_size": self.block_size,
+            "n_threads": self.n_threads,
+            "n_workers": self.n_workers,
+            "dtype": self.dtype.name,
+            "pred_batch_size": self.pred_batch_size,
+            "rec_batch_size": self.rec_batch_size,
+        }
+
     def predict(
         self, logger: Logger, test_data: RatingDataset, col_pred: str = "pred"
     ) -> RatingDataset:
-        grouped_data = test_data.groupby_user()
-        pred_data = type(test_data.data)(
-            {
-                test_data.col_user: [],
-                test_data.col_item: [],
-                test_data.col_rating: [],
-                col_pred: [],
-            }
-        )
+        users, items, _ = test_data.get_ratings()
         logger.info("Start the prediction.")
-        for user, data in grouped_data.items():
-            items = data.values(key=test_data.col_item)
-            pred = np.dot(self.U[user, :], self.V[items, :].T)
-            data[col_pred] = pred
-            pred_data = pred_data.append(data)
-
-        pred_data.astype(key=test_data.col_user, type=int)
-        pred_data.astype(key=test_data.col_item, type=int)
-        test_data.data = pred_data
+        with logger.timeit("predict", n_items=len(users)):
+            pred = self.predict_ratings(users=users, items=items)
+        test_data.get_data()[col_pred] = pred
         test_data.col_pred = col_pred
-        logger.info("End the training")
+        logger.info("End the prediction.")
 
         return test_data
 
+    def __getstate__(self) -> Dict[str, Any]:
+        # The training index can be as large as the data, so it is not pickled.
+        state = self.__dict__.copy()
+        state["seen"] = None
+        return state
+
     def log_name(self) -> str:
         return self.cls_name
 
     def set_name(self) -> None:
         now = datetime.now().strftime("%Y-%m-%d-%H:%M:%S")
-        self.name = f"MF:{now}-n_users:{self.n_users}-n_items{self.n_items}-dim:{self.dim}-reg{self.reg}-epochs:{self.epochs}-lr:{self.lr}-seed:{self.seed}"
+        self.name = f"MF:{now}-n_users:{self.n_users}-n_items{self.n_items}-dim:{self.dim}-reg{self.reg}-epochs:{self.epochs}-lr:{self.lr}-seed:{self.seed}-dtype:{self.dtype}"
 
     def get_name(self) -> str:
         return self.name
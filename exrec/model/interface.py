@@ -3,10 +3,16 @@ from __future__ import annotations
 from abc import ABCMeta
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Protocol
+from typing import Any, Callable, Dict, Optional, Protocol, Sequence, Tuple
 
-from exrec.core.interface import Logger
-from exrec.preprocessing.interface import RatingDataset
+from exrec.core.id import ItemID, UserID
+from exrec.core.interface import LabelEncoder, Logger
+from exrec.preprocessing.interface import InteractionIndex, RatingDataset
+
+
+# Called after every epoch of `fit` with the number of epochs finished in the
+# call, and stops the training when it returns True.
+EpochCallback = Callable[[int], bool]
 
 
 @dataclass
@@ -20,7 +26,24 @@ class Model(Protocol):
     # This name is used when storing the model to a model repository.
     name: str
 
-    def fit(self, logger: Logger, data: RatingDataset) -> Model:
+    # Interactions of the last training data, if the model keeps them.
+    seen: Optional[InteractionIndex]
+
+    # Trains `epochs` more epochs, or the configured number if it is None.
+    def fit(
+        self,
+        logger: Logger,
+        data: RatingDataset,
+        epochs: Optional[int] = None,
+        callback: Optional[EpochCallback] = None,
+    ) -> Model:
+        ...
+
+    # Updates the model for the interactions in `delta` without retraining
+    # from scratch. `data` holds every interaction including `delta`.
+    def fold_in(
+        self, logger: Logger, data: RatingDataset, delta: RatingDataset
+    ) -> Model:
         ...
 
     def predict(
@@ -31,6 +54,39 @@ class Model(Protocol):
     ) -> RatingDataset:
         ...
 
+    def predict_ratings(
+        self, users: Sequence[UserID], items: Sequence[ItemID]
+    ) -> Sequence[float]:
+        ...
+
+    # Returns the top `k` items and their scores for each user. Items in `seen`
+    # (by default the training data of the last `fit`) are excluded, and the
+    # slots left without an unseen item hold the item -1 with a -inf score.
+    def recommend(
+        self,
+        users: Sequence[UserID],
+        k: int,
+        exclude_seen: bool = True,
+        seen: Optional[InteractionIndex] = None,
+    ) -> Tuple[Sequence[Sequence[ItemID]], Sequence[Sequence[float]]]:
+        ...
+
+    # Returns the (user factors, item factors)
+    def get_factors(self) -> Tuple[Any, Any]:
+        ...
+
+    # The learnable parameters that `set_state` can restore. The arrays may be
+    # shared with the model, so copy them to keep a snapshot across training.
+    def get_state(self) -> Dict[str, Any]:
+        ...
+
+    def set_state(self, state: Dict[str, Any]) -> None:
+        ...
+
+    # The hyper parameters as a JSON serializable ModelConfig dictionary
+    def get_config(self) -> Dict[str, Any]:
+        ...
+
     def log_name(self):
         ...
 
@@ -41,14 +97,56 @@ class Model(Protocol):
         ...
 
 
+# Approximate maximum inner product search over item factors
+class ANNIndex(Protocol):
+    n_probe: int
+
+    def set_n_probe(self, n_probe: int) -> None:
+        ...
+
+    def search(
+        self, queries: Any, k: int, n_probe: Optional[int] = None
+    ) -> Tuple[Sequence[Sequence[ItemID]], Sequence[Sequence[float]]]:
+        ...
+
+    def exact_search(self, queries: Any, k: int) -> Sequence[Sequence[ItemID]]:
+        ...
+
+    # Returns recall@k and latency for each number of probed lists
+    def report(
+        self, queries: Any, k: int, n_probes: Sequence[int]
+    ) -> Dict[int, Dict[str, float]]:
+        ...
+
+    def save(self, save_file: Path) -> None:
+        ...
+
+
 class Repository(Protocol):
     repo_dir: Path
 
     def __init__(self, repo_dir: Path):
         ...
 
-    def store(self, model: Model) -> None:
+    def store(
+        self,
+        model: Model,
+        user_encoder: Optional[LabelEncoder] = None,
+        item_encoder: Optional[LabelEncoder] = None,
+    ) -> None:
         ...
 
     def load(self, model_file: Path) -> Model:
         ...
+
+    # Returns the (user encoder, item encoder) stored with the model
+    def load_encoders(
+        self, model_file: Path
+    ) -> Tuple[Optional[LabelEncoder], Optional[LabelEncoder]]:
+        ...
+
+    def store_index(self, model: Model, index: ANNIndex) -> None:
+        ...
+
+    def load_index(self, model_file: Path) -> ANNIndex:
+        ...
@@ -1,10 +1,18 @@
-from typing import Sequence, Tuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+from typing import Dict, List, Optional, Sequence, Tuple
 
 import numpy as np
 from exrec.core.interface import Logger
+from exrec.model.interface import EpochCallback
+from exrec.preprocessing.interface import CompressedIndex, InteractionIndex
 
 
-def als(
+def _stop(callback: Optional[EpochCallback], epoch: int) -> bool:
+    return callback is not None and callback(epoch + 1)
+
+
+def sgd(
     logger: Logger,
     users: Sequence[int],
     items: Sequence[int],
@@ -17,8 +25,11 @@ def als(
     lr: float,
     epochs: int,
     seed: int,
+    callback: Optional[EpochCallback] = None,
 ) -> Tuple[np.ndarray, np.ndarray]:
 
+    ratings = np.asarray(ratings, dtype=U.dtype)
+
     np.random.seed(seed=seed)
     index = np.arange(n_samples)
     np.random.shuffle(index)
@@ -26,11 +37,388 @@ def als(
     for e in range(epochs):
         logger.info(f"Epoch: {e}/{epochs}")
 
-        for idx in index:
-            i = users[idx]
-            j = items[idx]
-            diff = ratings[idx] - np.dot(U[i, :], V[j, :])
-            U[i, :] = U[i, :] + lr * (2 * diff * V[j, :] - reg * U[i, :])
-            V[j, :] = V[j, :] + lr * (2 * diff * U[i, :] - reg * V[j, :])
+        with logger.timeit("epoch", n_items=n_samples):
+            for idx in index:
+                i = users[idx]
+                j = items[idx]
+                diff = ratings[idx] - np.dot(U[i, :], V[j, :])
+                U[i, :] = U[i, :] + lr * (2 * diff * V[j, :] - reg * U[i, :])
+                V[j, :] = V[j, :] + lr * (2 * diff * U[i, :] - reg * V[j, :])
+
+        if _stop(callback, e):
+            break
+
+    return (U, V)
+
+
+def _minibatch_step(
+    users: np.ndarray,
+    items: np.ndarray,
+    ratings: np.ndarray,
+    U: np.ndarray,
+    V: np.ndarray,
+    reg: float,
+    lr: float,
+) -> None:
+    U_b = U[users]
+    V_b = V[items]
+    diff = ratings - np.einsum("ij,ij->i", U_b, V_b)
+    grad_U = lr * (2 * diff[:, np.newaxis] * V_b - reg * U_b)
+    grad_V = lr * (2 * diff[:, np.newaxis] * U_b - reg * V_b)
+    _mean_update(U, users, grad_U)
+    _mean_update(V, items, grad_V)
+
+
+def _mean_update(target: np.ndarray, rows: np.ndarray, grad: np.ndarray) -> None:
+    # A row repeated in a batch takes the mean of its gradients. Summing them
+    # would scale the step with the row popularity and diverge on power-law data.
+    unique, inverse, counts = np.unique(rows, return_inverse=True, return_counts=True)
+    step = np.zeros((len(unique), grad.shape[1]), dtype=grad.dtype)
+    np.add.at(step, inverse, grad)
+    target[unique] += step / counts[:, np.newaxis].astype(grad.dtype)
+
+
+def minibatch_sgd(
+    logger: Logger,
+    users: Sequence[int],
+    items: Sequence[int],
+    ratings: Sequence[float],
+    U: np.ndarray,
+    V: np.ndarray,
+    n_samples: int,
+    dim: int,
+    reg: float,
+    lr: float,
+    epochs: int,
+    seed: int,
+    batch_size: int,
+    callback: Optional[EpochCallback] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+
+    if batch_size < 1:
+        raise ValueError("batch_size should be integer greater than 0")
+
+    users = np.asarray(users)
+    items = np.asarray(items)
+    ratings = np.asarray(ratings, dtype=U.dtype)
+
+    np.random.seed(seed=seed)
+    for e in range(epochs):
+        index = np.random.permutation(n_samples)
+
+        with logger.timeit("epoch", n_items=n_samples) as timing:
+            for begin in range(0, n_samples, batch_size):
+                batch = index[begin : begin + batch_size]
+                _minibatch_step(
+                    users=users[batch],
+                    items=items[batch],
+                    ratings=ratings[batch],
+                    U=U,
+                    V=V,
+                    reg=reg,
+                    lr=lr,
+                )
+
+        logger.info(f"Epoch: {e}/{epochs} ({timing['items_per_sec']:.0f} ratings/sec)")
+        if _stop(callback, e):
+            break
+
+    return (U, V)
+
+
+def _row_blocks(indptr: np.ndarray, block_size: int) -> List[Tuple[int, int]]:
+    # Split rows so that every block holds about `block_size` ratings.
+    # A single row with more ratings than `block_size` forms its own block.
+    n_rows = len(indptr) - 1
+    blocks = []
+    start = 0
+    while start < n_rows:
+        end = int(np.searchsorted(indptr, indptr[start] + block_size, side="right"))
+        end = min(max(end - 1, start + 1), n_rows)
+        blocks.append((start, end))
+        start = end
+    return blocks
+
+
+# Rows solved together in one batched matmul and solve
+_GRAM_ROWS = 4096
+
+
+def _normal_equations(
+    F: np.ndarray, values: np.ndarray, degree: np.ndarray, reg: float
+) -> np.ndarray:
+    # Solves the stacked (F_u^T F_u + reg * n_u * I) x_u = F_u^T r_u where the
+    # rows of F are grouped by u with `degree` rows each (all degrees > 0).
+    dim = F.shape[1]
+    offsets = np.cumsum(degree) - degree
+    eye = np.eye(dim, dtype=F.dtype)
+    x = np.empty((len(degree), dim), dtype=F.dtype)
+
+    # Rows whose degrees share a power of two are zero-padded to the largest of
+    # them, so the padding at most doubles F and the Gram matrices take
+    # O(rows * dim^2) memory instead of O(nnz * dim^2).
+    buckets = np.frexp(degree)[1]
+    order = np.argsort(buckets, kind="stable")
+    bounds = np.flatnonzero(np.diff(buckets[order])) + 1
+    for rows in np.split(order, bounds):
+        for begin in range(0, len(rows), _GRAM_ROWS):
+            chunk = rows[begin : begin + _GRAM_ROWS]
+            cols = np.arange(degree[chunk].max())
+            mask = cols < degree[chunk][:, np.newaxis]
+            positions = np.where(mask, offsets[chunk][:, np.newaxis] + cols, 0)
+            F_p = F[positions]
+            F_p[~mask] = 0
+            values_p = np.where(mask, values[positions], 0).astype(F.dtype)
+
+            F_t = F_p.transpose(0, 2, 1)
+            A = F_t @ F_p
+            A += (reg * degree[chunk]).astype(F.dtype)[:, np.newaxis, np.newaxis] * eye
+            b = F_t @ values_p[..., np.newaxis]
+            x[chunk] = np.linalg.solve(A, b)[..., 0]
+    return x
+
+
+def _solve_block(
+    start: int,
+    end: int,
+    indptr: np.ndarray,
+    indices: np.ndarray,
+    data: np.ndarray,
+    fixed: np.ndarray,
+    target: np.ndarray,
+    reg: float,
+) -> None:
+    degree = np.diff(indptr[start : end + 1])
+    rated = degree > 0
+    if not rated.any():
+        return
+
+    lo, hi = indptr[start], indptr[end]
+    target[start:end][rated] = _normal_equations(
+        F=fixed[indices[lo:hi]], values=data[lo:hi], degree=degree[rated], reg=reg
+    )
+
+
+def _solve_rows(
+    index: CompressedIndex,
+    fixed: np.ndarray,
+    target: np.ndarray,
+    reg: float,
+    block_size: int,
+    executor: ThreadPoolExecutor,
+) -> None:
+    futures = [
+        executor.submit(
+            _solve_block,
+            start=start,
+            end=end,
+            indptr=index.indptr,
+            indices=index.indices,
+            data=index.data,
+            fixed=fixed,
+            target=target,
+            reg=reg,
+        )
+        for start, end in _row_blocks(indptr=index.indptr, block_size=block_size)
+    ]
+    for future in futures:
+        future.result()
+
+
+def als(
+    logger: Logger,
+    users: Sequence[int],
+    items: Sequence[int],
+    ratings: Sequence[float],
+    index: InteractionIndex,
+    U: np.ndarray,
+    V: np.ndarray,
+    reg: float,
+    epochs: int,
+    block_size: int,
+    n_threads: int,
+    callback: Optional[EpochCallback] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+
+    if block_size < 1:
+        raise ValueError("block_size should be integer greater than 0")
+    if n_threads < 1:
+        raise ValueError("n_threads should be integer greater than 0")
+
+    users = np.asarray(users)
+    items = np.asarray(items)
+    ratings = np.asarray(ratings, dtype=U.dtype)
+
+    if index.by_user.n_rows > U.shape[0] or index.by_item.n_rows > V.shape[0]:
+        raise ValueError("The index has more users or items than the factors")
+
+    with ThreadPoolExecutor(max_workers=n_threads) as executor:
+        for e in range(epochs):
+            with logger.timeit("epoch", n_items=len(ratings)) as timing:
+                _solve_rows(index.by_user, V, U, reg, block_size, executor)
+                _solve_rows(index.by_item, U, V, reg, block_size, executor)
+
+            diff = ratings - np.einsum("ij,ij->i", U[users], V[items])
+            rmse = float(np.sqrt(np.mean(diff**2)))
+            logger.info(
+                f"Epoch: {e}/{epochs} "
+                f"(train RMSE: {rmse:.4f}, {timing['wall']:.2f} sec)"
+            )
+            if _stop(callback, e):
+                break
 
     return (U, V)
+
+
+# Shared buffers attached by each hogwild worker process.
+_hogwild_memory: List[SharedMemory] = []
+_hogwild_arrays: Dict[str, np.ndarray] = {}
+
+
+def _hogwild_init(specs: Dict[str, Tuple[str, Tuple[int, ...], str]]) -> None:
+    for key, (name, shape, dtype) in specs.items():
+        memory = SharedMemory(name=name)
+        _hogwild_memory.append(memory)
+        _hogwild_arrays[key] = np.ndarray(shape, dtype=dtype, buffer=memory.buf)
+
+
+def _hogwild_shard(
+    begin: int, end: int, reg: float, lr: float, batch_size: int
+) -> None:
+    arrays = _hogwild_arrays
+    index = arrays["index"]
+    for start in range(begin, end, batch_size):
+        batch = index[start : min(start + batch_size, end)]
+        _minibatch_step(
+            users=arrays["users"][batch],
+            items=arrays["items"][batch],
+            ratings=arrays["ratings"][batch],
+            U=arrays["U"],
+            V=arrays["V"],
+            reg=reg,
+            lr=lr,
+        )
+
+
+def _to_shared(array: np.ndarray) -> Tuple[SharedMemory, np.ndarray]:
+    memory = SharedMemory(create=True, size=max(array.nbytes, 1))
+    shared = np.ndarray(array.shape, dtype=array.dtype, buffer=memory.buf)
+    shared[...] = array
+    return memory, shared
+
+
+def hogwild_sgd(
+    logger: Logger,
+    users: Sequence[int],
+    items: Sequence[int],
+    ratings: Sequence[float],
+    U: np.ndarray,
+    V: np.ndarray,
+    n_samples: int,
+    dim: int,
+    reg: float,
+    lr: float,
+    epochs: int,
+    seed: int,
+    batch_size: int,
+    n_workers: int,
+    callback: Optional[EpochCallback] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+
+    if batch_size < 1:
+        raise ValueError("batch_size should be integer greater than 0")
+    if n_workers < 1:
+        raise ValueError("n_workers should be integer greater than 0")
+
+    arrays = {
+        "users": np.asarray(users),
+        "items": np.asarray(items),
+        "ratings": np.asarray(ratings, dtype=U.dtype),
+        "U": U,
+        "V": V,
+        "index": np.arange(n_samples),
+    }
+    memories: List[SharedMemory] = []
+    shared: Dict[str, np.ndarray] = {}
+    try:
+        for key, array in arrays.items():
+            memory, shared[key] = _to_shared(array)
+            memories.append(memory)
+        specs = {
+            key: (memory.name, array.shape, array.dtype.str)
+            for memory, (key, array) in zip(memories, shared.items())
+        }
+
+        bounds = np.linspace(0, n_samples, n_workers + 1).astype(int)
+        np.random.seed(seed=seed)
+        with ProcessPoolExecutor(
+            max_workers=n_workers, initializer=_hogwild_init, initargs=(specs,)
+        ) as executor:
+            for e in range(epochs):
+                shared["index"][:] = np.random.permutation(n_samples)
+
+                # Workers update U and V without locks and meet at the epoch end.
+                with logger.timeit("epoch", n_items=n_samples) as timing:
+                    futures = [
+                        executor.submit(
+                            _hogwild_shard,
+                            int(begin),
+                            int(end),
+                            reg,
+                            lr,
+                            batch_size,
+                        )
+                        for begin, end in zip(bounds[:-1], bounds[1:])
+                    ]
+                    for future in futures:
+                        future.result()
+
+                logger.info(
+                    f"Epoch: {e}/{epochs} "
+                    f"({timing['items_per_sec']:.0f} ratings/sec, "
+                    f"{n_workers} workers)"
+                )
+                if callback is not None:
+                    # The callback sees the factors of the finished epoch.
+                    U[...] = shared["U"]
+                    V[...] = shared["V"]
+                    if callback(e + 1):
+                        break
+
+        U[...] = shared["U"]
+        V[...] = shared["V"]
+    finally:
+        shared.clear()
+        for memory in memories:
+            memory.close()
+            memory.unlink()
+
+    return (U, V)
+
+
+def solve_rows(
+    index: CompressedIndex,
+    rows: Sequence[int],
+    fixed: np.ndarray,
+    target: np.ndarray,
+    reg: float,
+    block_size: int,
+) -> None:
+    rows = np.unique(np.asarray(rows))
+    degree = np.asarray(index.degree())[rows]
+    rows, degree = rows[degree > 0], degree[degree > 0]
+    cum_degree = np.cumsum(degree)
+
+    start = 0
+    while start < len(rows):
+        limit = cum_degree[start] - degree[start] + block_size
+        end = max(int(np.searchsorted(cum_degree, limit, side="right")), start + 1)
+        block = rows[start:end]
+        _, cols, values = index.gather(block)
+        target[block] = _normal_equations(
+            F=fixed[cols],
+            values=np.asarray(values),
+            degree=degree[start:end],
+            reg=reg,
+        )
+        start = end
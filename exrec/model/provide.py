@@ -1,13 +1,18 @@
 from dataclasses import asdict
+from typing import Any, Dict, Optional
 
 from exrec.model.config import ModelType
 from exrec.model.factorization import MF as MFModel
 from exrec.model.interface import Model, ModelConfig
 
 
-def provide_model(model_type: ModelType, config: ModelConfig) -> Model:
+def provide_model(
+    model_type: ModelType,
+    config: ModelConfig,
+    state: Optional[Dict[str, Any]] = None,
+) -> Model:
     if model_type == ModelType.MF:
-        model = MFModel(**asdict(config))
+        model = MFModel(**asdict(config), state=state)
     else:
         raise NotImplementedError("Not Implemented Model")
     return model
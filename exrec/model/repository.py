@@ -1,7 +1,17 @@
+import json
 import pickle
 from pathlib import Path
+from typing import List, Optional, Tuple
 
-from exrec.model.interface import Model, Repository
+import numpy as np
+from exrec.core.config import EncoderType, UnseenPolicy
+from exrec.core.interface import LabelEncoder
+from exrec.core.label_encoder import provide_label_encoder
+from exrec.model.ann import load_ann_index
+from exrec.model.config import ModelType, RepositoryType
+from exrec.model.config import type_to_cfg as type_to_model_cfg
+from exrec.model.interface import ANNIndex, Model, Repository
+from exrec.model.provide import provide_model
 
 
 class RepositoryImpl:
@@ -10,7 +20,13 @@ class RepositoryImpl:
     def __init__(self, repo_dir: Path):
         self.repo_dir = repo_dir
 
-    def store(self, model: Model) -> None:
+    # The pickle format keeps only the model, so the encoders are not stored.
+    def store(
+        self,
+        model: Model,
+        user_encoder: Optional[LabelEncoder] = None,
+        item_encoder: Optional[LabelEncoder] = None,
+    ) -> None:
         save_file = self.repo_dir / (model.get_name() + ".pkl")
         with open(str(save_file), "wb") as f:
             pickle.dump(model, f)
@@ -21,6 +37,129 @@ class RepositoryImpl:
             model = pickle.load(f)
         return model
 
+    def load_encoders(
+        self, model_file: Path
+    ) -> Tuple[Optional[LabelEncoder], Optional[LabelEncoder]]:
+        return None, None
 
-def provide_repository(repo_dir: Path) -> Repository:
-    return RepositoryImpl(repo_dir=repo_dir)
+    def store_index(self, model: Model, index: ANNIndex) -> None:
+        index.save(self.repo_dir / (model.get_name() + ".ivf.npz"))
+
+    def load_index(self, model_file: Path) -> ANNIndex:
+        load_file = self.repo_dir / model_file.with_suffix(".ivf.npz")
+        return load_ann_index(load_file)
+
+
+# A model is stored as a directory with one .npy file per factor matrix and
+# a meta.json with the model type, hyper parameters and encoders.
+class ArtifactRepositoryImpl:
+    repo_dir: Path
+    mmap_mode: Optional[str]
+
+    meta_file = Path("meta.json")
+    index_file = Path("ivf.npz")
+
+    def __init__(self, repo_dir: Path, mmap_mode: Optional[str] = "r"):
+        self.repo_dir = repo_dir
+        self.mmap_mode = mmap_mode
+
+    def store(
+        self,
+        model: Model,
+        user_encoder: Optional[LabelEncoder] = None,
+        item_encoder: Optional[LabelEncoder] = None,
+    ) -> None:
+        save_dir = self.repo_dir / model.get_name()
+        save_dir.mkdir(exist_ok=True)
+
+        state = model.get_state()
+        arrays = {k: v for k, v in state.items() if isinstance(v, np.ndarray)}
+        for key, array in arrays.items():
+            np.save(str(save_dir / f"{key}.npy"), array, allow_pickle=False)
+
+        meta = {
+            "model_type": model.cls_name,
+            "name": model.get_name(),
+            "config": model.get_config(),
+            "state": {k: v for k, v in state.items() if k not in arrays},
+            "arrays": sorted(arrays),
+            "user_encoder": None,
+            "item_encoder": None,
+        }
+        for key, encoder in [
+            ("user_encoder", user_encoder),
+            ("item_encoder", item_encoder),
+        ]:
+            if encoder is not None:
+                meta[key] = {
+                    "classes": np.asarray(encoder.get_classes()).tolist(),
+                    **encoder.get_config(),
+                }
+
+        with open(str(save_dir / self.meta_file), "w") as f:
+            json.dump(meta, f)
+
+    def load(self, model_file: Path) -> Model:
+        load_dir = self.repo_dir / model_file
+        meta = self.load_meta(model_file)
+
+        state = dict(meta["state"])
+        for key in meta["arrays"]:
+            state[key] = np.load(
+                str(load_dir / f"{key}.npy"),
+                mmap_mode=self.mmap_mode,
+                allow_pickle=False,
+            )
+
+        model_type = ModelType[meta["model_type"]]
+        model = provide_model(
+            model_type=model_type,
+            config=type_to_model_cfg[model_type](meta["config"]),
+            state=state,
+        )
+        model.name = meta["name"]
+        return model
+
+    def load_meta(self, model_file: Path) -> dict:
+        with open(str(self.repo_dir / model_file / self.meta_file)) as f:
+            return json.load(f)
+
+    def load_encoders(
+        self, model_file: Path
+    ) -> Tuple[Optional[LabelEncoder], Optional[LabelEncoder]]:
+        meta = self.load_meta(model_file)
+        encoders: List[Optional[LabelEncoder]] = []
+        for key in ["user_encoder", "item_encoder"]:
+            if meta[key] is None:
+                encoders.append(None)
+            else:
+                encoders.append(
+                    provide_label_encoder(
+                        labels=meta[key]["classes"],
+                        encoder_type=EncoderType[meta[key]["encoder_type"]],
+                        unseen=UnseenPolicy[meta[key]["unseen"]],
+                        keep_order=True,
+                    )
+                )
+        return encoders[0], encoders[1]
+
+    def store_index(self, model: Model, index: ANNIndex) -> None:
+        save_dir = self.repo_dir / model.get_name()
+        save_dir.mkdir(exist_ok=True)
+        index.save(save_dir / self.index_file)
+
+    def load_index(self, model_file: Path) -> ANNIndex:
+        return load_ann_index(self.repo_dir / model_file / self.index_file)
+
+
+def provide_repository(
+    repo_dir: Path,
+    repo_type: RepositoryType = RepositoryType.PICKLE,
+    mmap_mode: Optional[str] = "r",
+) -> Repository:
+    if repo_type == RepositoryType.PICKLE:
+        return RepositoryImpl(repo_dir=repo_dir)
+    elif repo_type == RepositoryType.ARTIFACT:
+        return ArtifactRepositoryImpl(repo_dir=repo_dir, mmap_mode=mmap_mode)
+    else:
+        raise NotImplementedError("Not Implemented Repository")
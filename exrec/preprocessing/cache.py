@@ -0,0 +1,105 @@
+import hashlib
+import json
+import shutil
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import numpy as np
+import pandas as pd
+from exrec.core.dataframe import DataFrameImpl
+from exrec.core.interface import DataFrame, LabelEncoder
+from exrec.preprocessing.config import DataType
+from exrec.preprocessing.interface import DataConfig, DatasetCache, RatingDataset
+
+
+def _encoder_identity(encoder: Optional[LabelEncoder]) -> Optional[str]:
+    if encoder is None:
+        return None
+    classes = np.asarray(encoder.get_classes())
+    digest = hashlib.sha256(type(encoder).__name__.encode())
+    # The unseen label policy decides the codes, or the rows, of unseen labels.
+    digest.update(json.dumps(encoder.get_config(), sort_keys=True).encode())
+    if classes.dtype.kind in "biuf":
+        digest.update(classes.dtype.str.encode())
+        digest.update(np.ascontiguousarray(classes).tobytes())
+    else:
+        digest.update("\0".join(map(str, classes)).encode())
+    return digest.hexdigest()
+
+
+# Parsed and label encoded datasets are stored as one .npy file per column
+# under a directory per source file, together with a meta.json holding the
+# key of the source fingerprint, data config and encoders they came from.
+class DatasetCacheImpl:
+    cache_dir: Path
+
+    meta_file = Path("meta.json")
+
+    def __init__(self, cache_dir: Path):
+        self.cache_dir = cache_dir
+
+    def entry_dir(self, data_path: Path) -> Path:
+        source = str(data_path.resolve())
+        return self.cache_dir / hashlib.sha1(source.encode()).hexdigest()[:16]
+
+    def key(
+        self,
+        data_path: Path,
+        data_type: DataType,
+        config: DataConfig,
+        encoders: Dict[str, Optional[LabelEncoder]],
+    ) -> str:
+        stat = data_path.stat()
+        fingerprint: Dict[str, Any] = {
+            "source": str(data_path.resolve()),
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "data_type": data_type.name,
+            "config": asdict(config),
+            "encoders": {k: _encoder_identity(v) for k, v in encoders.items()},
+        }
+        return hashlib.sha256(
+            json.dumps(fingerprint, sort_keys=True).encode()
+        ).hexdigest()
+
+    def load(self, data_path: Path, key: str) -> Optional[DataFrame]:
+        entry = self.entry_dir(data_path)
+        meta_file = entry / self.meta_file
+        if not meta_file.exists():
+            return None
+
+        with open(str(meta_file)) as f:
+            meta = json.load(f)
+        if meta["key"] != key:
+            # The source or the settings changed since it was cached.
+            shutil.rmtree(str(entry))
+            return None
+
+        columns = {
+            col: np.load(str(entry / f"{i}.npy"), mmap_mode="r", allow_pickle=False)
+            for i, col in enumerate(meta["columns"])
+        }
+        return DataFrameImpl(data=pd.DataFrame(columns, copy=False))
+
+    def store(self, data_path: Path, key: str, dataset: RatingDataset) -> bool:
+        data = dataset.get_data().get_data()
+        # Only numeric columns can be memory-mapped without pickling.
+        if any(dtype.kind not in "biufM" for dtype in data.dtypes):
+            return False
+
+        entry = self.entry_dir(data_path)
+        if entry.exists():
+            shutil.rmtree(str(entry))
+        entry.mkdir(parents=True)
+
+        for i, col in enumerate(data.columns):
+            np.save(str(entry / f"{i}.npy"), data[col].to_numpy(), allow_pickle=False)
+        # meta.json is written last so that partial entries are never loaded.
+        with open(str(entry / self.meta_file), "w") as f:
+            json.dump({"key": key, "columns": list(map(str, data.columns))}, f)
+        return True
+
+
+def provide_dataset_cache(cache_dir: Path) -> DatasetCache:
+    return DatasetCacheImpl(cache_dir=cache_dir)
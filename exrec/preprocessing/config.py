@@ -1,6 +1,6 @@
 from dataclasses import dataclass
 from enum import Enum, auto
-from typing import Any, Callable, Dict, Optional
+from typing import Any, Callable, Dict, List, Optional
 
 from exrec.preprocessing.interface import DataConfig
 
@@ -18,6 +18,29 @@ class RatingDataConfig(DataConfig):
     col_rating: str = 'rate'
     col_pred: Optional[str] = None
     col_timestamp: Optional[str] = None
+    # Parser options of the data files
+    user_dtype: Optional[str] = None
+    item_dtype: Optional[str] = None
+    rating_dtype: Optional[str] = None
+    timestamp_dtype: Optional[str] = None
+    engine: Optional[str] = None
+    chunk_size: Optional[int] = None
+
+    def usecols(self) -> List[str]:
+        cols = [self.col_user, self.col_item, self.col_rating]
+        if self.col_timestamp is not None:
+            cols.append(self.col_timestamp)
+        return cols
+
+    def dtypes(self) -> Dict[str, str]:
+        dtypes = {
+            self.col_user: self.user_dtype,
+            self.col_item: self.item_dtype,
+            self.col_rating: self.rating_dtype,
+        }
+        if self.col_timestamp is not None:
+            dtypes[self.col_timestamp] = self.timestamp_dtype
+        return {k: v for k, v in dtypes.items() if v is not None}
 
 
 type_to_cfg: Dict[DataType, Callable[[Dict[str, Any]], DataConfig]] = {
@@ -2,10 +2,18 @@ from __future__ import annotations
 
 from typing import Dict, Optional, Sequence, Tuple
 
+import numpy as np
 from exrec.core.id import ItemID, UserID
 from exrec.core.interface import DataFrame, LabelEncoder
-from exrec.preprocessing.interface import RatingDataset
-from sklearn.model_selection import train_test_split
+from exrec.preprocessing.index import provide_interaction_index
+from exrec.preprocessing.interface import InteractionIndex, RatingDataset
+from exrec.preprocessing.split import (
+    leave_last_n_index,
+    random_split_index,
+    stratified_split_index,
+    timestamp_split_index,
+    user_timestamp_split_index,
+)
 
 
 class RatingDatasetImpl:
@@ -22,6 +30,7 @@ class RatingDatasetImpl:
     col_pred: Optional[str]
     col_timestamp: Optional[str]
     label_encoders: Dict[str, LabelEncoder]
+    index: Optional[InteractionIndex]
 
     def __init__(
         self,
@@ -33,14 +42,15 @@ class RatingDatasetImpl:
         col_rating: str,
         col_timestamp: Optional[str],
         col_pred: Optional[str],
+        drop_duplicates: bool = True,
     ):
         self.cls_name = self.__class__.__name__
 
-        self.data = data.drop_duplicates()
-        self.n_samples = len(data)
+        self.data = data.drop_duplicates() if drop_duplicates else data
+        self.n_samples = len(self.data)
         self.n_users = n_users
         self.n_items = n_items
-        self.has_timesamp = col_timestamp is not None
+        self.has_timestamp = col_timestamp is not None
         self.col_user = col_user
         self.col_item = col_item
         self.col_rating = col_rating
@@ -50,6 +60,7 @@ class RatingDatasetImpl:
         self.split_by_col = {col_user: col_item, col_item: col_user}
 
         self.label_encoders: Dict[str, LabelEncoder] = {}
+        self.index = None
 
     def log_name(self) -> str:
         return self.cls_name
@@ -59,8 +70,15 @@ class RatingDatasetImpl:
             raise RuntimeError("This column is already encoded.")
 
         if encoder is not None:
-            self.data[col] = encoder.encode(self.data[col])
+            codes = np.asarray(encoder.encode(self.data[col]))
+            # Rows of labels that the encoder drops are removed.
+            if (codes < 0).any():
+                self.data = self.data.take(np.flatnonzero(codes >= 0))
+                codes = codes[codes >= 0]
+                self.n_samples = len(self.data)
+            self.data[col] = codes
             self.label_encoders[col] = encoder
+            self.index = None
 
     def label_decode(self, col: str, encoder: Optional[LabelEncoder] = None) -> None:
         if col not in self.label_encoders:
@@ -69,6 +87,7 @@ class RatingDatasetImpl:
         if encoder is not None:
             self.data[col] = encoder.decode(self.data[col])
             self.label_encoders.pop(col)
+            self.index = None
 
     def random_split(
         self, train_ratio: float = 0.6, seed: int = 42
@@ -76,37 +95,10 @@ class RatingDatasetImpl:
         if train_ratio < 0 or train_ratio > 1:
             raise ValueError("train_ratio should be in [0, 1]")
 
-        train, test = train_test_split(
-            self.data.copy(deep=True).get_data(),
-            train_size=train_ratio,
-            test_size=None,
-            shuffle=True,
-            random_state=seed,
-            straitify=None,
+        train, test = random_split_index(
+            n_samples=len(self.data), train_ratio=train_ratio, seed=seed
         )
-
-        train = RatingDatasetImpl(
-            data=type(self.data)(train),
-            n_users=self.n_users,
-            n_items=self.n_items,
-            col_user=self.col_user,
-            col_item=self.col_item,
-            col_rating=self.col_rating,
-            col_pred=self.col_pred,
-            col_timestamp=self.col_timestamp,
-        )
-
-        test = RatingDatasetImpl(
-            data=type(self.data)(test),
-            n_users=self.n_users,
-            n_items=self.n_items,
-            col_user=self.col_user,
-            col_item=self.col_item,
-            col_rating=self.col_rating,
-            col_pred=self.col_pred,
-            col_timestamp=self.col_timestamp,
-        )
-        return train, test
+        return self.subset(train), self.subset(test)
 
     def satisfied_split(
         self,
@@ -123,76 +115,76 @@ class RatingDatasetImpl:
             raise ValueError("min_samples should be integer greater than 0")
 
         if min_samples > 1:
-            data = self.data.groupby(self.split_by_col[filter_by]).filter(
-                lambda x: len(x) >= min_samples
-            )
+            index = self.get_index()
+            count_by = self.split_by_col[filter_by]
+            if count_by == self.col_user:
+                degree = index.by_user.degree()
+            else:
+                degree = index.by_item.degree()
+            rows = np.flatnonzero(degree[self.data.values(count_by)] >= min_samples)
         else:
-            data = self.data.copy(deep=True)
-
-        train, test = train_test_split(
-            data.get_data(),
-            train_size=train_ratio,
-            test_size=None,
-            shuffle=True,
-            straitify=data[filter_by],
-            random_state=seed,
-        )
+            rows = np.arange(len(self.data))
 
-        train = RatingDatasetImpl(
-            data=type(self.data)(train),
-            n_users=self.n_users,
-            n_items=self.n_items,
-            col_user=self.col_user,
-            col_item=self.col_item,
-            col_rating=self.col_rating,
-            col_pred=self.col_pred,
-            col_timestamp=self.col_timestamp,
-        )
-
-        test = RatingDatasetImpl(
-            data=type(self.data)(test),
-            n_users=self.n_users,
-            n_items=self.n_items,
-            col_user=self.col_user,
-            col_item=self.col_item,
-            col_rating=self.col_rating,
-            col_pred=self.col_pred,
-            col_timestamp=self.col_timestamp,
+        train, test = stratified_split_index(
+            labels=self.data.values(filter_by)[rows],
+            train_ratio=train_ratio,
+            seed=seed,
         )
-        return train, test
+        return self.subset(rows[train]), self.subset(rows[test])
 
     def timestamp_split(
         self, train_ratio: float = 0.6
     ) -> Tuple[RatingDataset, RatingDataset]:
 
-        if not self.has_timestamp:
+        if self.col_timestamp is None:
             raise ValueError("The DataFrame does not have the `timestamp` column")
 
         if train_ratio < 0 or train_ratio > 1:
             raise ValueError("train_ratio should be in [0, 1]")
 
-        data = self.data.sort_values("timestamp")
-        train, test = train_test_split(
-            data.get_data(),
-            train_size=train_ratio,
-            test_size=None,
-            shuffle=False,
-            straitify=None,
+        train, test = timestamp_split_index(
+            timestamps=self.data.values(self.col_timestamp), train_ratio=train_ratio
         )
+        return self.subset(train), self.subset(test)
 
-        train = RatingDatasetImpl(
-            data=type(self.data)(train),
-            n_users=self.n_users,
-            n_items=self.n_items,
-            col_user=self.col_user,
-            col_item=self.col_item,
-            col_rating=self.col_rating,
-            col_pred=self.col_pred,
-            col_timestamp=self.col_timestamp,
+    def leave_last_n_split(
+        self, n_last: int = 1
+    ) -> Tuple[RatingDataset, RatingDataset]:
+
+        if self.col_timestamp is None:
+            raise ValueError("The DataFrame does not have the `timestamp` column")
+
+        if n_last < 1:
+            raise ValueError("n_last should be integer greater than 0")
+
+        train, test = leave_last_n_index(
+            users=self.data.values(self.col_user),
+            timestamps=self.data.values(self.col_timestamp),
+            n_last=n_last,
         )
+        return self.subset(train), self.subset(test)
+
+    def user_timestamp_split(
+        self, train_ratio: float = 0.6
+    ) -> Tuple[RatingDataset, RatingDataset]:
+
+        if self.col_timestamp is None:
+            raise ValueError("The DataFrame does not have the `timestamp` column")
 
-        test = RatingDatasetImpl(
-            data=type(self.data)(test),
+        if train_ratio < 0 or train_ratio > 1:
+            raise ValueError("train_ratio should be in [0, 1]")
+
+        train, test = user_timestamp_split_index(
+            users=self.data.values(self.col_user),
+            timestamps=self.data.values(self.col_timestamp),
+            train_ratio=train_ratio,
+        )
+        return self.subset(train), self.subset(test)
+
+    # The rows are gathered once; they are unique already and keep the encoders.
+    def subset(self, rows: Sequence[int]) -> RatingDataset:
+        dataset = RatingDatasetImpl(
+            data=self.data.take(rows),
             n_users=self.n_users,
             n_items=self.n_items,
             col_user=self.col_user,
@@ -200,8 +192,10 @@ class RatingDatasetImpl:
             col_rating=self.col_rating,
             col_pred=self.col_pred,
             col_timestamp=self.col_timestamp,
+            drop_duplicates=False,
         )
-        return train, test
+        dataset.label_encoders.update(self.label_encoders)
+        return dataset
 
     def get_ratings(self) -> Tuple[Sequence[UserID], Sequence[ItemID], Sequence[float]]:
         return (
@@ -217,14 +211,30 @@ class RatingDatasetImpl:
             [self.col_item, self.col_rating]
         )
 
+    def get_index(self) -> InteractionIndex:
+        if self.index is None:
+            users, items, ratings = self.get_ratings()
+            self.index = provide_interaction_index(
+                users=users,
+                items=items,
+                ratings=ratings,
+                n_users=self.n_users,
+                n_items=self.n_items,
+            )
+        return self.index
+
     def get_data(self) -> DataFrame:
         return self.data
 
     def remove(self, remove: DataFrame) -> None:
         self.data = self.data.remove(remove=remove, keys=[self.col_user, self.col_item])
+        self.n_samples = len(self.data)
+        self.index = None
 
     def add(self, add: DataFrame) -> None:
         self.data = self.data.append(add=add)
+        self.n_samples = len(self.data)
+        self.index = None
 
     def to_csv(self, file_name: str, index: bool) -> None:
         self.data.to_csv(file_name=file_name, index=index)
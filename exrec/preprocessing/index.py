@@ -0,0 +1,80 @@
+from typing import Sequence, Tuple
+
+import numpy as np
+from exrec.preprocessing.interface import CompressedIndex, InteractionIndex
+
+
+class CompressedIndexImpl:
+    n_rows: int
+    indptr: np.ndarray  # (n_rows + 1,) int64
+    indices: np.ndarray  # (n_samples,) int32
+    data: np.ndarray  # (n_samples,) float32
+
+    def __init__(
+        self, rows: np.ndarray, cols: np.ndarray, vals: np.ndarray, n_rows: int
+    ):
+        order = np.argsort(rows, kind="stable")
+
+        self.n_rows = n_rows
+        self.indptr = np.zeros(n_rows + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=n_rows), out=self.indptr[1:])
+        self.indices = cols[order].astype(np.int32)
+        self.data = vals[order].astype(np.float32)
+
+    def row(self, row: int) -> Tuple[np.ndarray, np.ndarray]:
+        start, end = self.indptr[row], self.indptr[row + 1]
+        return self.indices[start:end], self.data[start:end]
+
+    def degree(self) -> np.ndarray:
+        return np.diff(self.indptr)
+
+    def gather(self, rows: Sequence[int]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        rows = np.asarray(rows)
+        starts = self.indptr[rows]
+        lengths = self.indptr[rows + 1] - starts
+        offsets = np.cumsum(lengths) - lengths
+
+        positions = np.repeat(np.arange(len(rows)), lengths)
+        entries = np.arange(lengths.sum()) + np.repeat(starts - offsets, lengths)
+        return positions, self.indices[entries], self.data[entries]
+
+
+class InteractionIndexImpl:
+    by_user: CompressedIndex
+    by_item: CompressedIndex
+
+    def __init__(
+        self,
+        users: Sequence[int],
+        items: Sequence[int],
+        ratings: Sequence[float],
+        n_users: int,
+        n_items: int,
+    ):
+        users = np.asarray(users)
+        items = np.asarray(items)
+        ratings = np.asarray(ratings)
+
+        # Unencoded IDs may exceed the configured sizes.
+        if len(users) > 0:
+            n_users = max(n_users, int(users.max()) + 1)
+            n_items = max(n_items, int(items.max()) + 1)
+
+        self.by_user = CompressedIndexImpl(
+            rows=users, cols=items, vals=ratings, n_rows=n_users
+        )
+        self.by_item = CompressedIndexImpl(
+            rows=items, cols=users, vals=ratings, n_rows=n_items
+        )
+
+
+def provide_interaction_index(
+    users: Sequence[int],
+    items: Sequence[int],
+    ratings: Sequence[float],
+    n_users: int,
+    n_items: int,
+) -> InteractionIndex:
+    return InteractionIndexImpl(
+        users=users, items=items, ratings=ratings, n_users=n_users, n_items=n_items
+    )
@@ -3,7 +3,8 @@ from __future__ import annotations
 from abc import ABCMeta
 from dataclasses import dataclass
 from enum import Enum, auto
-from typing import Dict, Optional, Protocol, Sequence, Tuple
+from pathlib import Path
+from typing import Any, Dict, Optional, Protocol, Sequence, Tuple
 
 from exrec.core.id import ItemID, UserID
 from exrec.core.interface import DataFrame, LabelEncoder
@@ -13,6 +14,8 @@ class SplitType(Enum):
     RANDOM = auto()
     SATISFIED = auto()
     TIMESTAMP = auto()
+    LEAVE_LAST_N = auto()
+    USER_TIMESTAMP = auto()
 
 
 @dataclass
@@ -23,6 +26,33 @@ class DataConfig(metaclass=ABCMeta):
     col_item: str
 
 
+# Compressed sparse rows: the columns and values of the row `r` are
+# indices[indptr[r]:indptr[r + 1]] and data[indptr[r]:indptr[r + 1]].
+class CompressedIndex(Protocol):
+    n_rows: int
+    indptr: Any
+    indices: Any
+    data: Any
+
+    def row(self, row: int) -> Tuple[Sequence[int], Sequence[float]]:
+        ...
+
+    def degree(self) -> Sequence[int]:
+        ...
+
+    # Returns (position in `rows`, column, value) for every entry of `rows`
+    def gather(
+        self, rows: Sequence[int]
+    ) -> Tuple[Sequence[int], Sequence[int], Sequence[float]]:
+        ...
+
+
+# CSR by user and CSC by item of the (user, item, rating) triples
+class InteractionIndex(Protocol):
+    by_user: CompressedIndex
+    by_item: CompressedIndex
+
+
 # DataFrame has (user, item, rating, (timestamp)) columns
 class RatingDataset(Protocol):
     cls_name: str
@@ -37,6 +67,7 @@ class RatingDataset(Protocol):
     col_rating: str
     col_pred: Optional[str]
     col_timestamp: Optional[str]
+    label_encoders: Dict[str, LabelEncoder]
 
     def __init__(
         self,
@@ -47,6 +78,8 @@ class RatingDataset(Protocol):
         col_item: str,
         col_rating: str,
         col_timestamp: Optional[str] = None,
+        col_pred: Optional[str] = None,
+        drop_duplicates: bool = True,
     ):
         ...
 
@@ -73,12 +106,30 @@ class RatingDataset(Protocol):
     ) -> Tuple[RatingDataset, RatingDataset]:
         ...
 
-    # Need the `timestamp` column in data
+    # Need the `col_timestamp` column in data
     def timestamp_split(
         self, train_ratio: float = 0.6
     ) -> Tuple[RatingDataset, RatingDataset]:
         ...
 
+    # Need the `col_timestamp` column in data. The last `n_last` interactions
+    # of each user are tested while the first one is always trained.
+    def leave_last_n_split(
+        self, n_last: int = 1
+    ) -> Tuple[RatingDataset, RatingDataset]:
+        ...
+
+    # Need the `col_timestamp` column in data. Splits the interactions of each
+    # user in time with at least one of them trained.
+    def user_timestamp_split(
+        self, train_ratio: float = 0.6
+    ) -> Tuple[RatingDataset, RatingDataset]:
+        ...
+
+    # A dataset of the given rows sharing the config and label encoders
+    def subset(self, rows: Sequence[int]) -> RatingDataset:
+        ...
+
     def get_ratings(self) -> Tuple[Sequence[UserID], Sequence[ItemID], Sequence[float]]:
         ...
 
@@ -87,6 +138,10 @@ class RatingDataset(Protocol):
     ) -> Dict[UserID, DataFrame]:
         ...
 
+    # Built lazily and invalidated when the data is changed
+    def get_index(self) -> InteractionIndex:
+        ...
+
     def get_data(self) -> DataFrame:
         ...
 
@@ -98,3 +153,21 @@ class RatingDataset(Protocol):
 
     def to_csv(self, file_name: str, index: bool) -> None:
         ...
+
+
+class DatasetCache(Protocol):
+    def key(
+        self,
+        data_path: Path,
+        data_type: Any,
+        config: DataConfig,
+        encoders: Dict[str, Optional[LabelEncoder]],
+    ) -> str:
+        ...
+
+    def load(self, data_path: Path, key: str) -> Optional[DataFrame]:
+        ...
+
+    # Returns False when the dataset cannot be cached
+    def store(self, data_path: Path, key: str, dataset: RatingDataset) -> bool:
+        ...
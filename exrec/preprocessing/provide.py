@@ -1,17 +1,95 @@
-from dataclasses import asdict
+from contextlib import nullcontext
 from pathlib import Path
+from typing import Any, ContextManager, Dict, Optional
 
+from exrec.core.config import UnseenPolicy
 from exrec.core.dataframe import read_csv
-from exrec.preprocessing.config import DataType
+from exrec.core.interface import DataFrame, LabelEncoder, Logger
+from exrec.preprocessing.config import DataType, RatingDataConfig
 from exrec.preprocessing.dataset import RatingDatasetImpl
-from exrec.preprocessing.interface import DataConfig, RatingDataset
+from exrec.preprocessing.interface import DataConfig, DatasetCache, RatingDataset
 
 
 def provide_dataset(
     data_path: Path, data_type: DataType, config: DataConfig, sep=","
 ) -> RatingDataset:
-    data = read_csv(src_file=data_path, sep=sep)
-    if data_type == DataType.RATING:
-        return RatingDatasetImpl(data=data, **asdict(config))
+    if data_type == DataType.RATING and isinstance(config, RatingDataConfig):
+        data = read_csv(
+            src_file=data_path,
+            sep=sep,
+            usecols=config.usecols(),
+            dtype=config.dtypes(),
+            engine=config.engine,
+            chunk_size=config.chunk_size,
+        )
+        return _rating_dataset(data=data, config=config)
     else:
         raise NotImplementedError("Not Implemented Dataset")
+
+
+def provide_encoded_dataset(
+    data_path: Path,
+    data_type: DataType,
+    config: DataConfig,
+    encoders: Dict[str, Optional[LabelEncoder]],
+    cache: Optional[DatasetCache] = None,
+    sep=",",
+    logger: Optional[Logger] = None,
+) -> RatingDataset:
+    # Stages are timed only with a logger.
+    def timeit(stage: str) -> ContextManager[Any]:
+        return nullcontext() if logger is None else logger.timeit(stage)
+
+    # Encoders that grow while encoding could not be restored with a cached
+    # dataset, which would then hold codes beyond their classes.
+    if cache is not None and any(
+        encoder is not None and encoder.get_config()["unseen"] == UnseenPolicy.GROW.name
+        for encoder in encoders.values()
+    ):
+        if logger is not None:
+            logger.info("Skip the dataset cache for encoders that grow")
+        cache = None
+
+    key: Optional[str] = None
+    if cache is not None:
+        key = cache.key(
+            data_path=data_path, data_type=data_type, config=config, encoders=encoders
+        )
+        with timeit("cache_load"):
+            data = cache.load(data_path=data_path, key=key)
+        if data is not None and isinstance(config, RatingDataConfig):
+            # Cached columns are already deduplicated and encoded.
+            dataset = _rating_dataset(data=data, config=config, drop_duplicates=False)
+            for col, encoder in encoders.items():
+                if encoder is not None:
+                    dataset.label_encoders[col] = encoder
+            return dataset
+
+    with timeit("read"):
+        dataset = provide_dataset(
+            data_path=data_path, data_type=data_type, config=config, sep=sep
+        )
+    with timeit("encode"):
+        for col, encoder in encoders.items():
+            dataset.label_encode(col=col, encoder=encoder)
+
+    if cache is not None and key is not None:
+        with timeit("cache_store"):
+            cache.store(data_path=data_path, key=key, dataset=dataset)
+    return dataset
+
+
+def _rating_dataset(
+    data: DataFrame, config: RatingDataConfig, drop_duplicates: bool = True
+) -> RatingDataset:
+    return RatingDatasetImpl(
+        data=data,
+        n_users=config.n_users,
+        n_items=config.n_items,
+        col_user=config.col_user,
+        col_item=config.col_item,
+        col_rating=config.col_rating,
+        col_timestamp=config.col_timestamp,
+        col_pred=config.col_pred,
+        drop_duplicates=drop_duplicates,
+    )
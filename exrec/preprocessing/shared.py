@@ -0,0 +1,51 @@
+from pathlib import Path
+from typing import Any, Dict
+
+import numpy as np
+import pandas as pd
+from exrec.core.dataframe import DataFrameImpl
+from exrec.preprocessing.dataset import RatingDatasetImpl
+from exrec.preprocessing.interface import RatingDataset
+
+
+# Datasets are handed to worker processes as one .npy file per column that
+# every worker memory-maps read-only, so the rows are kept once on the host
+# whatever the number of workers.
+def share_dataset(dataset: RatingDataset, shared_dir: Path) -> Dict[str, Any]:
+    data = dataset.get_data().get_data()
+    if any(dtype.kind not in "biufM" for dtype in data.dtypes):
+        raise ValueError("Only label encoded numeric columns can be shared")
+
+    columns = {}
+    for i, col in enumerate(data.columns):
+        column_file = shared_dir / f"{i}.npy"
+        np.save(str(column_file), data[col].to_numpy(), allow_pickle=False)
+        columns[str(col)] = str(column_file)
+
+    return {
+        "columns": columns,
+        "n_users": dataset.n_users,
+        "n_items": dataset.n_items,
+        "col_user": dataset.col_user,
+        "col_item": dataset.col_item,
+        "col_rating": dataset.col_rating,
+        "col_timestamp": dataset.col_timestamp,
+    }
+
+
+def attach_dataset(spec: Dict[str, Any]) -> RatingDataset:
+    columns = {
+        col: np.load(column_file, mmap_mode="r", allow_pickle=False)
+        for col, column_file in spec["columns"].items()
+    }
+    return RatingDatasetImpl(
+        data=DataFrameImpl(data=pd.DataFrame(columns, copy=False)),
+        n_users=spec["n_users"],
+        n_items=spec["n_items"],
+        col_user=spec["col_user"],
+        col_item=spec["col_item"],
+        col_rating=spec["col_rating"],
+        col_timestamp=spec["col_timestamp"],
+        col_pred=None,
+        drop_duplicates=False,
+    )
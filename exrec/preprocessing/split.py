@@ -0,0 +1,98 @@
+from typing import Sequence, Tuple
+
+import numpy as np
+
+# Every split returns the sorted row positions of the (train, test) rows, so
+# that the datasets can be gathered from the parent in a single pass.
+
+
+def random_split_index(
+    n_samples: int, train_ratio: float, seed: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    n_train = int(train_ratio * n_samples)
+    perm = np.random.RandomState(seed=seed).permutation(n_samples)
+    return np.sort(perm[:n_train]), np.sort(perm[n_train:])
+
+
+def stratified_split_index(
+    labels: Sequence[int], train_ratio: float, seed: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    labels = np.asarray(labels)
+    n_samples = len(labels)
+    keys = np.random.RandomState(seed=seed).random_sample(n_samples)
+
+    # Rows grouped by label and shuffled within each group
+    order = np.lexsort((keys, labels))
+    sorted_labels = labels[order]
+    is_start = np.ones(n_samples, dtype=bool)
+    is_start[1:] = sorted_labels[1:] != sorted_labels[:-1]
+    starts = np.flatnonzero(is_start)
+    sizes = np.diff(np.append(starts, n_samples))
+
+    rank = np.arange(n_samples) - np.repeat(starts, sizes)
+    n_train = np.repeat((train_ratio * sizes).astype(np.int64), sizes)
+    is_train = rank < n_train
+    return np.sort(order[is_train]), np.sort(order[~is_train])
+
+
+def timestamp_split_index(
+    timestamps: Sequence[float], train_ratio: float
+) -> Tuple[np.ndarray, np.ndarray]:
+    timestamps = np.asarray(timestamps)
+    n_samples = len(timestamps)
+    n_train = int(train_ratio * n_samples)
+    if n_train == 0 or n_train == n_samples:
+        index = np.arange(n_samples)
+        return index[:n_train], index[n_train:]
+
+    # The n_train earliest rows without sorting all timestamps
+    order = np.argpartition(timestamps, n_train - 1)
+    return np.sort(order[:n_train]), np.sort(order[n_train:])
+
+
+def _user_ranks(
+    users: Sequence[int], timestamps: Sequence[float]
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    # Returns the rows ordered by (user, timestamp) with, for each of them, the
+    # rank within its user and the number of rows of its user.
+    users = np.asarray(users)
+    n_samples = len(users)
+    order = np.lexsort((np.asarray(timestamps), users))
+
+    sorted_users = users[order]
+    is_start = np.ones(n_samples, dtype=bool)
+    is_start[1:] = sorted_users[1:] != sorted_users[:-1]
+    starts = np.flatnonzero(is_start)
+    sizes = np.diff(np.append(starts, n_samples))
+
+    rank = np.arange(n_samples) - np.repeat(starts, sizes)
+    return order, rank, np.repeat(sizes, sizes)
+
+
+def leave_last_n_index(
+    users: Sequence[int], timestamps: Sequence[float], n_last: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    order, rank, size = _user_ranks(users=users, timestamps=timestamps)
+    # The first interaction of every user always stays in train.
+    is_test = rank >= np.maximum(size - n_last, 1)
+    return np.sort(order[~is_test]), np.sort(order[is_test])
+
+
+def user_timestamp_split_index(
+    users: Sequence[int], timestamps: Sequence[float], train_ratio: float
+) -> Tuple[np.ndarray, np.ndarray]:
+    order, rank, size = _user_ranks(users=users, timestamps=timestamps)
+    n_train = (train_ratio * size).astype(np.int64)
+    if train_ratio > 0:
+        n_train = np.maximum(n_train, 1)
+    is_train = rank < n_train
+    return np.sort(order[is_train]), np.sort(order[~is_train])
+
+
+# Unlike the splits above, returns the fold of every row in [0, n_folds) with
+# fold sizes differing by at most one.
+def kfold_index(n_samples: int, n_folds: int, seed: int) -> np.ndarray:
+    perm = np.random.RandomState(seed=seed).permutation(n_samples)
+    folds = np.empty(n_samples, dtype=np.int32)
+    folds[perm] = np.arange(n_samples) % n_folds
+    return folds
@@ -1,12 +1,16 @@
 from dataclasses import dataclass
 from enum import Enum, auto
-from typing import Any, Callable, Dict, Optional
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Union
 
+from exrec.core.config import UnseenPolicy
 from exrec.trainer.interface import TrainerConfig
 
 
 class TrainerType(Enum):
     ONETIME = auto()
+    EARLYSTOPPING = auto()
+    STREAMING = auto()
 
 
 @dataclass
@@ -14,6 +18,36 @@ class OneTimeConfig(TrainerConfig):
     _dummy: Optional[Any] = None
 
 
+@dataclass
+class EarlyStoppingConfig(TrainerConfig):
+    max_epochs: int
+    patience: int = 5
+    tol: float = 1e-4
+    # Share of train data held out when no valid data is given
+    valid_ratio: float = 0.1
+    seed: int = 42
+
+
+@dataclass
+class StreamingConfig(TrainerConfig):
+    event_file: Union[Path, str]
+    chunk_size: int = 100000
+    epochs_per_chunk: int = 1
+    checkpoint_every: Optional[int] = None
+    sep: str = ","
+    # How the encoders treat new users and items in the events. GROW folds
+    # them into the model and needs the FAST encoder; None keeps the policy
+    # the encoders were built with.
+    unseen: Optional[Union[UnseenPolicy, str]] = None
+
+    def __post_init__(self):
+        self.event_file = Path(self.event_file)
+        if isinstance(self.unseen, str):
+            self.unseen = UnseenPolicy[self.unseen]
+
+
 type_to_cfg: Dict[TrainerType, Callable[[Dict[str, Any]], TrainerConfig]] = {
-    TrainerType.ONETIME: lambda x: OneTimeConfig(**x)
+    TrainerType.ONETIME: lambda x: OneTimeConfig(**x),
+    TrainerType.EARLYSTOPPING: lambda x: EarlyStoppingConfig(**x),
+    TrainerType.STREAMING: lambda x: StreamingConfig(**x),
 }
@@ -0,0 +1,118 @@
+import copy
+from typing import Any, Dict, Optional
+
+import numpy as np
+from exrec.core.interface import Logger
+from exrec.evaluation.interface import Evaluator
+from exrec.model.interface import Model
+from exrec.preprocessing.interface import RatingDataset
+
+
+class EarlyStoppingTrainer:
+    cls_name: str
+
+    # Config parameters
+    max_epochs: int
+    patience: int
+    tol: float
+    valid_ratio: float
+    seed: int
+
+    model: Model
+    evaluator: Evaluator
+
+    def __init__(
+        self,
+        model: Model,
+        evaluator: Evaluator,
+        max_epochs: int,
+        patience: int,
+        tol: float,
+        valid_ratio: float = 0.1,
+        seed: int = 42,
+    ):
+        self.cls_name = self.__class__.__name__
+
+        if max_epochs < 1:
+            raise ValueError("max_epochs should be integer greater than 0")
+        if patience < 1:
+            raise ValueError("patience should be integer greater than 0")
+        if tol < 0:
+            raise ValueError("tol should be non-negative")
+        if valid_ratio <= 0 or valid_ratio >= 1:
+            raise ValueError("valid_ratio should be in (0, 1)")
+
+        self.max_epochs = max_epochs
+        self.patience = patience
+        self.tol = tol
+        self.valid_ratio = valid_ratio
+        self.seed = seed
+
+        self.model = model
+        self.evaluator = evaluator
+
+    def log_name(self) -> str:
+        return self.cls_name
+
+    def train(
+        self,
+        logger: Logger,
+        train_data: RatingDataset,
+        valid_data: Optional[RatingDataset] = None,
+    ) -> None:
+
+        if valid_data is None:
+            logger.info(f"Hold out {self.valid_ratio} of train data for validation")
+            train_data, valid_data = train_data.random_split(
+                train_ratio=1 - self.valid_ratio, seed=self.seed
+            )
+
+        users, items, ratings = valid_data.get_ratings()
+        ratings = np.asarray(ratings)
+
+        best_rmse = np.inf
+        best_epoch = 0
+        best_state: Optional[Dict[str, Any]] = None
+        n_bad_epochs = 0
+
+        # Validates the model after every epoch of a single `fit` call.
+        def on_epoch(epoch: int) -> bool:
+            nonlocal best_rmse, best_epoch, best_state, n_bad_epochs
+            with logger.timeit("validate", n_items=len(ratings)):
+                diff = ratings - self.model.predict_ratings(users=users, items=items)
+                rmse = float(np.sqrt(np.mean(diff**2)))
+            logger.info(f"Epoch: {epoch}/{self.max_epochs} Validate RMSE: {rmse}")
+
+            if rmse < best_rmse - self.tol:
+                best_rmse = rmse
+                best_epoch = epoch
+                # The factors keep changing in place while the training goes on.
+                best_state = copy.deepcopy(self.model.get_state())
+                n_bad_epochs = 0
+                return False
+            n_bad_epochs += 1
+            if n_bad_epochs >= self.patience:
+                logger.info(f"Stop early at epoch {epoch}")
+                return True
+            return False
+
+        logger.info("Start to train the model")
+        self.model.fit(
+            logger=logger.get_child(self.model.log_name()),
+            data=train_data,
+            epochs=self.max_epochs,
+            callback=on_epoch,
+        )
+
+        if best_state is not None:
+            logger.info(f"Restore the model at epoch {best_epoch} (RMSE: {best_rmse})")
+            self.model.set_state(best_state)
+        logger.info("End to train the model")
+
+        logger.info("Get the score in the validate data")
+        valid_score = self.evaluator.evaluate(
+            logger=logger.get_child(name=self.evaluator.log_name()),
+            model=self.model,
+            test_data=valid_data,
+        )
+        logger.info(f"Validate scores: {valid_score}")
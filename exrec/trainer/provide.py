@@ -2,10 +2,14 @@ from dataclasses import asdict
 
 from exrec.core.interface import Logger
 from exrec.evaluation.interface import Evaluator
-from exrec.model.interface import Model
+from exrec.model.interface import Model, Repository
+from exrec.preprocessing.config import RatingDataConfig
+from exrec.preprocessing.interface import DataConfig
 from exrec.trainer.config import TrainerType
+from exrec.trainer.early_stopping import EarlyStoppingTrainer
 from exrec.trainer.interface import Trainer, TrainerConfig
 from exrec.trainer.onetime import OneTimeTrainer
+from exrec.trainer.streaming import StreamingTrainer
 
 
 def provide_trainer(
@@ -14,8 +18,22 @@ def provide_trainer(
     logger: Logger,
     model: Model,
     evaluator: Evaluator,
+    model_repo: Repository,
+    data_config: DataConfig,
 ) -> Trainer:
     if trainer_type == TrainerType.ONETIME:
         return OneTimeTrainer(model=model, evaluator=evaluator, **asdict(config))
+    elif trainer_type == TrainerType.EARLYSTOPPING:
+        return EarlyStoppingTrainer(model=model, evaluator=evaluator, **asdict(config))
+    elif trainer_type == TrainerType.STREAMING and isinstance(
+        data_config, RatingDataConfig
+    ):
+        return StreamingTrainer(
+            model=model,
+            evaluator=evaluator,
+            model_repo=model_repo,
+            data_config=data_config,
+            **asdict(config),
+        )
     else:
         raise NotImplementedError("Not Implemented Trainer.")
@@ -0,0 +1,152 @@
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+from exrec.core.config import UnseenPolicy
+from exrec.core.dataframe import read_csv_chunks
+from exrec.core.interface import Logger
+from exrec.evaluation.interface import Evaluator
+from exrec.model.interface import Model, Repository
+from exrec.preprocessing.config import RatingDataConfig
+from exrec.preprocessing.interface import RatingDataset
+
+
+class StreamingTrainer:
+    cls_name: str
+
+    # Config parameters
+    event_file: Path
+    chunk_size: int
+    epochs_per_chunk: int
+    checkpoint_every: Optional[int]
+    sep: str
+    unseen: Optional[UnseenPolicy]
+
+    model: Model
+    evaluator: Evaluator
+    model_repo: Repository
+    data_config: RatingDataConfig
+
+    def __init__(
+        self,
+        model: Model,
+        evaluator: Evaluator,
+        model_repo: Repository,
+        data_config: RatingDataConfig,
+        event_file: Path,
+        chunk_size: int,
+        epochs_per_chunk: int,
+        checkpoint_every: Optional[int],
+        sep: str,
+        unseen: Optional[UnseenPolicy] = None,
+    ):
+        self.cls_name = self.__class__.__name__
+
+        if chunk_size < 1:
+            raise ValueError("chunk_size should be integer greater than 0")
+        if epochs_per_chunk < 1:
+            raise ValueError("epochs_per_chunk should be integer greater than 0")
+        if checkpoint_every is not None and checkpoint_every < 1:
+            raise ValueError("checkpoint_every should be integer greater than 0")
+
+        self.event_file = event_file
+        self.chunk_size = chunk_size
+        self.epochs_per_chunk = epochs_per_chunk
+        self.checkpoint_every = checkpoint_every
+        self.sep = sep
+        self.unseen = unseen
+
+        self.model = model
+        self.evaluator = evaluator
+        self.model_repo = model_repo
+        self.data_config = data_config
+
+    def log_name(self) -> str:
+        return self.cls_name
+
+    # `train_data` gives the columns, sizes and label encoders of the events.
+    def train(
+        self,
+        logger: Logger,
+        train_data: RatingDataset,
+        valid_data: Optional[RatingDataset] = None,
+    ) -> None:
+
+        logger.info(f"Start to train the model on the events in {self.event_file}")
+        # The encoders of train data label the events, and grow for new IDs
+        # with GROW.
+        encoders = train_data.label_encoders
+        if self.unseen is not None:
+            for encoder in encoders.values():
+                encoder.set_unseen(self.unseen)
+
+        config = self.data_config
+        n_events = 0
+        for n_chunks, chunk in enumerate(
+            read_csv_chunks(
+                src_file=self.event_file,
+                chunk_size=self.chunk_size,
+                sep=self.sep,
+                usecols=config.usecols(),
+                dtype=config.dtypes(),
+                engine=config.engine,
+            ),
+            start=1,
+        ):
+            events = type(train_data)(
+                data=chunk,
+                n_users=train_data.n_users,
+                n_items=train_data.n_items,
+                col_user=train_data.col_user,
+                col_item=train_data.col_item,
+                col_rating=train_data.col_rating,
+                col_timestamp=train_data.col_timestamp,
+                col_pred=None,
+            )
+            for col, encoder in encoders.items():
+                events.label_encode(col=col, encoder=encoder)
+
+            with logger.timeit("chunk", n_items=events.n_samples):
+                self.fold_in(logger=logger, events=events)
+                self.model.fit(
+                    logger=logger.get_child(self.model.log_name()),
+                    data=events,
+                    epochs=self.epochs_per_chunk,
+                )
+            n_events += events.n_samples
+            logger.info(f"Chunk: {n_chunks} ({n_events} events)")
+
+            if (
+                self.checkpoint_every is not None
+                and n_chunks % self.checkpoint_every == 0
+            ):
+                logger.info("Save a checkpoint of the model")
+                self.model_repo.store(model=self.model)
+        logger.info("End to train the model")
+
+        if valid_data is not None:
+            logger.info("Get the score in the validate data")
+            valid_score = self.evaluator.evaluate(
+                logger=logger.get_child(name=self.evaluator.log_name()),
+                model=self.model,
+                test_data=valid_data,
+            )
+            logger.info(f"Validate scores: {valid_score}")
+
+    # Users and items beyond the factors get theirs from the fold-in before
+    # the chunk is trained on.
+    def fold_in(self, logger: Logger, events: RatingDataset) -> None:
+        user_factors, item_factors = self.model.get_factors()
+        users, items, _ = events.get_ratings()
+        new = (np.asarray(users) >= len(user_factors)) | (
+            np.asarray(items) >= len(item_factors)
+        )
+        if not new.any():
+            return
+
+        logger.info(f"Fold in {int(new.sum())} events of new users or items")
+        self.model.fold_in(
+            logger=logger.get_child(self.model.log_name()),
+            data=events,
+            delta=events.subset(np.flatnonzero(new)),
+        )
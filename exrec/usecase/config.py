@@ -1,6 +1,6 @@
 from dataclasses import dataclass
 from enum import Enum, auto
-from typing import Any, Callable, Dict, Optional
+from typing import Any, Callable, Dict, Optional, Union
 
 from exrec.preprocessing.interface import SplitType
 from exrec.usecase.interface import UsecaseConfig
@@ -8,17 +8,70 @@ from exrec.usecase.interface import UsecaseConfig
 
 class UsecaseType(Enum):
     TRAINTESTEVAL = auto()
+    KFOLD = auto()
+    SEARCH = auto()
+
+
+class SearchStrategy(Enum):
+    GRID = auto()
+    RANDOM = auto()
+    HALVING = auto()
 
 
 @dataclass
 class TrainTestEvalConfig(UsecaseConfig):
     train_ratio: Optional[float] = None
-    split_type: Optional[SplitType] = None
+    split_type: Optional[Union[SplitType, str]] = None
     filter_by: Optional[str] = None
     min_samples: Optional[int] = None
     seed: Optional[int] = None
+    n_last: Optional[int] = None
+    ann_n_lists: Optional[int] = None
+    ann_n_probe: int = 8
+    ann_k: int = 10
+    ann_n_queries: int = 1000
+    save_test_output: bool = True
+
+    def __post_init__(self):
+        # The usecase config hook builds this class without the SplitType hook.
+        if isinstance(self.split_type, str):
+            self.split_type = SplitType[self.split_type]
+
+
+@dataclass
+class KFoldConfig(UsecaseConfig):
+    n_folds: int = 5
+    seed: int = 42
+    n_workers: int = 1
+
+
+@dataclass
+class SearchConfig(UsecaseConfig):
+    # Values of MFConfig fields to try: a list of values or, for the random
+    # strategies, a {"low", "high", "log"} range.
+    space: Dict[str, Any]
+    strategy: Union[SearchStrategy, str] = SearchStrategy.GRID
+    metric: str = "RMSE"
+    maximize: Optional[bool] = None
+    n_trials: int = 10
+    seed: int = 42
+    n_workers: int = 1
+    train_ratio: float = 0.8
+    # Grid and random trials stop after `patience` validations without gain.
+    eval_every: int = 1
+    patience: Optional[int] = None
+    tol: float = 1e-4
+    # Successive halving keeps 1 / eta of the trials per rung.
+    eta: int = 3
+    min_epochs: int = 1
+
+    def __post_init__(self):
+        if isinstance(self.strategy, str):
+            self.strategy = SearchStrategy[self.strategy]
 
 
 type_to_cfg: Dict[UsecaseType, Callable[[Dict[str, Any]], UsecaseConfig]] = {
-    UsecaseType.TRAINTESTEVAL: lambda x: TrainTestEvalConfig(**x)
+    UsecaseType.TRAINTESTEVAL: lambda x: TrainTestEvalConfig(**x),
+    UsecaseType.KFOLD: lambda x: KFoldConfig(**x),
+    UsecaseType.SEARCH: lambda x: SearchConfig(**x),
 }
@@ -0,0 +1,191 @@
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Type
+
+import numpy as np
+import pandas as pd
+from exrec.core.interface import Logger
+from exrec.evaluation.interface import Evaluator
+from exrec.model.interface import Model
+from exrec.preprocessing.interface import RatingDataset
+from exrec.preprocessing.shared import attach_dataset, share_dataset
+from exrec.preprocessing.split import kfold_index
+from exrec.usecase.worker import (
+    init_worker,
+    pop_records,
+    worker_initargs,
+    worker_logger,
+)
+
+
+def _run_fold(
+    logger: Logger,
+    model_cls: Type[Model],
+    model_config: Dict[str, Any],
+    evaluator: Evaluator,
+    spec: Dict[str, Any],
+    folds_file: str,
+    fold: int,
+) -> Dict[str, float]:
+    data = attach_dataset(spec)
+    folds = np.load(folds_file, mmap_mode="r")
+    is_test = folds == fold
+    train = data.subset(np.flatnonzero(~is_test))
+    test = data.subset(np.flatnonzero(is_test))
+
+    # Every fold trains a fresh model with the same hyper parameters.
+    model = model_cls(**model_config)
+    logger.info(f"Train the model on {train.n_samples} ratings")
+    with logger.timeit("train", n_items=train.n_samples):
+        model.fit(logger=logger.get_child(model.log_name()), data=train)
+
+    logger.info(f"Evaluate the model on {test.n_samples} ratings")
+    with logger.timeit("evaluate", n_items=test.n_samples):
+        return evaluator.evaluate(
+            logger=logger.get_child(evaluator.log_name()), model=model, test_data=test
+        )
+
+
+# Runs in a pool worker, which returns the timings of the fold to the parent.
+def _run_fold_process(
+    name: str,
+    model_cls: Type[Model],
+    model_config: Dict[str, Any],
+    evaluator: Evaluator,
+    spec: Dict[str, Any],
+    folds_file: str,
+    fold: int,
+) -> Tuple[Dict[str, float], List[Dict[str, Any]]]:
+    scores = _run_fold(
+        logger=worker_logger(name),
+        model_cls=model_cls,
+        model_config=model_config,
+        evaluator=evaluator,
+        spec=spec,
+        folds_file=folds_file,
+        fold=fold,
+    )
+    return scores, pop_records()
+
+
+class KFold:
+    cls_name: str
+
+    # Config parameters
+    n_folds: int
+    seed: int
+    n_workers: int
+
+    # Basic parameters
+    model: Model
+    evaluator: Evaluator
+    all_data: Optional[RatingDataset]
+    output_file: Optional[Path]
+
+    def __init__(
+        self,
+        model: Model,
+        evaluator: Evaluator,
+        all_data: Optional[RatingDataset],
+        output_file: Optional[Path],
+        n_folds: int = 5,
+        seed: int = 42,
+        n_workers: int = 1,
+    ):
+        self.cls_name = self.__class__.__name__
+
+        if n_folds < 2:
+            raise ValueError("n_folds should be integer greater than 1")
+        if n_workers < 1:
+            raise ValueError("n_workers should be integer greater than 0")
+        self.n_folds = n_folds
+        self.seed = seed
+        self.n_workers = n_workers
+
+        self.model = model
+        self.evaluator = evaluator
+        self.all_data = all_data
+        self.output_file = output_file
+
+    def log_name(self) -> str:
+        return self.cls_name
+
+    def execute(self, logger: Logger) -> None:
+        if self.all_data is None:
+            logger.error("all_data is not found.")
+            raise RuntimeError("all_data is not found.")
+
+        logger.info(f"Assign the ratings to {self.n_folds} folds")
+        folds = kfold_index(
+            n_samples=self.all_data.n_samples, n_folds=self.n_folds, seed=self.seed
+        )
+
+        model_cls = type(self.model)
+        model_config = self.model.get_config()
+        with tempfile.TemporaryDirectory(prefix="exrec-kfold-") as shared_dir:
+            spec = share_dataset(dataset=self.all_data, shared_dir=Path(shared_dir))
+            folds_file = str(Path(shared_dir) / "folds.npy")
+            np.save(folds_file, folds, allow_pickle=False)
+            del folds
+
+            if self.n_workers == 1:
+                scores = [
+                    _run_fold(
+                        logger=logger.get_child(f"Fold{fold}"),
+                        model_cls=model_cls,
+                        model_config=model_config,
+                        evaluator=self.evaluator,
+                        spec=spec,
+                        folds_file=folds_file,
+                        fold=fold,
+                    )
+                    for fold in range(self.n_folds)
+                ]
+            else:
+                logger.info(f"Run the folds in {self.n_workers} processes")
+                with ProcessPoolExecutor(
+                    max_workers=self.n_workers,
+                    initializer=init_worker,
+                    initargs=worker_initargs(logger),
+                ) as executor:
+                    futures = [
+                        executor.submit(
+                            _run_fold_process,
+                            f"Fold{fold}",
+                            model_cls,
+                            model_config,
+                            self.evaluator,
+                            spec,
+                            folds_file,
+                            fold,
+                        )
+                        for fold in range(self.n_folds)
+                    ]
+                    scores = []
+                    for future in futures:
+                        score, records = future.result()
+                        if logger.timer is not None:
+                            logger.timer.merge(records)
+                        scores.append(score)
+
+        for fold, score in enumerate(scores):
+            logger.info(f"Score in the fold {fold}: {score}")
+
+        summary = self.aggregate(scores)
+        logger.info(f"Mean score over the folds: {summary.loc['mean'].to_dict()}")
+        logger.info(f"Std of the scores over the folds: {summary.loc['std'].to_dict()}")
+
+        if self.output_file is not None:
+            summary.to_csv(str(self.output_file), index_label="fold")
+
+    # One row per fold followed by the mean and std of every metric.
+    def aggregate(self, scores: List[Dict[str, float]]) -> pd.DataFrame:
+        per_fold = pd.DataFrame(scores, index=list(map(str, range(len(scores)))))
+        values = per_fold.to_numpy(dtype=np.float64)
+        stats = pd.DataFrame(
+            [values.mean(axis=0), values.std(axis=0)],
+            index=["mean", "std"],
+            columns=per_fold.columns,
+        )
+        return pd.concat([per_fold, stats])
@@ -9,6 +9,8 @@ from exrec.preprocessing.interface import RatingDataset
 from exrec.trainer.interface import Trainer
 from exrec.usecase.config import UsecaseConfig, UsecaseType
 from exrec.usecase.interface import Usecase
+from exrec.usecase.kfold import KFold
+from exrec.usecase.search import Search
 from exrec.usecase.train_test_eval import TrainTestEval
 
 
@@ -42,5 +44,23 @@ def provide_usecase(
             item_encoder=item_encoder,
             **asdict(config),
         )
+    elif usecase_type == UsecaseType.KFOLD:
+        return KFold(
+            model=model,
+            evaluator=evaluator,
+            all_data=all_data,
+            output_file=output_file,
+            **asdict(config),
+        )
+    elif usecase_type == UsecaseType.SEARCH:
+        return Search(
+            model=model,
+            evaluator=evaluator,
+            all_data=all_data,
+            train_data=train_data,
+            valid_data=valid_data,
+            output_file=output_file,
+            **asdict(config),
+        )
     else:
         raise NotImplementedError("Not Implemented Usecase")
@@ -0,0 +1,406 @@
+import itertools
+import tempfile
+from concurrent.futures import Executor, ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Type
+
+import numpy as np
+import pandas as pd
+from exrec.core.interface import Logger
+from exrec.evaluation.interface import Evaluator
+from exrec.model.interface import Model
+from exrec.preprocessing.interface import RatingDataset
+from exrec.preprocessing.shared import attach_dataset, share_dataset
+from exrec.usecase.config import SearchStrategy
+from exrec.usecase.worker import (
+    init_worker,
+    pop_records,
+    worker_initargs,
+    worker_logger,
+)
+
+# Metrics that are errors to minimize, every other metric is maximized.
+LOWER_IS_BETTER = {"MAE", "MSE", "RMSE"}
+
+
+def _sample(values: Any, rng: np.random.RandomState) -> Any:
+    # A list is a choice and {"low", "high", "log"} a (log-)uniform range
+    # of which the type follows the bounds.
+    if isinstance(values, dict):
+        low, high = values["low"], values["high"]
+        if values.get("log", False):
+            value = float(np.exp(rng.uniform(np.log(low), np.log(high))))
+        else:
+            value = float(rng.uniform(low, high))
+        if isinstance(low, int) and isinstance(high, int):
+            return int(round(value))
+        return value
+    return values[rng.randint(len(values))]
+
+
+def grid_trials(space: Dict[str, Any]) -> List[Dict[str, Any]]:
+    for key, values in space.items():
+        if not isinstance(values, list):
+            raise ValueError(f"The grid of {key} should be a list of values")
+    keys = list(space)
+    return [
+        dict(zip(keys, values))
+        for values in itertools.product(*[space[key] for key in keys])
+    ]
+
+
+def random_trials(
+    space: Dict[str, Any], n_trials: int, seed: int
+) -> List[Dict[str, Any]]:
+    rng = np.random.RandomState(seed=seed)
+    return [
+        {key: _sample(values, rng) for key, values in space.items()}
+        for _ in range(n_trials)
+    ]
+
+
+def _run_trial(
+    logger: Logger,
+    model_cls: Type[Model],
+    model_config: Dict[str, Any],
+    evaluator: Evaluator,
+    train_spec: Dict[str, Any],
+    valid_spec: Dict[str, Any],
+    state_file: str,
+    keep_state: bool,
+    target_epochs: int,
+    eval_every: int,
+    patience: Optional[int],
+    tol: float,
+    metric: str,
+    maximize: bool,
+) -> Dict[str, Any]:
+    train = attach_dataset(train_spec)
+    valid = attach_dataset(valid_spec)
+
+    # Trials resumed by a later rung continue from their saved factors.
+    state: Optional[Dict[str, Any]] = None
+    if Path(state_file).exists():
+        with np.load(state_file) as saved:
+            state = {key: saved[key] for key in saved.files}
+        state["trained_epochs"] = int(state["trained_epochs"])
+    model = model_cls(**model_config, state=state)
+
+    sign = 1.0 if maximize else -1.0
+    trained = model.get_state()["trained_epochs"]
+    scores: Dict[str, float] = {}
+    best, best_epochs, n_bad = -np.inf, trained, 0
+    while trained < target_epochs:
+        epochs = min(eval_every, target_epochs - trained)
+        model.fit(logger=logger.get_child(model.log_name()), data=train, epochs=epochs)
+        trained += epochs
+
+        scores = evaluator.evaluate(
+            logger=logger.get_child(evaluator.log_name()), model=model, test_data=valid
+        )
+        logger.info(f"Validate scores after {trained} epochs: {scores}")
+        if sign * scores[metric] > best + tol:
+            best, best_epochs, n_bad = sign * scores[metric], trained, 0
+        else:
+            n_bad += 1
+            if patience is not None and n_bad >= patience:
+                logger.info(f"Stop the trial after {trained} epochs")
+                break
+
+    if not scores:
+        scores = evaluator.evaluate(
+            logger=logger.get_child(evaluator.log_name()), model=model, test_data=valid
+        )
+        best = sign * scores[metric]
+    if keep_state:
+        np.savez(state_file, **model.get_state())
+    return {
+        "epochs": trained,
+        "best_epochs": best_epochs,
+        "stopped": trained < target_epochs,
+        f"best_{metric}": sign * best,
+        **scores,
+    }
+
+
+# Runs in a pool worker, which returns the timings of the trial to the parent.
+def _run_trial_process(
+    name: str, **kwargs: Any
+) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    return _run_trial(logger=worker_logger(name), **kwargs), pop_records()
+
+
+class Search:
+    cls_name: str
+
+    # Config parameters
+    space: Dict[str, Any]
+    strategy: SearchStrategy
+    metric: str
+    maximize: bool
+    n_trials: int
+    seed: int
+    n_workers: int
+    train_ratio: float
+    eval_every: int
+    patience: Optional[int]
+    tol: float
+    eta: int
+    min_epochs: int
+
+    # Basic parameters
+    model: Model
+    evaluator: Evaluator
+    all_data: Optional[RatingDataset]
+    train_data: Optional[RatingDataset]
+    valid_data: Optional[RatingDataset]
+    output_file: Optional[Path]
+
+    leaderboard_file = Path("leaderboard.csv")
+
+    def __init__(
+        self,
+        model: Model,
+        evaluator: Evaluator,
+        all_data: Optional[RatingDataset],
+        train_data: Optional[RatingDataset],
+        valid_data: Optional[RatingDataset],
+        output_file: Optional[Path],
+        space: Dict[str, Any],
+        strategy: SearchStrategy = SearchStrategy.GRID,
+        metric: str = "RMSE",
+        maximize: Optional[bool] = None,
+        n_trials: int = 10,
+        seed: int = 42,
+        n_workers: int = 1,
+        train_ratio: float = 0.8,
+        eval_every: int = 1,
+        patience: Optional[int] = None,
+        tol: float = 1e-4,
+        eta: int = 3,
+        min_epochs: int = 1,
+    ):
+        self.cls_name = self.__class__.__name__
+
+        if n_workers < 1:
+            raise ValueError("n_workers should be integer greater than 0")
+        if eval_every < 1:
+            raise ValueError("eval_every should be integer greater than 0")
+        if eta < 2:
+            raise ValueError("eta should be integer greater than 1")
+        if min_epochs < 1:
+            raise ValueError("min_epochs should be integer greater than 0")
+        # Metrics at a cutoff are named "<metric>@<k>".
+        if metric.split("@")[0] not in {m.name for m in evaluator.metrics}:
+            raise ValueError(f"{metric} is not computed by the evaluator")
+
+        self.space = space
+        self.strategy = strategy
+        self.metric = metric
+        self.maximize = metric not in LOWER_IS_BETTER if maximize is None else maximize
+        self.n_trials = n_trials
+        self.seed = seed
+        self.n_workers = n_workers
+        self.train_ratio = train_ratio
+        self.eval_every = eval_every
+        self.patience = patience
+        self.tol = tol
+        self.eta = eta
+        self.min_epochs = min_epochs
+
+        self.model = model
+        self.evaluator = evaluator
+        self.all_data = all_data
+        self.train_data = train_data
+        self.valid_data = valid_data
+        self.output_file = output_file
+
+    def log_name(self) -> str:
+        return self.cls_name
+
+    def execute(self, logger: Logger) -> None:
+        if self.train_data is not None and self.valid_data is not None:
+            train, valid = self.train_data, self.valid_data
+        elif self.all_data is not None:
+            logger.info("Split data into train/valid data.")
+            train, valid = self.all_data.random_split(
+                train_ratio=self.train_ratio, seed=self.seed
+            )
+        else:
+            logger.error("all_data or train_data and valid_data are not found.")
+            raise RuntimeError("all_data or train_data and valid_data are not found.")
+
+        if self.strategy == SearchStrategy.GRID:
+            trials = grid_trials(self.space)
+        elif self.strategy in (SearchStrategy.RANDOM, SearchStrategy.HALVING):
+            trials = random_trials(self.space, n_trials=self.n_trials, seed=self.seed)
+        else:
+            logger.error("Not Implemented SearchStrategy.")
+            raise NotImplementedError("Not Implemented SearchStrategy.")
+
+        base_config = self.model.get_config()
+        configs = [{**base_config, **params} for params in trials]
+        logger.info(f"Search {len(configs)} trials with {self.strategy.name}")
+
+        with tempfile.TemporaryDirectory(prefix="exrec-search-") as shared_dir:
+            shared = Path(shared_dir)
+            (shared / "train").mkdir()
+            (shared / "valid").mkdir()
+            specs = {
+                "train_spec": share_dataset(dataset=train, shared_dir=shared / "train"),
+                "valid_spec": share_dataset(dataset=valid, shared_dir=shared / "valid"),
+            }
+            del train, valid
+
+            executor: Optional[Executor] = None
+            if self.n_workers > 1:
+                executor = ProcessPoolExecutor(
+                    max_workers=self.n_workers,
+                    initializer=init_worker,
+                    initargs=worker_initargs(logger),
+                )
+            try:
+                if self.strategy == SearchStrategy.HALVING:
+                    results = self.halving(logger, executor, configs, specs, shared)
+                else:
+                    results = self.run_trials(
+                        logger=logger,
+                        executor=executor,
+                        configs=configs,
+                        trial_ids=list(range(len(configs))),
+                        target_epochs=[config["epochs"] for config in configs],
+                        eval_every=self.eval_every,
+                        patience=self.patience,
+                        specs=specs,
+                        shared=shared,
+                    )
+            finally:
+                if executor is not None:
+                    executor.shutdown()
+
+        leaderboard = self.leaderboard(trials=trials, results=results)
+        best = leaderboard.iloc[0]
+        logger.info(f"Best trial: {best.to_dict()}")
+        if self.output_file is not None:
+            leaderboard_file = self.output_file.parent / self.leaderboard_file
+            logger.info(f"Write the leaderboard to {leaderboard_file}")
+            leaderboard.to_csv(str(leaderboard_file), index=False)
+
+    def run_trials(
+        self,
+        logger: Logger,
+        executor: Optional[Executor],
+        configs: List[Dict[str, Any]],
+        trial_ids: List[int],
+        target_epochs: List[int],
+        eval_every: int,
+        patience: Optional[int],
+        specs: Dict[str, Dict[str, Any]],
+        shared: Path,
+    ) -> Dict[int, Dict[str, Any]]:
+        kwargs = [
+            dict(
+                model_cls=type(self.model),
+                model_config=configs[trial],
+                evaluator=self.evaluator,
+                state_file=str(shared / f"trial{trial}.npz"),
+                keep_state=self.strategy == SearchStrategy.HALVING,
+                target_epochs=epochs,
+                eval_every=min(eval_every, epochs),
+                patience=patience,
+                tol=self.tol,
+                metric=self.metric,
+                maximize=self.maximize,
+                **specs,
+            )
+            for trial, epochs in zip(trial_ids, target_epochs)
+        ]
+
+        if executor is None:
+            results = [
+                _run_trial(logger=logger.get_child(f"Trial{trial}"), **kw)
+                for trial, kw in zip(trial_ids, kwargs)
+            ]
+        else:
+            futures = [
+                executor.submit(_run_trial_process, name=f"Trial{trial}", **kw)
+                for trial, kw in zip(trial_ids, kwargs)
+            ]
+            results = []
+            for future in futures:
+                result, records = future.result()
+                if logger.timer is not None:
+                    logger.timer.merge(records)
+                results.append(result)
+
+        for trial, result in zip(trial_ids, results):
+            logger.info(f"Validate scores of the trial {trial}: {result}")
+        return dict(zip(trial_ids, results))
+
+    # Successive halving: all trials train for `min_epochs`, then only the best
+    # 1 / eta of them continue for eta times as many epochs, and so on.
+    def halving(
+        self,
+        logger: Logger,
+        executor: Optional[Executor],
+        configs: List[Dict[str, Any]],
+        specs: Dict[str, Dict[str, Any]],
+        shared: Path,
+    ) -> Dict[int, Dict[str, Any]]:
+        sign = 1.0 if self.maximize else -1.0
+        results: Dict[int, Dict[str, Any]] = {}
+        alive = list(range(len(configs)))
+        budget = self.min_epochs
+        rung = 0
+        while alive:
+            last = len(alive) <= 1
+            # The last trial standing trains for all of its epochs.
+            target_epochs = [
+                configs[trial]["epochs"]
+                if last
+                else min(budget, configs[trial]["epochs"])
+                for trial in alive
+            ]
+            logger.info(
+                f"Rung {rung}: {len(alive)} trials up to {max(target_epochs)} epochs"
+            )
+            results.update(
+                self.run_trials(
+                    logger=logger,
+                    executor=executor,
+                    configs=configs,
+                    trial_ids=alive,
+                    target_epochs=target_epochs,
+                    eval_every=max(target_epochs),
+                    patience=None,
+                    specs=specs,
+                    shared=shared,
+                )
+            )
+            for trial in alive:
+                results[trial]["rung"] = rung
+            if last:
+                break
+
+            best = f"best_{self.metric}"
+            ranked = sorted(alive, key=lambda t: -sign * results[t][best])
+            alive = ranked[: max(len(alive) // self.eta, 1)]
+            budget *= self.eta
+            rung += 1
+        return results
+
+    # Trials sorted from the best validation score with their parameters.
+    def leaderboard(
+        self, trials: List[Dict[str, Any]], results: Dict[int, Dict[str, Any]]
+    ) -> pd.DataFrame:
+        rows = [
+            {"trial": trial, **trials[trial], **result}
+            for trial, result in results.items()
+        ]
+        leaderboard = pd.DataFrame(rows)
+        sort_by = [f"best_{self.metric}"]
+        ascending = [not self.maximize]
+        if "rung" in leaderboard.columns:
+            # Trials that went further in the halving rank first.
+            sort_by, ascending = ["rung"] + sort_by, [False] + ascending
+        return leaderboard.sort_values(by=sort_by, ascending=ascending)
@@ -1,8 +1,10 @@
 from pathlib import Path
 from typing import Optional
 
+import numpy as np
 from exrec.core.interface import LabelEncoder, Logger
 from exrec.evaluation.interface import Evaluator
+from exrec.model.ann import provide_ann_index
 from exrec.model.interface import Model, Repository
 from exrec.preprocessing.interface import RatingDataset, SplitType
 from exrec.trainer.interface import Trainer
@@ -17,6 +19,12 @@ class TrainTestEval:
     min_samples: Optional[int]
     seed: Optional[int]
     split_type: Optional[SplitType]
+    n_last: Optional[int]
+    ann_n_lists: Optional[int]
+    ann_n_probe: int
+    ann_k: int
+    ann_n_queries: int
+    save_test_output: bool
 
     # Basic parameters
     model: Model
@@ -48,6 +56,12 @@ class TrainTestEval:
         output_file: Optional[Path],
         user_encoder: Optional[LabelEncoder],
         item_encoder: Optional[LabelEncoder],
+        n_last: Optional[int] = None,
+        ann_n_lists: Optional[int] = None,
+        ann_n_probe: int = 8,
+        ann_k: int = 10,
+        ann_n_queries: int = 1000,
+        save_test_output: bool = True,
     ):
         self.cls_name = self.__class__.__name__
 
@@ -56,6 +70,12 @@ class TrainTestEval:
         self.min_samples = min_samples
         self.seed = seed
         self.split_type = split_type
+        self.n_last = n_last
+        self.ann_n_lists = ann_n_lists
+        self.ann_n_probe = ann_n_probe
+        self.ann_k = ann_k
+        self.ann_n_queries = ann_n_queries
+        self.save_test_output = save_test_output
 
         self.model = model
         self.evaluator = evaluator
@@ -98,50 +118,105 @@ class TrainTestEval:
                 raise RuntimeError("train_ratio is not set.")
 
             valid = None
-            if self.split_type == SplitType.RANDOM:
-                train, test = self.all_data.random_split(
-                    train_ratio=self.train_ratio, seed=self.seed
-                )
-            elif self.split_type == SplitType.SATISFIED:
-                if self.filter_by is None or self.min_samples is None:
-                    logger.error("filter_by and min_samples are not set.")
-                    raise RuntimeError("filter_by and min_samples are not set.")
-                train, test = self.all_data.satisfied_split(
-                    filter_by=self.filter_by,
-                    train_ratio=self.train_ratio,
-                    min_samples=self.min_samples,
-                    seed=self.seed,
-                )
-            elif self.split_type == SplitType.TIMESTAMP:
-                train, test = self.all_data.timestamp_split(
-                    train_ratio=self.train_ratio
-                )
-            else:
-                logger.error("Not Implemented SplitType.")
-                raise NotImplementedError("Not Implemented SplitType.")
+            with logger.timeit("split", n_items=self.all_data.n_samples):
+                if self.split_type == SplitType.RANDOM:
+                    train, test = self.all_data.random_split(
+                        train_ratio=self.train_ratio, seed=self.seed
+                    )
+                elif self.split_type == SplitType.SATISFIED:
+                    if self.filter_by is None or self.min_samples is None:
+                        logger.error("filter_by and min_samples are not set.")
+                        raise RuntimeError("filter_by and min_samples are not set.")
+                    train, test = self.all_data.satisfied_split(
+                        filter_by=self.filter_by,
+                        train_ratio=self.train_ratio,
+                        min_samples=self.min_samples,
+                        seed=self.seed,
+                    )
+                elif self.split_type == SplitType.TIMESTAMP:
+                    train, test = self.all_data.timestamp_split(
+                        train_ratio=self.train_ratio
+                    )
+                elif self.split_type == SplitType.LEAVE_LAST_N:
+                    if self.n_last is None:
+                        logger.error("n_last is not set.")
+                        raise RuntimeError("n_last is not set.")
+                    train, test = self.all_data.leave_last_n_split(n_last=self.n_last)
+                elif self.split_type == SplitType.USER_TIMESTAMP:
+                    train, test = self.all_data.user_timestamp_split(
+                        train_ratio=self.train_ratio
+                    )
+                else:
+                    logger.error("Not Implemented SplitType.")
+                    raise NotImplementedError("Not Implemented SplitType.")
 
         logger.info("Train the model")
-        self.trainer.train(
-            logger=logger.get_child(name=self.trainer.log_name()),
-            train_data=train,
-            valid_data=valid,
-        )
+        with logger.timeit("train", n_items=train.n_samples):
+            self.trainer.train(
+                logger=logger.get_child(name=self.trainer.log_name()),
+                train_data=train,
+                valid_data=valid,
+            )
 
         logger.info("Evaluate the model in test data")
-        scores = self.evaluator.evaluate(
-            logger=logger.get_child(name=self.evaluator.log_name()),
-            model=self.model,
-            test_data=test,
-        )
-
-        if self.output_file is not None:
-            if self.user_encoder is not None:
-                test.label_decode(col=test.col_user, encoder=self.user_encoder)
-            if self.item_encoder is not None:
-                test.label_decode(col=test.col_item, encoder=self.item_encoder)
-            test.to_csv(str(self.output_file), index=False)
+        with logger.timeit("evaluate", n_items=test.n_samples):
+            scores = self.evaluator.evaluate(
+                logger=logger.get_child(name=self.evaluator.log_name()),
+                model=self.model,
+                test_data=test,
+            )
+
+        if self.output_file is not None and self.save_test_output:
+            with logger.timeit("write", n_items=test.n_samples):
+                # Evaluators keep the predictions only if asked to.
+                if test.col_pred is None:
+                    self.model.predict(
+                        logger=logger.get_child(self.model.log_name()), test_data=test
+                    )
+                if self.user_encoder is not None:
+                    test.label_decode(col=test.col_user, encoder=self.user_encoder)
+                if self.item_encoder is not None:
+                    test.label_decode(col=test.col_item, encoder=self.item_encoder)
+                test.to_csv(str(self.output_file), index=False)
 
         logger.info("Save the model")
-        self.model_repo.store(model=self.model)
+        with logger.timeit("store"):
+            self.model_repo.store(
+                model=self.model,
+                user_encoder=self.user_encoder,
+                item_encoder=self.item_encoder,
+            )
+
+        if self.ann_n_lists is not None:
+            with logger.timeit("build_index"):
+                self.build_index(logger=logger)
 
         logger.info(f"Score in the test data: {scores}")
+
+    def build_index(self, logger: Logger) -> None:
+        if self.ann_n_lists is None:
+            return
+
+        logger.info("Build the ANN index of the item factors")
+        # Falls back to the model seed when the data comes pre-split.
+        seed = self.model.get_config()["seed"] if self.seed is None else self.seed
+        user_factors, item_factors = self.model.get_factors()
+        index = provide_ann_index(
+            items=item_factors,
+            n_lists=self.ann_n_lists,
+            n_probe=self.ann_n_probe,
+            seed=seed,
+        )
+
+        rng = np.random.RandomState(seed=seed)
+        n_queries = min(self.ann_n_queries, len(user_factors))
+        queries = user_factors[rng.choice(len(user_factors), n_queries, replace=False)]
+        n_probes = sorted(
+            {2**i for i in range(self.ann_n_lists.bit_length())} | {index.n_probe}
+        )
+        report = index.report(queries=queries, k=self.ann_k, n_probes=n_probes)
+        for n_probe, result in report.items():
+            logger.info(f"ANN index with n_probe={n_probe}: {result}")
+
+        logger.info("Save the ANN index")
+        self.model_repo.store_index(model=self.model, index=index)
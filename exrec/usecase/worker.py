@@ -0,0 +1,43 @@
+from logging import getLogger
+from typing import Any, Dict, List, Optional, Tuple
+
+from exrec.core.interface import Logger
+from exrec.core.logger import provide_logger
+from exrec.core.timer import provide_timer
+
+# Logger of this worker process, set up once by `init_worker`
+_logger: Optional[Logger] = None
+
+
+# The `initargs` of `init_worker` for workers that log like `logger`
+def worker_initargs(logger: Logger) -> Tuple[Any, ...]:
+    timer = logger.timer
+    return (logger.logger.name, None if timer is None else timer.get_config())
+
+
+# Initializer of pool workers, so that the tasks they run share one logger.
+# Workers forked from the parent inherit its handlers, and spawned ones get a
+# stream handler. Tasks are timed by a timer of the worker whose records go
+# back to the parent with their results.
+def init_worker(name: str, timer_config: Optional[Dict[str, bool]]) -> None:
+    global _logger
+    timer = None if timer_config is None else provide_timer(**timer_config)
+    if getLogger(name).hasHandlers():
+        _logger = provide_logger(name=name, logger=getLogger(name), timer=timer)
+    else:
+        _logger = provide_logger(name=name, timer=timer)
+
+
+def worker_logger(name: str) -> Logger:
+    if _logger is None:
+        raise RuntimeError("The worker is not initialized with init_worker")
+    return _logger.get_child(name)
+
+
+# Takes the records timed in this worker since the last call.
+def pop_records() -> List[Dict[str, Any]]:
+    if _logger is None or _logger.timer is None:
+        return []
+    records = list(_logger.timer.records)
+    _logger.timer.records.clear()
+    return records
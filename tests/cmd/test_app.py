@@ -0,0 +1,154 @@
+import tracemalloc
+from pathlib import Path
+from typing import Any, Dict
+
+import dacite
+import numpy as np
+import pandas as pd
+import pytest
+from exrec.cmd.app import model_report, provide_app
+from exrec.cmd.config import (
+    AppConfig,
+    ExperimentConfig,
+    base_type_hooks,
+    provide_type_hooks,
+)
+from exrec.model.factorization import MF
+
+N_USERS, N_ITEMS = 50, 30
+
+
+@pytest.fixture
+def data_dir(tmp_path: Path) -> Path:
+    rng = np.random.default_rng(0)
+    n_rows = 2_000
+    pd.DataFrame(
+        {
+            "user": [f"u{i}" for i in rng.integers(0, N_USERS, n_rows)],
+            "item": [f"i{i}" for i in rng.integers(0, N_ITEMS, n_rows)],
+            "rate": rng.integers(1, 6, n_rows).astype(float),
+            "timestamp": np.arange(n_rows),
+        }
+    ).to_csv(tmp_path / "all.csv", index=False)
+    # Only some of the users are known in advance.
+    pd.DataFrame({"user": [f"u{i}" for i in range(0, N_USERS, 2)]}).to_csv(
+        tmp_path / "users.csv", index=False
+    )
+    pd.DataFrame({"item": [f"i{i}" for i in range(N_ITEMS)]}).to_csv(
+        tmp_path / "items.csv", index=False
+    )
+    return tmp_path
+
+
+# Parses a configuration the same way as the command line entrypoint.
+def load_config(dict_cfg: Dict[str, Any]) -> AppConfig:
+    ex_cfg = dacite.from_dict(
+        data_class=ExperimentConfig,
+        data=dict_cfg["experiment_cfg"],
+        config=dacite.Config(type_hooks=base_type_hooks),
+    )
+    return dacite.from_dict(
+        data_class=AppConfig,
+        data=dict_cfg,
+        config=dacite.Config(type_hooks=provide_type_hooks(ex_cfg=ex_cfg)),
+    )
+
+
+def make_config(data_dir: Path, out_dir: str, **overrides: Any) -> Dict[str, Any]:
+    dict_cfg: Dict[str, Any] = {
+        "experiment_cfg": {
+            "usecase_type": "TRAINTESTEVAL",
+            "data_type": "RATING",
+            "model_type": "MF",
+            "trainer_type": "ONETIME",
+            "evaluator_type": "SIMPLE",
+        },
+        "usecase_cfg": {"train_ratio": 0.8, "split_type": "RANDOM", "seed": 0},
+        "data_cfg": {"n_users": N_USERS, "n_items": N_ITEMS},
+        "model_cfg": {
+            "n_users": N_USERS,
+            "n_items": N_ITEMS,
+            "dim": 4,
+            "reg": 0.1,
+            "epochs": 1,
+            "lr": 0.01,
+            "seed": 0,
+        },
+        "evaluator_cfg": {"metrics": ["RMSE"]},
+        "trainer_cfg": {},
+        "data_path": {"all_data": str(data_dir / "all.csv")},
+        "out_dir": str(data_dir / out_dir),
+        "repo_dir": str(data_dir / "repo"),
+        "unique_user": str(data_dir / "users.csv"),
+        "unique_item": str(data_dir / "items.csv"),
+        "repo_type": "ARTIFACT",
+        "encoder_type": "FAST",
+        "unseen_policy": "GROW",
+    }
+    dict_cfg.update(overrides)
+    return dict_cfg
+
+
+def test_loaded_model_uses_its_stored_encoders(data_dir):
+    app = provide_app(load_config(make_config(data_dir, "train")))
+    app.start()
+    name = app.model.get_name()
+    # The user encoder grew the users missing from users.csv.
+    user_classes = np.asarray(app.usecase.user_encoder.get_classes())
+    assert len(user_classes) == N_USERS
+
+    # Users listed in another order would be encoded differently.
+    pd.DataFrame({"user": [f"u{i}" for i in reversed(range(N_USERS))]}).to_csv(
+        data_dir / "users.csv", index=False
+    )
+    loaded = provide_app(
+        load_config(make_config(data_dir, "load", model_load_file=name))
+    )
+
+    _, stored_items = app.usecase.model_repo.load_encoders(Path(name))
+    np.testing.assert_array_equal(
+        loaded.usecase.user_encoder.get_classes(), user_classes
+    )
+    np.testing.assert_array_equal(
+        loaded.usecase.item_encoder.get_classes(), stored_items.get_classes()
+    )
+    for codes, expected in zip(
+        loaded.usecase.all_data.get_ratings(), app.usecase.all_data.get_ratings()
+    ):
+        np.testing.assert_array_equal(codes, expected)
+
+
+def test_streaming_runs_with_the_default_encoder(data_dir):
+    pd.DataFrame({"user": [f"u{i}" for i in range(N_USERS)]}).to_csv(
+        data_dir / "users.csv", index=False
+    )
+    (data_dir / "events.csv").write_text((data_dir / "all.csv").read_text())
+    dict_cfg = make_config(
+        data_dir,
+        "stream",
+        trainer_cfg={"event_file": str(data_dir / "events.csv"), "chunk_size": 500},
+    )
+    dict_cfg["experiment_cfg"]["trainer_type"] = "STREAMING"
+    del dict_cfg["encoder_type"], dict_cfg["unseen_policy"]
+    provide_app(load_config(dict_cfg)).start()
+
+    dict_cfg["trainer_cfg"]["unseen"] = "GROW"
+    with pytest.raises(ValueError, match="needs the FAST encoder_type"):
+        load_config(dict_cfg)
+
+
+def test_model_report_does_not_copy_the_factors():
+    model = MF(n_users=20_000, n_items=1_000, dim=32)
+
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    try:
+        report = model_report(model)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    assert peak < model.U.nbytes // 10
+    assert report["bytes"] == model.U.nbytes + model.V.nbytes
+    assert report["factors"]["U"]["downcast"] == "float32"
+    assert report["factors"]["U"]["saved_bytes"] == model.U.nbytes // 2
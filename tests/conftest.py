@@ -0,0 +1,36 @@
+from logging import WARNING
+from typing import Callable
+
+import pytest
+from benchmarks.data import dataset_size, generate
+from exrec.core.dataframe import DataFrameImpl
+from exrec.core.interface import Logger
+from exrec.core.logger import provide_logger
+from exrec.preprocessing.dataset import RatingDatasetImpl
+from exrec.preprocessing.interface import RatingDataset
+
+
+@pytest.fixture
+def logger() -> Logger:
+    logger = provide_logger(name="Test")
+    logger.logger.setLevel(WARNING)
+    return logger
+
+
+# Synthetic power-law ratings, the same as the benchmarks use
+@pytest.fixture
+def make_dataset() -> Callable[..., RatingDataset]:
+    def make(n_rows: int = 20_000, seed: int = 42) -> RatingDataset:
+        size = dataset_size(n_rows)
+        return RatingDatasetImpl(
+            data=DataFrameImpl(data=generate(n_rows=n_rows, seed=seed)),
+            n_users=size["n_users"],
+            n_items=size["n_items"],
+            col_user="user",
+            col_item="item",
+            col_rating="rating",
+            col_timestamp="timestamp",
+            col_pred=None,
+        )
+
+    return make
@@ -0,0 +1,47 @@
+import tracemalloc
+
+import pandas as pd
+import pytest
+from benchmarks.data import generate
+from exrec.core.dataframe import read_csv
+
+DTYPES = {"user": "int32", "item": "int32", "rating": "float32", "timestamp": "int64"}
+
+
+@pytest.fixture
+def rating_file(tmp_path):
+    src_file = tmp_path / "ratings.csv"
+    generate(n_rows=200_000).to_csv(src_file, index=False)
+    return src_file
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7_777, 200_000, 1_000_000])
+def test_chunks_give_the_same_frame(tmp_path, chunk_size):
+    src_file = tmp_path / "ratings.csv"
+    generate(n_rows=1_000).to_csv(src_file, index=False, lineterminator="\n")
+    # Without a final line break
+    src_file.write_text(src_file.read_text().rstrip("\n"))
+
+    expected = read_csv(src_file=src_file, dtype=DTYPES).get_data()
+    data = read_csv(src_file=src_file, dtype=DTYPES, chunk_size=chunk_size)
+    pd.testing.assert_frame_equal(data.get_data(), expected)
+
+
+def test_chunks_keep_string_ids(tmp_path):
+    src_file = tmp_path / "ratings.csv"
+    src_file.write_text("user,item,rating\n007,a,1\n008,b,2\n009,a,3\n")
+
+    expected = read_csv(src_file=src_file, dtype={"user": "str"}).get_data()
+    data = read_csv(src_file=src_file, dtype={"user": "str"}, chunk_size=2)
+    pd.testing.assert_frame_equal(data.get_data(), expected)
+    assert list(data.get_data()["user"]) == ["007", "008", "009"]
+
+
+def test_chunks_bound_the_peak_memory(rating_file):
+    tracemalloc.start()
+    data = read_csv(src_file=rating_file, dtype=DTYPES, chunk_size=20_000)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    size = data.get_data().memory_usage(index=False).sum()
+    assert peak < 1.5 * size
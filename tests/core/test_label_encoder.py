@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+from exrec.core.config import EncoderType, UnseenPolicy
+from exrec.core.label_encoder import provide_label_encoder
+
+LABELS = {
+    "int": np.array([10, 11, 12, 15]),
+    "float": np.array([10.0, 11.0, 12.0, 15.0]),
+    "str": np.array(["a", "b", "c", "f"], dtype=object),
+    "sparse": np.array([1, 10**9, 5, 7]),
+}
+UNSEEN = {
+    "int": np.array([11, 13, 15]),
+    "float": np.array([11.0, np.nan, 15.0]),
+    "str": np.array(["b", "d", "f"], dtype=object),
+    "sparse": np.array([10**9, 3, 7]),
+}
+
+
+@pytest.mark.parametrize("kind", list(LABELS))
+@pytest.mark.parametrize("unseen", list(UnseenPolicy))
+def test_round_trip(kind, unseen):
+    labels = LABELS[kind]
+    encoder = provide_label_encoder(
+        labels, encoder_type=EncoderType.FAST, unseen=unseen
+    )
+
+    codes = encoder.encode(labels)
+    assert sorted(codes) == [0, 1, 2, 3]
+    np.testing.assert_array_equal(encoder.decode(codes), labels)
+
+
+# Float IDs decode to the integers they stand for.
+def test_float_labels_match_integer_classes():
+    encoder = provide_label_encoder(LABELS["int"], encoder_type=EncoderType.FAST)
+    codes = encoder.encode(LABELS["float"])
+    np.testing.assert_array_equal(encoder.decode(codes), LABELS["int"])
+
+
+# The middle label of UNSEEN is unseen, the others are the 2nd and 4th class.
+@pytest.mark.parametrize("kind", list(LABELS))
+def test_unseen_policies(kind):
+    labels, new = LABELS[kind], UNSEEN[kind]
+
+    def encoder(unseen):
+        return provide_label_encoder(
+            labels, encoder_type=EncoderType.FAST, unseen=unseen
+        )
+
+    seen = np.asarray(encoder(UnseenPolicy.RAISE).encode(labels[[1, 3]]))
+    with pytest.raises(ValueError):
+        encoder(UnseenPolicy.RAISE).encode(new)
+
+    reserve = encoder(UnseenPolicy.RESERVE)
+    codes = np.asarray(reserve.encode(new))
+    np.testing.assert_array_equal(codes, [seen[0], len(labels), seen[1]])
+    assert reserve.decode(codes)[1] is None
+
+    codes = np.asarray(encoder(UnseenPolicy.DROP).encode(new))
+    np.testing.assert_array_equal(codes, [seen[0], -1, seen[1]])
+
+    grow = encoder(UnseenPolicy.GROW)
+    codes = np.asarray(grow.encode(new))
+    np.testing.assert_array_equal(codes, [seen[0], len(labels), seen[1]])
+    assert len(grow.get_classes()) == len(labels) + 1
+    np.testing.assert_array_equal(np.asarray(grow.encode(new)), codes)
+
+
+def test_sklearn_encoder_only_raises():
+    with pytest.raises(ValueError):
+        provide_label_encoder(
+            LABELS["int"], encoder_type=EncoderType.SKLEARN, unseen=UnseenPolicy.GROW
+        )
+    encoder = provide_label_encoder(LABELS["float"], encoder_type=EncoderType.SKLEARN)
+    codes = encoder.encode(LABELS["float"])
+    np.testing.assert_array_equal(encoder.decode(codes), LABELS["float"])
@@ -0,0 +1,32 @@
+import numpy as np
+from exrec.core.memory import MemoryTracer, array_report
+
+
+def test_traced_peaks_belong_to_their_stage():
+    tracer = MemoryTracer(trace=True)
+
+    tracer.enter()
+    tracer.enter()
+    big = np.ones(4_000_000)
+    del big
+    inner = tracer.exit()
+    tracer.enter()
+    small = np.ones(1_000)
+    del small
+    later = tracer.exit()
+    outer = tracer.exit()
+
+    assert inner["traced_peak"] >= 32_000_000
+    assert later["traced_peak"] < 1_000_000
+    assert outer["traced_peak"] >= inner["traced_peak"]
+    # The lifetime high-water mark is not reported as a stage peak.
+    assert set(later) == {"rss", "rss_delta", "traced_peak"}
+
+
+def test_array_report_flags_narrower_dtypes():
+    report = array_report(np.arange(1_000, dtype=np.int64))
+    assert report["downcast"] == "int16"
+    assert report["saved_bytes"] == 6_000
+
+    assert "downcast" not in array_report(np.linspace(0, 1, 7))
+    assert array_report(np.array([1.0, 2.5, 4.0]))["downcast"] == "float32"
@@ -0,0 +1,57 @@
+import json
+
+import pytest
+from exrec.core.logger import provide_logger
+from exrec.core.timer import provide_timer
+
+
+def test_stages_are_written_as_they_end(tmp_path):
+    timer = provide_timer(output_file=tmp_path / "timings.jsonl")
+    logger = provide_logger(name="TimerTest", timer=timer)
+
+    with logger.timeit("outer", n_items=10) as outer:
+        for _ in range(2):
+            with logger.get_child("Child").timeit("inner"):
+                pass
+    with pytest.raises(ValueError):
+        with logger.timeit("failed"):
+            raise ValueError()
+
+    with open(str(tmp_path / "timings.jsonl")) as f:
+        stages = [json.loads(line)["stage"] for line in f]
+    assert stages == [
+        "TimerTest.Child.inner",
+        "TimerTest.Child.inner",
+        "TimerTest.outer",
+        "TimerTest.failed",
+    ]
+    assert outer["items_per_sec"] == pytest.approx(10 / max(outer["wall"], 1e-9))
+    assert outer["wall"] >= 0 and outer["cpu"] >= 0
+
+    summary = timer.summary()
+    assert list(summary) == [
+        "TimerTest.Child.inner",
+        "TimerTest.outer",
+        "TimerTest.failed",
+    ]
+    assert summary["TimerTest.Child.inner"]["count"] == 2
+    assert summary["TimerTest.outer"]["n_items"] == 10
+    assert (
+        summary["TimerTest.outer"]["wall"] >= summary["TimerTest.Child.inner"]["wall"]
+    )
+
+    timer.dump(tmp_path / "timings.json")
+    with open(str(tmp_path / "timings.json")) as f:
+        assert json.load(f) == json.loads(json.dumps(summary))
+
+
+def test_merged_records_count_in_the_summary(tmp_path):
+    timer = provide_timer(output_file=tmp_path / "timings.jsonl")
+    worker = provide_timer()
+    with provide_logger(name="TimerWorker", timer=worker).timeit("task", n_items=4):
+        pass
+
+    timer.merge(worker.records)
+    assert timer.summary()["TimerWorker.task"]["n_items"] == 4
+    with open(str(tmp_path / "timings.jsonl")) as f:
+        assert [json.loads(line) for line in f] == worker.records
@@ -0,0 +1,99 @@
+import numpy as np
+import pytest
+from exrec.evaluation.config import (
+    EvaluatorType,
+    MetricType,
+    RankingEvaluatorConfig,
+    SampledEvaluatorConfig,
+)
+from exrec.evaluation.evaluate import SimpleEvaluator
+from exrec.evaluation.metrics.ranking import ranking_metrics
+from exrec.evaluation.metrics.rating import MAE, MSE, RMSE, RatingAccumulator
+from exrec.evaluation.provide import provide_evaluator
+from exrec.model.factorization import MF
+from sklearn.metrics import mean_absolute_error, mean_squared_error
+
+
+def test_merged_chunks_equal_a_single_pass():
+    rng = np.random.default_rng(0)
+    true, pred = rng.integers(1, 6, 10_001).astype(float), rng.normal(3, 1, 10_001)
+
+    single = RatingAccumulator().update(true, pred)
+    merged = RatingAccumulator()
+    for begin in range(0, len(true), 999):
+        chunk = RatingAccumulator().update(
+            true[begin : begin + 999], pred[begin : begin + 999]
+        )
+        merged = merged.merge(chunk)
+
+    for metric in [MAE(), MSE(), RMSE()]:
+        assert metric.result(merged) == pytest.approx(metric.result(single))
+    assert MAE().result(single) == pytest.approx(mean_absolute_error(true, pred))
+    assert MSE().result(single) == pytest.approx(mean_squared_error(true, pred))
+
+
+def test_predictions_are_not_kept_by_default(logger, make_dataset):
+    data = make_dataset()
+    model = MF(n_users=data.n_users, n_items=data.n_items)
+    metrics = [MetricType.MAE, MetricType.RMSE]
+
+    scores = SimpleEvaluator(metrics=metrics, batch_size=1_000).evaluate(
+        logger=logger, model=model, test_data=data
+    )
+    assert data.col_pred is None
+    assert "pred" not in data.get_data()
+
+    kept = SimpleEvaluator(metrics=metrics, keep_pred=True).evaluate(
+        logger=logger, model=model, test_data=data
+    )
+    assert data.col_pred == "pred"
+    assert scores == pytest.approx(kept)
+
+
+def test_ranking_evaluator_ranks_the_predictions(logger, make_dataset):
+    train, test = make_dataset().random_split(train_ratio=0.8, seed=0)
+    model = MF(n_users=train.n_users, n_items=train.n_items, epochs=2)
+    model.fit(logger=logger, data=train)
+    config = RankingEvaluatorConfig(metrics=["NDCG", "HR", "MRR"], ks=[10, 5])
+    evaluator = provide_evaluator(EvaluatorType.RANKING, config=config)
+
+    scores = evaluator.evaluate(logger=logger, model=model, test_data=test)
+
+    assert list(scores) == ["NDCG@5", "HR@5", "MRR@5", "NDCG@10", "HR@10", "MRR@10"]
+    users, items, ratings = test.get_ratings()
+    assert scores == pytest.approx(
+        ranking_metrics(
+            users=users,
+            true=ratings,
+            pred=model.predict_ratings(users=users, items=items),
+            names=["NDCG", "HR", "MRR"],
+            ks=[5, 10],
+            threshold=4.0,
+        )
+    )
+    for name in ["NDCG", "HR", "MRR"]:
+        assert 0 < scores[f"{name}@5"] <= scores[f"{name}@10"] <= 1
+
+
+def test_sampled_evaluator_ranks_against_unseen_negatives(logger, make_dataset):
+    train, test = make_dataset().random_split(train_ratio=0.8, seed=0)
+    model = MF(n_users=train.n_users, n_items=train.n_items, epochs=2)
+    model.fit(logger=logger, data=train)
+
+    def evaluate(n_negatives: int = 20, **options):
+        config = SampledEvaluatorConfig(
+            metrics=["HR", "NDCG"], ks=[1, 5, 21], n_negatives=n_negatives, **options
+        )
+        evaluator = provide_evaluator(EvaluatorType.SAMPLED, config=config)
+        return evaluator.evaluate(logger=logger, model=model, test_data=test)
+
+    scores = evaluate()
+    assert scores == evaluate()
+    # Every positive is in the top n_negatives + 1.
+    assert scores["HR@21"] == 1.0
+    for name in ["HR", "NDCG"]:
+        assert 0 < scores[f"{name}@1"] <= scores[f"{name}@5"] <= scores[f"{name}@21"]
+
+    # Against a single negative, some positives win and some lose.
+    positives = evaluate(n_negatives=1, threshold=4.0, batch_size=100)
+    assert 0 < positives["HR@1"] < 1
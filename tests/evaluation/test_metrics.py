@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+from exrec.evaluation.metrics.ranking import ranking_metrics, sampled_ranking_metrics
+
+NAMES = ["HR", "RECALL", "NDCG", "MAP", "MRR"]
+KS = [1, 3, 10]
+
+
+def brute_force(users, true, pred, k, threshold):
+    scores = {name: [] for name in NAMES}
+    for user in np.unique(users):
+        rows = np.flatnonzero(users == user)
+        rel = true[rows[np.argsort(-pred[rows])]] >= threshold
+        n_rel = rel.sum()
+        if n_rel == 0:
+            continue
+        top = rel[:k]
+        discount = 1.0 / np.log2(np.arange(2, k + 2))
+        precision = np.cumsum(top) / np.arange(1, len(top) + 1)
+        scores["HR"].append(float(top.any()))
+        scores["RECALL"].append(top.sum() / n_rel)
+        scores["NDCG"].append(
+            np.sum(discount[: len(top)][top]) / discount[: min(n_rel, k)].sum()
+        )
+        scores["MAP"].append(np.sum(precision[top]) / min(n_rel, k))
+        scores["MRR"].append(1.0 / (np.argmax(top) + 1) if top.any() else 0.0)
+    return {name: np.mean(values) for name, values in scores.items()}
+
+
+def test_ranking_metrics_match_brute_force():
+    rng = np.random.default_rng(0)
+    users = rng.integers(0, 200, 5_000)
+    true = rng.integers(1, 6, 5_000).astype(float)
+    pred = rng.normal(size=5_000)
+
+    scores = ranking_metrics(
+        users=users, true=true, pred=pred, names=NAMES, ks=KS, threshold=4.0
+    )
+    for k in KS:
+        expected = brute_force(users, true, pred, k=k, threshold=4.0)
+        for name in NAMES:
+            assert scores[f"{name}@{k}"] == pytest.approx(expected[name])
+
+
+def test_sampled_metrics_match_brute_force():
+    rng = np.random.default_rng(0)
+    pos = rng.normal(size=1_000)
+    neg = rng.normal(size=(1_000, 50))
+    neg[:10, 0] = pos[:10]
+
+    sums = sampled_ranking_metrics(pos, neg, names=["HR", "NDCG", "MRR"], ks=KS)
+    for k in KS:
+        # A tied negative is ranked above the positive.
+        ranks = [np.sum(n >= p) for p, n in zip(pos, neg)]
+        hits = [r for r in ranks if r < k]
+        assert sums[f"HR@{k}"] == len(hits)
+        assert sums[f"NDCG@{k}"] == pytest.approx(sum(1 / np.log2(r + 2) for r in hits))
+        assert sums[f"MRR@{k}"] == pytest.approx(sum(1 / (r + 1) for r in hits))
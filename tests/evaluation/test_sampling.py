@@ -0,0 +1,31 @@
+import numpy as np
+from exrec.evaluation.sampling import interaction_keys, sample_negatives
+from exrec.preprocessing.index import provide_interaction_index
+
+
+def test_negatives_avoid_the_interactions():
+    rng = np.random.default_rng(0)
+    n_users, n_items = 100, 50
+    users, items = rng.integers(0, n_users, 3_000), rng.integers(0, n_items, 3_000)
+    index = provide_interaction_index(
+        users=users,
+        items=items,
+        ratings=np.ones(len(users)),
+        n_users=n_users,
+        n_items=n_items,
+    )
+    keys = interaction_keys(indexes=[index], n_items=n_items)
+    np.testing.assert_array_equal(keys, np.unique(users * n_items + items))
+
+    queries = np.arange(n_users)
+    negatives = sample_negatives(
+        users=queries,
+        keys=keys,
+        n_items=n_items,
+        n_negatives=20,
+        rng=np.random.RandomState(0),
+    )
+    assert negatives.shape == (n_users, 20)
+    for user in queries:
+        seen, _ = index.by_user.row(user)
+        assert len(np.intersect1d(negatives[user], seen)) == 0
@@ -0,0 +1,67 @@
+from pathlib import Path
+
+import numpy as np
+from exrec.model.ann import provide_ann_index
+from exrec.model.factorization import MF
+from exrec.model.repository import provide_repository
+
+
+def factors(n: int, seed: int) -> np.ndarray:
+    return np.random.default_rng(seed).standard_normal((n, 16))
+
+
+def test_probing_every_list_is_exact():
+    items, queries = factors(2_000, seed=0), factors(300, seed=1)
+    index = provide_ann_index(items=items, n_lists=32, n_probe=32, seed=0)
+
+    approx, scores = index.search(queries=queries, k=10)
+
+    exact = np.argsort(-(queries @ items.T), axis=1)[:, :10]
+    np.testing.assert_array_equal(approx, exact)
+    np.testing.assert_allclose(
+        scores, np.sort(queries @ items.T, axis=1)[:, -10:][:, ::-1]
+    )
+
+
+def test_recall_grows_with_the_probes():
+    items, queries = factors(2_000, seed=0), factors(300, seed=1)
+    index = provide_ann_index(items=items, n_lists=32, n_probe=1, seed=0)
+
+    report = index.report(queries=queries, k=10, n_probes=[1, 4, 16, 32])
+    recalls = [report[n_probe]["recall@10"] for n_probe in [1, 4, 16, 32]]
+    assert np.all(np.diff(recalls) >= 0)
+    assert recalls[-1] == 1.0
+
+
+def test_blocks_give_the_same_result():
+    items, queries = factors(2_000, seed=0), factors(300, seed=1)
+    index = provide_ann_index(items=items, n_lists=32, n_probe=4, seed=0)
+
+    items_1, _ = index.search(queries=queries, k=10, block_size=7)
+    items_2, _ = index.search(queries=queries, k=10)
+    np.testing.assert_array_equal(items_1, items_2)
+
+
+def test_same_seed_same_index():
+    items = factors(2_000, seed=0)
+    index_1 = provide_ann_index(items=items, n_lists=32, n_probe=4, seed=3)
+    index_2 = provide_ann_index(items=items, n_lists=32, n_probe=4, seed=3)
+    np.testing.assert_array_equal(index_1.list_items, index_2.list_items)
+
+
+def test_stored_index_gives_the_same_result(tmp_path, logger, make_dataset):
+    data = make_dataset()
+    model = MF(n_users=data.n_users, n_items=data.n_items, epochs=1)
+    model.fit(logger=logger, data=data)
+    index = provide_ann_index(items=model.V, n_lists=8, n_probe=2, seed=0)
+
+    repository = provide_repository(tmp_path)
+    repository.store(model)
+    repository.store_index(model, index)
+
+    loaded = repository.load_index(Path(model.get_name() + ".pkl"))
+    queries = model.U[:50]
+    for expected, actual in zip(
+        index.search(queries=queries, k=5), loaded.search(queries=queries, k=5)
+    ):
+        np.testing.assert_array_equal(actual, expected)
@@ -0,0 +1,104 @@
+import numpy as np
+import pytest
+from exrec.model.config import RepositoryType
+from exrec.model.factorization import MF
+from exrec.model.repository import provide_repository
+from exrec.preprocessing.index import provide_interaction_index
+
+
+@pytest.fixture
+def model(logger, make_dataset):
+    data = make_dataset()
+    return MF(n_users=data.n_users, n_items=data.n_items, epochs=1).fit(
+        logger=logger, data=data
+    )
+
+
+def test_recommend_excludes_seen_items(model):
+    users = np.arange(model.n_users)
+    items, scores = model.recommend(users=users, k=10)
+
+    for user in users:
+        seen, _ = model.seen.by_user.row(user)
+        assert len(np.intersect1d(items[user], seen)) == 0
+    assert np.all(np.diff(scores, axis=1) <= 0)
+
+    # The scores are the predictions and no other item scores higher.
+    np.testing.assert_allclose(
+        scores,
+        model.predict_ratings(np.repeat(users, 10), items.ravel()).reshape(-1, 10),
+    )
+    all_scores = model.U @ model.V.T
+    positions, seen, _ = model.seen.by_user.gather(users)
+    all_scores[positions, seen] = -np.inf
+    np.testing.assert_allclose(scores[:, -1], np.sort(all_scores, axis=1)[:, -10])
+
+
+def test_blocks_give_the_same_recommendations(model):
+    users = np.arange(model.n_users)
+    expected = model.recommend(users=users, k=10)
+
+    model.rec_batch_size = 7
+    items, scores = model.recommend(users=users, k=10)
+    np.testing.assert_array_equal(items, expected[0])
+    np.testing.assert_allclose(scores, expected[1])
+
+
+def test_slots_without_unseen_items_are_padded():
+    model = MF(n_users=2, n_items=5)
+    seen = provide_interaction_index(
+        users=[0, 0, 0, 1], items=[0, 1, 2, 4], ratings=[1.0] * 4, n_users=2, n_items=5
+    )
+
+    items, scores = model.recommend(users=[0, 1], k=4, seen=seen)
+    assert sorted(items[0, :2]) == [3, 4]
+    np.testing.assert_array_equal(items[0, 2:], [-1, -1])
+    assert np.all(np.isneginf(scores[0, 2:]))
+    assert sorted(items[1]) == [0, 1, 2, 3]
+
+
+def test_loaded_model_needs_the_seen_items(tmp_path, model, make_dataset):
+    repository = provide_repository(tmp_path, repo_type=RepositoryType.ARTIFACT)
+    repository.store(model)
+    loaded = repository.load(model.get_name())
+
+    with pytest.raises(RuntimeError, match="no seen items"):
+        loaded.recommend(users=[0, 1], k=5)
+
+    loaded.seen = make_dataset().get_index()
+    np.testing.assert_array_equal(
+        loaded.recommend(users=[0, 1], k=5)[0], model.recommend(users=[0, 1], k=5)[0]
+    )
+
+
+def test_fold_in_solves_only_the_new_rows(logger, make_dataset):
+    data = make_dataset()
+    users, items, ratings = (np.asarray(x) for x in data.get_ratings())
+    n_users, n_items = data.n_users - 5, data.n_items - 3
+    old = np.flatnonzero((users < n_users) & (items < n_items))
+    model = MF(n_users=n_users, n_items=n_items, epochs=1)
+    model.fit(logger=logger, data=data.subset(old))
+    U, V = model.U.copy(), model.V.copy()
+
+    new = np.flatnonzero((users >= n_users) & (items < n_items))
+    model.fold_in(logger=logger, data=data, delta=data.subset(new))
+
+    # The factors grow to the IDs of `data`.
+    assert (model.n_users, model.n_items) == (data.n_users, data.n_items)
+    assert model.U.shape == (data.n_users, model.dim)
+    assert model.V.shape == (data.n_items, model.dim)
+    assert model.seen.by_user.n_rows == data.n_users
+    np.testing.assert_array_equal(model.U[:n_users], U)
+    untouched = np.setdiff1d(np.arange(n_items), items[new])
+    np.testing.assert_array_equal(model.V[untouched], V[untouched])
+
+    # A new user gets the ridge solution over all its ratings in `data`
+    # against the item factors before, new items being initialized only.
+    V = np.vstack([V, model.V[n_items:]])
+    for user in range(n_users, data.n_users):
+        rows = np.flatnonzero(users == user)
+        F = V[items[rows]]
+        expected = np.linalg.solve(
+            F.T @ F + model.reg * len(rows) * np.eye(model.dim), F.T @ ratings[rows]
+        )
+        np.testing.assert_allclose(model.U[user], expected)
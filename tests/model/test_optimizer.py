@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+from exrec.model.config import OptimizerType
+from exrec.model.factorization import MF
+from exrec.model.optimizer import _minibatch_step, _normal_equations
+
+
+def train_rmse(model: MF, data) -> float:
+    users, items, ratings = data.get_ratings()
+    diff = np.asarray(ratings) - model.predict_ratings(users=users, items=items)
+    return float(np.sqrt(np.mean(diff**2)))
+
+
+# Every optimizer lowers the training loss at the default hyper parameters.
+@pytest.mark.parametrize(
+    "optimizer, n_rows",
+    [
+        (OptimizerType.SGD, 5_000),
+        (OptimizerType.MINIBATCH_SGD, 20_000),
+        (OptimizerType.ALS, 20_000),
+        (OptimizerType.HOGWILD, 20_000),
+    ],
+)
+def test_loss_goes_down_at_defaults(logger, make_dataset, optimizer, n_rows):
+    data = make_dataset(n_rows=n_rows)
+    model = MF(n_users=data.n_users, n_items=data.n_items, optimizer=optimizer)
+
+    losses = [train_rmse(model, data)]
+    for _ in range(3):
+        model.fit(logger=logger, data=data, epochs=1)
+        losses.append(train_rmse(model, data))
+
+    assert np.all(np.isfinite(losses))
+    assert np.all(np.diff(losses) < 0)
+    assert losses[-1] < 1.5
+
+
+def test_repeated_rows_take_the_mean_gradient():
+    rng = np.random.default_rng(0)
+    U, V = rng.random((2, 4)), rng.random((3, 4))
+    single_U, single_V = U.copy(), V.copy()
+    _minibatch_step(
+        users=np.array([0]),
+        items=np.array([1]),
+        ratings=np.array([5.0]),
+        U=single_U,
+        V=single_V,
+        reg=0.1,
+        lr=0.01,
+    )
+
+    # The same rating repeated in a batch moves the rows by a single step.
+    _minibatch_step(
+        users=np.zeros(100, dtype=np.int32),
+        items=np.ones(100, dtype=np.int32),
+        ratings=np.full(100, 5.0),
+        U=U,
+        V=V,
+        reg=0.1,
+        lr=0.01,
+    )
+    np.testing.assert_allclose(U, single_U)
+    np.testing.assert_allclose(V, single_V)
+
+
+def test_normal_equations_match_per_row_solves():
+    rng = np.random.default_rng(0)
+    # Degrees across several power-of-two buckets
+    degree = rng.integers(1, 300, size=50)
+    F = rng.random((degree.sum(), 8))
+    values = rng.random(degree.sum())
+
+    x = _normal_equations(F=F, values=values, degree=degree, reg=0.1)
+
+    offsets = np.cumsum(degree) - degree
+    for row, (offset, n) in enumerate(zip(offsets, degree)):
+        F_r, r = F[offset : offset + n], values[offset : offset + n]
+        expected = np.linalg.solve(F_r.T @ F_r + 0.1 * n * np.eye(8), F_r.T @ r)
+        np.testing.assert_allclose(x[row], expected, rtol=1e-8)
@@ -0,0 +1,70 @@
+import numpy as np
+from exrec.core.config import EncoderType, UnseenPolicy
+from exrec.core.label_encoder import provide_label_encoder
+from exrec.model.ann import provide_ann_index
+from exrec.model.config import RepositoryType
+from exrec.model.factorization import MF
+from exrec.model.repository import provide_repository
+
+
+def test_artifact_round_trip(tmp_path, logger, make_dataset):
+    data = make_dataset()
+    model = MF(n_users=data.n_users, n_items=data.n_items, epochs=2)
+    model.fit(logger=logger, data=data)
+    user_encoder = provide_label_encoder(
+        np.arange(data.n_users) * 3, encoder_type=EncoderType.FAST
+    )
+    item_encoder = provide_label_encoder(
+        np.array([f"i{i}" for i in range(data.n_items - 2)], dtype=object),
+        encoder_type=EncoderType.FAST,
+        unseen=UnseenPolicy.GROW,
+    )
+    # Grown classes follow the sorted ones, so they must not be sorted again.
+    item_encoder.encode([f"i{data.n_items - 1}", f"i{data.n_items - 2}"])
+    index = provide_ann_index(items=model.V, n_lists=8, n_probe=2, seed=0)
+
+    repository = provide_repository(tmp_path, repo_type=RepositoryType.ARTIFACT)
+    repository.store(model, user_encoder=user_encoder, item_encoder=item_encoder)
+    repository.store_index(model, index)
+
+    name = model.get_name()
+    loaded = repository.load(name)
+    assert loaded.get_name() == name
+    assert loaded.get_config() == model.get_config()
+    users, items, _ = data.get_ratings()
+    np.testing.assert_array_equal(
+        loaded.predict_ratings(users=users, items=items),
+        model.predict_ratings(users=users, items=items),
+    )
+
+    loaded_users, loaded_items = repository.load_encoders(name)
+    for encoder, loaded_encoder in [
+        (user_encoder, loaded_users),
+        (item_encoder, loaded_items),
+    ]:
+        assert loaded_encoder.get_config() == encoder.get_config()
+        np.testing.assert_array_equal(
+            loaded_encoder.get_classes(), encoder.get_classes()
+        )
+        labels = encoder.decode(np.arange(len(encoder.get_classes())))
+        np.testing.assert_array_equal(
+            loaded_encoder.encode(labels), encoder.encode(labels)
+        )
+
+    queries = model.U[:50]
+    np.testing.assert_array_equal(
+        repository.load_index(name).search(queries=queries, k=5)[0],
+        index.search(queries=queries, k=5)[0],
+    )
+
+
+def test_pickle_round_trip(tmp_path, logger, make_dataset):
+    data = make_dataset()
+    model = MF(n_users=data.n_users, n_items=data.n_items, epochs=1)
+    model.fit(logger=logger, data=data)
+
+    repository = provide_repository(tmp_path)
+    repository.store(model)
+    loaded = repository.load(model.get_name() + ".pkl")
+    np.testing.assert_array_equal(loaded.U, model.U)
+    np.testing.assert_array_equal(loaded.V, model.V)
@@ -0,0 +1,82 @@
+import numpy as np
+import pandas as pd
+from exrec.core.config import EncoderType, UnseenPolicy
+from exrec.core.label_encoder import provide_label_encoder
+from exrec.preprocessing.cache import provide_dataset_cache
+from exrec.preprocessing.config import DataType, RatingDataConfig
+from exrec.preprocessing.provide import provide_encoded_dataset
+
+CONFIG = RatingDataConfig(
+    n_users=3, n_items=3, col_rating="rating", user_dtype="int64", item_dtype="int64"
+)
+
+
+def write(tmp_path):
+    data_path = tmp_path / "ratings.csv"
+    pd.DataFrame(
+        {"user": [10, 11, 12, 13], "item": [1, 2, 3, 1], "rating": [1.0, 2, 3, 4]}
+    ).to_csv(data_path, index=False)
+    return data_path
+
+
+def load(data_path, cache, unseen):
+    encoders = {
+        "user": provide_label_encoder(
+            [10, 11, 12], encoder_type=EncoderType.FAST, unseen=unseen
+        ),
+        "item": None,
+    }
+    dataset = provide_encoded_dataset(
+        data_path=data_path,
+        data_type=DataType.RATING,
+        config=CONFIG,
+        encoders=encoders,
+        cache=cache,
+    )
+    return dataset, encoders["user"]
+
+
+def test_hit_equals_miss(tmp_path):
+    data_path = write(tmp_path)
+    cache = provide_dataset_cache(cache_dir=tmp_path / "cache")
+
+    miss, _ = load(data_path, cache, UnseenPolicy.RESERVE)
+    hit, _ = load(data_path, cache, UnseenPolicy.RESERVE)
+
+    assert isinstance(hit.get_data().values("user"), np.memmap)
+    for col in ["user", "item", "rating"]:
+        np.testing.assert_array_equal(
+            hit.get_data().values(col), miss.get_data().values(col)
+        )
+
+
+def test_growing_encoders_are_not_cached(tmp_path):
+    data_path = write(tmp_path)
+    cache = provide_dataset_cache(cache_dir=tmp_path / "cache")
+
+    load(data_path, cache, UnseenPolicy.GROW)
+    dataset, encoder = load(data_path, cache, UnseenPolicy.GROW)
+
+    assert not (tmp_path / "cache").exists() or not any((tmp_path / "cache").iterdir())
+    users = dataset.get_data().values("user")
+    assert list(encoder.decode(users)) == [10, 11, 12, 13]
+
+
+def test_unseen_policies_do_not_share_entries(tmp_path):
+    data_path = write(tmp_path)
+    cache = provide_dataset_cache(cache_dir=tmp_path / "cache")
+
+    keys = {
+        unseen: cache.key(
+            data_path=data_path,
+            data_type=DataType.RATING,
+            config=CONFIG,
+            encoders={"user": load(data_path, None, unseen)[1], "item": None},
+        )
+        for unseen in [UnseenPolicy.RESERVE, UnseenPolicy.DROP]
+    }
+    assert keys[UnseenPolicy.RESERVE] != keys[UnseenPolicy.DROP]
+
+    load(data_path, cache, UnseenPolicy.RESERVE)
+    dropped, encoder = load(data_path, cache, UnseenPolicy.DROP)
+    assert list(encoder.decode(dropped.get_data().values("user"))) == [10, 11, 12]
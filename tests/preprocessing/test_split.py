@@ -0,0 +1,104 @@
+import numpy as np
+import pytest
+from exrec.preprocessing.split import (
+    kfold_index,
+    leave_last_n_index,
+    random_split_index,
+    stratified_split_index,
+    timestamp_split_index,
+    user_timestamp_split_index,
+)
+
+N_SAMPLES = 10_001
+
+
+@pytest.fixture
+def interactions():
+    rng = np.random.default_rng(0)
+    users = rng.integers(0, 500, N_SAMPLES)
+    timestamps = rng.permutation(N_SAMPLES).astype(float)
+    return users, timestamps
+
+
+def assert_partition(train, test, n_samples=N_SAMPLES):
+    assert np.all(np.diff(train) > 0) and np.all(np.diff(test) > 0)
+    assert len(np.intersect1d(train, test)) == 0
+    np.testing.assert_array_equal(
+        np.sort(np.concatenate([train, test])), np.arange(n_samples)
+    )
+
+
+@pytest.mark.parametrize("train_ratio", [0.0, 0.3, 0.8, 1.0])
+def test_random_split(train_ratio):
+    train, test = random_split_index(N_SAMPLES, train_ratio=train_ratio, seed=1)
+    assert_partition(train, test)
+    assert len(train) == int(train_ratio * N_SAMPLES)
+
+    again, _ = random_split_index(N_SAMPLES, train_ratio=train_ratio, seed=1)
+    np.testing.assert_array_equal(train, again)
+
+
+def test_stratified_split(interactions):
+    users, _ = interactions
+    train, test = stratified_split_index(users, train_ratio=0.8, seed=1)
+    assert_partition(train, test)
+
+    labels, sizes = np.unique(users, return_counts=True)
+    n_train = np.bincount(users[train], minlength=len(sizes))[labels]
+    np.testing.assert_array_equal(n_train, (0.8 * sizes).astype(np.int64))
+
+
+@pytest.mark.parametrize("train_ratio", [0.0, 0.3, 1.0])
+def test_timestamp_split(interactions, train_ratio):
+    _, timestamps = interactions
+    train, test = timestamp_split_index(timestamps, train_ratio=train_ratio)
+    assert_partition(train, test)
+    assert len(train) == int(train_ratio * N_SAMPLES)
+    if len(train) and len(test):
+        assert timestamps[train].max() < timestamps[test].min()
+
+
+@pytest.mark.parametrize("n_last", [1, 3])
+def test_leave_last_n(interactions, n_last):
+    users, timestamps = interactions
+    train, test = leave_last_n_index(users, timestamps, n_last=n_last)
+    assert_partition(train, test)
+
+    for user in np.unique(users):
+        rows = np.flatnonzero(users == user)
+        latest = rows[np.argsort(timestamps[rows])]
+        expected = latest[max(len(rows) - n_last, 1) :]
+        np.testing.assert_array_equal(np.intersect1d(test, rows), np.sort(expected))
+
+
+def test_user_timestamp_split(interactions):
+    users, timestamps = interactions
+    train, test = user_timestamp_split_index(users, timestamps, train_ratio=0.5)
+    assert_partition(train, test)
+
+    for user in np.unique(users):
+        rows = np.flatnonzero(users == user)
+        in_train = np.intersect1d(train, rows)
+        in_test = np.intersect1d(test, rows)
+        assert len(in_train) == max(int(0.5 * len(rows)), 1)
+        if len(in_test):
+            assert timestamps[in_train].max() < timestamps[in_test].min()
+
+
+@pytest.mark.parametrize("n_folds", [2, 5, 7])
+def test_kfold_index(n_folds):
+    folds = kfold_index(N_SAMPLES, n_folds=n_folds, seed=1)
+    sizes = np.bincount(folds, minlength=n_folds)
+    assert len(sizes) == n_folds
+    assert sizes.max() - sizes.min() <= 1
+    np.testing.assert_array_equal(folds, kfold_index(N_SAMPLES, n_folds, seed=1))
+
+
+def test_dataset_split_gathers_the_rows_of_its_parent(make_dataset):
+    data = make_dataset()
+    train, test = data.random_split(train_ratio=0.8, seed=1)
+    assert train.n_samples + test.n_samples == data.n_samples
+
+    index, _ = random_split_index(data.n_samples, train_ratio=0.8, seed=1)
+    for expected, actual in zip(data.get_ratings(), train.get_ratings()):
+        np.testing.assert_array_equal(np.asarray(actual), np.asarray(expected)[index])
@@ -0,0 +1,71 @@
+from typing import List
+
+import numpy as np
+from exrec.evaluation.config import MetricType
+from exrec.evaluation.evaluate import SimpleEvaluator
+from exrec.model.config import OptimizerType
+from exrec.model.factorization import MF
+from exrec.trainer.early_stopping import EarlyStoppingTrainer
+
+
+class CountingMF(MF):
+    n_fits: int = 0
+
+    def fit(self, *args, **kwargs):
+        self.n_fits += 1
+        return super().fit(*args, **kwargs)
+
+
+def test_holds_out_valid_data_and_fits_once(logger, make_dataset):
+    data = make_dataset()
+    model = CountingMF(
+        n_users=data.n_users,
+        n_items=data.n_items,
+        optimizer=OptimizerType.MINIBATCH_SGD,
+    )
+    trainer = EarlyStoppingTrainer(
+        model=model,
+        evaluator=SimpleEvaluator(metrics=[MetricType.RMSE]),
+        max_epochs=20,
+        patience=2,
+        tol=1e-4,
+    )
+
+    trainer.train(logger=logger, train_data=data)
+
+    assert model.n_fits == 1
+    assert 0 < model.trained_epochs <= 20
+
+
+def test_restores_the_best_epoch(logger, make_dataset):
+    data = make_dataset()
+    train, valid = data.random_split(train_ratio=0.9, seed=0)
+    model = MF(n_users=data.n_users, n_items=data.n_items, optimizer="ALS")
+    trainer = EarlyStoppingTrainer(
+        model=model,
+        evaluator=SimpleEvaluator(metrics=[MetricType.RMSE]),
+        max_epochs=10,
+        patience=1,
+        tol=0.0,
+    )
+
+    rmses: List[float] = []
+    users, items, ratings = valid.get_ratings()
+
+    def rmse() -> float:
+        diff = np.asarray(ratings) - model.predict_ratings(users=users, items=items)
+        return float(np.sqrt(np.mean(diff**2)))
+
+    fit = model.fit
+
+    def record_fit(logger, data, epochs=None, callback=None):
+        def on_epoch(epoch: int) -> bool:
+            rmses.append(rmse())
+            return callback(epoch)
+
+        return fit(logger=logger, data=data, epochs=epochs, callback=on_epoch)
+
+    model.fit = record_fit  # type: ignore
+    trainer.train(logger=logger, train_data=train, valid_data=valid)
+
+    assert rmse() == min(rmses)
@@ -0,0 +1,76 @@
+import numpy as np
+import pandas as pd
+from exrec.core.config import UnseenPolicy
+from exrec.core.dataframe import DataFrameImpl
+from exrec.core.label_encoder import FastLabelEncoderImpl
+from exrec.evaluation.config import MetricType
+from exrec.evaluation.evaluate import SimpleEvaluator
+from exrec.model.factorization import MF
+from exrec.preprocessing.config import RatingDataConfig
+from exrec.preprocessing.dataset import RatingDatasetImpl
+from exrec.trainer.streaming import StreamingTrainer
+
+
+def frame(users, items, seed: int) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame(
+        {
+            "user": users,
+            "item": items,
+            "rating": rng.integers(1, 6, len(users)).astype(float),
+        }
+    )
+
+
+# IDs with leading zeros only survive a parser that follows the schema.
+def test_folds_in_new_ids_of_the_events(logger, tmp_path):
+    rng = np.random.default_rng(0)
+    users = [f"{i:04d}" for i in range(50)]
+    items = [f"{i:04d}" for i in range(20)]
+    train = frame(rng.choice(users, 500), rng.choice(items, 500), seed=1)
+    events = frame(
+        rng.choice(users + ["0050", "0051"], 300),
+        rng.choice(items + ["0020"], 300),
+        seed=2,
+    )
+    event_file = tmp_path / "events.csv"
+    events.to_csv(event_file, index=False)
+
+    config = RatingDataConfig(
+        n_users=50, n_items=20, col_rating="rating", user_dtype="str", item_dtype="str"
+    )
+    train_data = RatingDatasetImpl(
+        data=DataFrameImpl(data=train),
+        n_users=50,
+        n_items=20,
+        col_user="user",
+        col_item="item",
+        col_rating="rating",
+        col_timestamp=None,
+        col_pred=None,
+    )
+    user_enc = FastLabelEncoderImpl(labels=users, unseen=UnseenPolicy.RAISE)
+    item_enc = FastLabelEncoderImpl(labels=items, unseen=UnseenPolicy.RAISE)
+    train_data.label_encode(col="user", encoder=user_enc)
+    train_data.label_encode(col="item", encoder=item_enc)
+
+    model = MF(n_users=50, n_items=20, epochs=1, optimizer="MINIBATCH_SGD")
+    model.fit(logger=logger, data=train_data)
+    trainer = StreamingTrainer(
+        model=model,
+        evaluator=SimpleEvaluator(metrics=[MetricType.RMSE]),
+        model_repo=None,  # type: ignore
+        data_config=config,
+        event_file=event_file,
+        chunk_size=100,
+        epochs_per_chunk=1,
+        checkpoint_every=None,
+        sep=",",
+        unseen=UnseenPolicy.GROW,
+    )
+    trainer.train(logger=logger, train_data=train_data)
+
+    U, V = model.get_factors()
+    assert U.shape[0] == 52 and V.shape[0] == 21
+    assert set(user_enc.decode([50, 51])) == {"0050", "0051"}
+    assert np.all(np.isfinite(U)) and np.all(np.isfinite(V))
@@ -0,0 +1,47 @@
+import pandas as pd
+import pytest
+from exrec.core.logger import provide_logger
+from exrec.core.timer import provide_timer
+from exrec.evaluation.config import MetricType
+from exrec.evaluation.evaluate import SimpleEvaluator
+from exrec.model.factorization import MF
+from exrec.usecase.kfold import KFold
+
+
+def run(tmp_path, make_dataset, n_workers: int, name: str):
+    data = make_dataset(n_rows=5_000)
+    output_file = tmp_path / f"{name}.csv"
+    usecase = KFold(
+        model=MF(n_users=data.n_users, n_items=data.n_items, epochs=2),
+        evaluator=SimpleEvaluator(metrics=[MetricType.MAE, MetricType.RMSE]),
+        all_data=data,
+        output_file=output_file,
+        n_folds=3,
+        n_workers=n_workers,
+    )
+    logger = provide_logger(name=name, timer=provide_timer())
+    usecase.execute(logger=logger)
+    return pd.read_csv(output_file, index_col="fold"), logger
+
+
+def test_workers_give_the_scores_of_a_single_process(tmp_path, make_dataset):
+    sequential, _ = run(tmp_path, make_dataset, n_workers=1, name="KFoldSeq")
+    parallel, _ = run(tmp_path, make_dataset, n_workers=2, name="KFoldPar")
+
+    assert list(parallel.index) == ["0", "1", "2", "mean", "std"]
+    pd.testing.assert_frame_equal(parallel, sequential)
+    assert parallel.loc["mean", "RMSE"] == pytest.approx(
+        parallel.loc[["0", "1", "2"], "RMSE"].mean()
+    )
+
+
+def test_workers_log_once_and_report_their_timings(tmp_path, make_dataset, capfd):
+    _, logger = run(tmp_path, make_dataset, n_workers=2, name="KFoldLog")
+
+    err = capfd.readouterr().err
+    for fold in range(3):
+        assert err.count(f"KFoldLog.Fold{fold} : Train the model") == 1
+    stages = logger.timer.summary()
+    for fold in range(3):
+        assert stages[f"KFoldLog.Fold{fold}.train"]["count"] == 1
+        assert stages[f"KFoldLog.Fold{fold}.evaluate"]["count"] == 1
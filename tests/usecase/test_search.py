@@ -0,0 +1,65 @@
+import re
+
+import pandas as pd
+import pytest
+from exrec.core.logger import provide_logger
+from exrec.core.timer import provide_timer
+from exrec.evaluation.config import MetricType
+from exrec.evaluation.evaluate import SimpleEvaluator
+from exrec.model.factorization import MF
+from exrec.usecase.config import SearchStrategy
+from exrec.usecase.search import Search
+
+
+def run(tmp_path, make_dataset, name: str, **config):
+    data = make_dataset(n_rows=5_000)
+    usecase = Search(
+        model=MF(n_users=data.n_users, n_items=data.n_items, epochs=2),
+        evaluator=SimpleEvaluator(metrics=[MetricType.RMSE]),
+        all_data=data,
+        train_data=None,
+        valid_data=None,
+        output_file=tmp_path / "score.csv",
+        **config,
+    )
+    logger = provide_logger(name=name, timer=provide_timer())
+    usecase.execute(logger=logger)
+    return pd.read_csv(tmp_path / "leaderboard.csv"), logger
+
+
+def test_grid_search_ranks_every_trial(tmp_path, make_dataset):
+    space = {"reg": [0.01, 0.1], "dim": [2, 4]}
+    sequential, _ = run(tmp_path, make_dataset, "GridSeq", space=space)
+    parallel, _ = run(tmp_path, make_dataset, "GridPar", space=space, n_workers=2)
+
+    assert len(parallel) == 4
+    assert parallel["best_RMSE"].is_monotonic_increasing
+    pd.testing.assert_frame_equal(parallel, sequential)
+
+
+def test_halving_logs_the_epochs_of_every_rung(tmp_path, make_dataset, capfd):
+    leaderboard, logger = run(
+        tmp_path,
+        make_dataset,
+        "HalvingLog",
+        space={"reg": [0.01, 0.1], "epochs": [3, 5]},
+        strategy=SearchStrategy.HALVING,
+        n_trials=4,
+        eta=2,
+        n_workers=2,
+    )
+
+    # The last trial standing trains for its own epochs.
+    best = leaderboard.iloc[0]
+    assert best["rung"] == leaderboard["rung"].max()
+    assert best["epochs"] in [3, 5] and not best["stopped"]
+
+    err = capfd.readouterr().err
+    rungs = re.findall(r"Rung (\d+): (\d+) trials up to (\d+) epochs", err)
+    assert [int(n) for _, n, _ in rungs] == [4, 2, 1]
+    assert [int(e) for _, _, e in rungs] == [1, 2, int(best["epochs"])]
+
+    # Trials of later rungs run in the same workers and still log once.
+    lines = [line for line in err.splitlines() if "HalvingLog.Trial" in line]
+    assert lines and len(lines) == len(set(lines))
+    assert any(stage.startswith("HalvingLog.Trial") for stage in logger.timer.summary())